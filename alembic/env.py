@@ -10,6 +10,8 @@ from src.auth.models import User # noqa
 from src.events.models import Event # noqa
 from src.matches.models import Match # noqa
 from src.predictions.models import Prediction # noqa
+from src.leaderboard.models import EventStanding, UserTotal # noqa
+from src.leagues.models import League, LeagueMember # noqa
 from src.core.config import settings
 from src.db.database import Base
 
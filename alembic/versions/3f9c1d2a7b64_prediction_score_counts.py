@@ -0,0 +1,36 @@
+"""prediction score counts
+
+Revision ID: 3f9c1d2a7b64
+Revises: ade2e25bb051
+Create Date: 2026-10-19 10:12:41.518260
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3f9c1d2a7b64'
+down_revision = 'ade2e25bb051'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('prediction_score_counts',
+                    sa.Column('match_id', sa.Integer(), nullable=False),
+                    sa.Column('home_goals', sa.Integer(), nullable=False),
+                    sa.Column('away_goals', sa.Integer(), nullable=False),
+                    sa.Column('count', sa.Integer(), nullable=False),
+                    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('match_id', 'home_goals', 'away_goals')
+                    )
+    op.execute(
+        'INSERT INTO prediction_score_counts (match_id, home_goals, away_goals, count) '
+        'SELECT match_id, home_goals, away_goals, count(*) FROM predictions '
+        'WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL '
+        'GROUP BY match_id, home_goals, away_goals'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('prediction_score_counts')
@@ -0,0 +1,22 @@
+"""event standings user id index
+
+Revision ID: 4a6e9b3f8d12
+Revises: e2b7a94d1c30
+Create Date: 2026-10-19 18:11:05.216734
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '4a6e9b3f8d12'
+down_revision = 'e2b7a94d1c30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_event_standings_user_id', 'event_standings', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_standings_user_id', table_name='event_standings')
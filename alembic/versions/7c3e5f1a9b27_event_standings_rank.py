@@ -0,0 +1,29 @@
+"""event standings rank
+
+Revision ID: 7c3e5f1a9b27
+Revises: 4a6e9b3f8d12
+Create Date: 2026-10-19 19:24:51.603187
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '7c3e5f1a9b27'
+down_revision = '4a6e9b3f8d12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('event_standings', sa.Column('rank', sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE event_standings SET rank = ranked.rank '
+        'FROM (SELECT event_id, user_id, rank() OVER (PARTITION BY event_id ORDER BY points DESC) AS rank '
+        'FROM event_standings) AS ranked '
+        'WHERE event_standings.event_id = ranked.event_id AND event_standings.user_id = ranked.user_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('event_standings', 'rank')
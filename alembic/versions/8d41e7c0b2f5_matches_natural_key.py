@@ -0,0 +1,59 @@
+"""matches natural key
+
+Revision ID: 8d41e7c0b2f5
+Revises: 3f9c1d2a7b64
+Create Date: 2026-10-19 14:03:27.904113
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8d41e7c0b2f5'
+down_revision = '3f9c1d2a7b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # duplicates collapse into the match with the lowest id, so the constraint can be created
+    op.execute(
+        'CREATE TEMPORARY TABLE duplicate_matches AS '
+        'SELECT id, min(id) OVER (PARTITION BY event_id, home_team, away_team, start_time) AS kept_id '
+        'FROM matches'
+    )
+    op.execute('DELETE FROM duplicate_matches WHERE id = kept_id')
+    # a user keeps one prediction per match, the one on the lowest match id
+    op.execute(
+        'DELETE FROM predictions p USING ('
+        'SELECT q.id, row_number() OVER ('
+        'PARTITION BY coalesce(d.kept_id, q.match_id), q.user_id ORDER BY q.match_id, q.id'
+        ') AS position '
+        'FROM predictions q LEFT JOIN duplicate_matches d ON d.id = q.match_id '
+        'WHERE q.match_id IN (SELECT id FROM duplicate_matches UNION SELECT kept_id FROM duplicate_matches)'
+        ') ranked '
+        'WHERE p.id = ranked.id AND ranked.position > 1'
+    )
+    op.execute(
+        'UPDATE predictions p SET match_id = d.kept_id '
+        'FROM duplicate_matches d WHERE d.id = p.match_id'
+    )
+    op.execute(
+        'DELETE FROM prediction_score_counts '
+        'WHERE match_id IN (SELECT id FROM duplicate_matches UNION SELECT kept_id FROM duplicate_matches)'
+    )
+    op.execute(
+        'INSERT INTO prediction_score_counts (match_id, home_goals, away_goals, count) '
+        'SELECT match_id, home_goals, away_goals, count(*) FROM predictions '
+        'WHERE home_goals IS NOT NULL AND away_goals IS NOT NULL '
+        'AND match_id IN (SELECT kept_id FROM duplicate_matches) '
+        'GROUP BY match_id, home_goals, away_goals'
+    )
+    op.execute('DELETE FROM matches WHERE id IN (SELECT id FROM duplicate_matches)')
+    op.execute('DROP TABLE duplicate_matches')
+    op.create_unique_constraint(
+        'uix_matches_natural_key', 'matches', ['event_id', 'home_team', 'away_team', 'start_time'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uix_matches_natural_key', 'matches', type_='unique')
@@ -0,0 +1,60 @@
+"""leagues and user totals
+
+Revision ID: b81d4c6e2f05
+Revises: 7c3e5f1a9b27
+Create Date: 2026-10-19 20:37:12.448019
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b81d4c6e2f05'
+down_revision = '7c3e5f1a9b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('user_totals',
+                    sa.Column('user_id', sa.UUID(), nullable=False),
+                    sa.Column('points', sa.Integer(), nullable=False),
+                    sa.Column('exact_hits', sa.Integer(), nullable=False),
+                    sa.Column('outcome_hits', sa.Integer(), nullable=False),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('user_id')
+                    )
+    op.create_index('ix_user_totals_points_user_id', 'user_totals',
+                    [sa.text('points DESC'), 'user_id'], unique=False)
+    op.execute(
+        'INSERT INTO user_totals (user_id, points, exact_hits, outcome_hits) '
+        'SELECT user_id, sum(points), sum(exact_hits), sum(outcome_hits) '
+        'FROM event_standings GROUP BY user_id'
+    )
+
+    op.create_table('leagues',
+                    sa.Column('id', sa.Integer(), nullable=False),
+                    sa.Column('name', sa.String(length=128), nullable=False),
+                    sa.Column('owner_id', sa.UUID(), nullable=False),
+                    sa.Column('invite_code', sa.String(length=16), nullable=False),
+                    sa.Column('member_count', sa.Integer(), nullable=False),
+                    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id'),
+                    sa.UniqueConstraint('invite_code')
+                    )
+    op.create_table('league_members',
+                    sa.Column('league_id', sa.Integer(), nullable=False),
+                    sa.Column('user_id', sa.UUID(), nullable=False),
+                    sa.ForeignKeyConstraint(['league_id'], ['leagues.id'], ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('league_id', 'user_id')
+                    )
+    op.create_index('ix_league_members_user_id', 'league_members', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_league_members_user_id', table_name='league_members')
+    op.drop_table('league_members')
+    op.drop_table('leagues')
+    op.drop_index('ix_user_totals_points_user_id', table_name='user_totals')
+    op.drop_table('user_totals')
@@ -0,0 +1,22 @@
+"""matches start time index
+
+Revision ID: c5a08f3e61d9
+Revises: 8d41e7c0b2f5
+Create Date: 2026-10-19 15:21:09.337402
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c5a08f3e61d9'
+down_revision = '8d41e7c0b2f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_matches_start_time_id', 'matches', ['start_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_matches_start_time_id', table_name='matches')
@@ -0,0 +1,43 @@
+"""event standings
+
+Revision ID: e2b7a94d1c30
+Revises: c5a08f3e61d9
+Create Date: 2026-10-19 17:02:47.810394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7a94d1c30'
+down_revision = 'c5a08f3e61d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('event_standings',
+                    sa.Column('event_id', sa.Integer(), nullable=False),
+                    sa.Column('user_id', sa.UUID(), nullable=False),
+                    sa.Column('points', sa.Integer(), nullable=False),
+                    sa.Column('exact_hits', sa.Integer(), nullable=False),
+                    sa.Column('outcome_hits', sa.Integer(), nullable=False),
+                    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+                    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('event_id', 'user_id')
+                    )
+    op.create_index('ix_event_standings_event_id_points_user_id', 'event_standings',
+                    ['event_id', sa.text('points DESC'), 'user_id'], unique=False)
+    op.execute(
+        'INSERT INTO event_standings (event_id, user_id, points, exact_hits, outcome_hits) '
+        'SELECT matches.event_id, predictions.user_id, sum(predictions.points), '
+        'count(*) FILTER (WHERE predictions.points = 3), count(*) FILTER (WHERE predictions.points = 1) '
+        'FROM predictions JOIN matches ON matches.id = predictions.match_id '
+        'WHERE predictions.points IS NOT NULL '
+        'GROUP BY matches.event_id, predictions.user_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_event_standings_event_id_points_user_id', table_name='event_standings')
+    op.drop_table('event_standings')
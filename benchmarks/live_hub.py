@@ -0,0 +1,77 @@
+"""Memory and CPU cost of live-update subscriptions.
+
+Sizes the in-process part of a node: every simulated connection is a
+``Subscription`` subscribed to a few events. Socket buffers of the ASGI server
+are not included and have to be added on top.
+
+    python -m benchmarks.live_hub --connections 50000 --events 100
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+from src.live.hub import LiveHub, Subscription
+from src.matches.schemas import MatchRead
+
+
+async def run(connections: int, events: int, per_connection: int, updates: int) -> None:
+    hub = LiveHub()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    subscriptions = []
+    for _ in range(connections):
+        subscription = Subscription()
+        for event_id in random.sample(range(events), k=per_connection):
+            hub.subscribe(subscription, event_id=event_id)
+        subscriptions.append(subscription)
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'connections:             {connections}')
+    print(f'subscriptions per conn:  {per_connection} of {events} events')
+    print(f'idle memory per conn:    {(after - before) / connections:.0f} B')
+
+    match = MatchRead(
+        id=1, home_team='Real Madrid', away_team='Barcelona', status=2,
+        home_goals=2, away_goals=1, start_time=datetime.utcnow(), event_id=0,
+    )
+
+    delivered = sum(hub.subscribers_count(event_id=i % events) for i in range(updates))
+
+    started = time.process_time()
+    for i in range(updates):
+        event_id = i % events
+        data = match.copy(update={'event_id': event_id})
+        hub.publish(event_id=event_id, kind='match', key=f'match:{i % 10}', data=data)
+    publish_time = time.process_time() - started
+
+    started = time.process_time()
+    for subscription in subscriptions:
+        await subscription.get(timeout=0)
+    drain_time = time.process_time() - started
+
+    print(f'updates published:       {updates} ({delivered} deliveries)')
+    print(f'publish CPU per update:  {publish_time / updates * 1e6:.1f} us')
+    print(f'publish CPU per deliv.:  {publish_time / max(delivered, 1) * 1e9:.0f} ns')
+    print(f'drain CPU per conn:      {drain_time / connections * 1e6:.2f} us')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', type=int, default=50_000)
+    parser.add_argument('--events', type=int, default=100)
+    parser.add_argument('--per-connection', type=int, default=3)
+    parser.add_argument('--updates', type=int, default=1_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.connections, args.events, args.per_connection, args.updates))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Cost of the in-memory global ranking and of the shared snapshot file.
+
+Builds a ``RankingIndex`` of random season totals and times the operations the
+leaderboard endpoints and the standings refresh use, then writes the same totals
+to a snapshot file and times the lookups the workers make on the mapped file.
+
+    python -m benchmarks.ranking --users 1000000
+"""
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from uuid import uuid4
+
+from src.leaderboard.ranking import RankingIndex
+from src.leaderboard.snapshot import LeaderboardSnapshot, write_snapshot
+
+
+def timed(label: str, count: int, func) -> None:
+    started = time.perf_counter()
+    for i in range(count):
+        func(i)
+    elapsed = time.perf_counter() - started
+
+    print(f'{label:<24} {elapsed / count * 1e6:8.2f} us')
+
+
+def run(users: int, operations: int, max_points: int, load: int) -> None:
+    rng = random.Random(0)
+    user_ids = [uuid4() for _ in range(users)]
+    totals = [(user_id, rng.randint(0, max_points)) for user_id in user_ids]
+
+    index = RankingIndex(load=load)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    index.build(totals)
+    build_time = time.perf_counter() - started
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'users:                   {users}')
+    print(f'build:                   {build_time:.2f} s')
+    print(f'memory:                  {memory / 2 ** 20:.0f} MiB')
+
+    sample = rng.choices(user_ids, k=operations)
+
+    timed('rank lookup:', operations, lambda i: index.rank(sample[i]))
+    timed('score update:', operations, lambda i: index.add(sample[i], rng.randint(0, 3)))
+    timed('top 100:', operations // 10, lambda i: index.top(limit=100))
+    timed('page at random offset:', operations // 10, lambda i: index.top(limit=100, offset=rng.randrange(users)))
+
+    # the database streams these rows, ranked and ordered by user id
+    ranked = [
+        (user_id, index.points(user_id), index.rank(user_id), index.position(user_id), len(index))
+        for user_id in sorted(user_ids)
+    ]
+
+    async def rows():
+        for row in ranked:
+            yield row
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'leaderboard.snapshot'
+
+        started = time.perf_counter()
+        asyncio.run(write_snapshot(path, rows()))
+        print(f'snapshot write:          {time.perf_counter() - started:.2f} s')
+        print(f'snapshot size:           {path.stat().st_size / 2 ** 20:.0f} MiB')
+
+        snapshot = LeaderboardSnapshot(path)
+        timed('snapshot rank lookup:', operations, lambda i: snapshot.rank(sample[i]))
+        timed('snapshot top 100:', operations // 10, lambda i: snapshot.top(limit=100))
+        timed(
+            'snapshot random page:', operations // 10,
+            lambda i: snapshot.top(limit=100, offset=rng.randrange(users)),
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument('--operations', type=int, default=100_000)
+    parser.add_argument('--max-points', type=int, default=300)
+    parser.add_argument('--load', type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.users, args.operations, args.max_points, args.load)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Cost of re-scoring a season and of projecting an event in memory.
+
+Builds random predictions of every user for every match of a season and times scoring them
+with the vectorized engine and summing them into event standings. Then times a what-if
+projection of the last event's matches and the ranking of the projected points, and the
+simulation of the chances to win it. Loading and saving are left out, they depend on the database.
+
+    python -m benchmarks.rescore --users 100000 --events 38 --matches 10
+"""
+import argparse
+import time
+from uuid import uuid4
+
+import numpy as np
+
+from src.scoring.engine import PredictionArrays, EventProjection, score_predictions, leaderboard, finishing_chances
+from src.scoring.rules import RuleSet
+
+
+def run(users: int, events: int, matches: int, repeat: int, simulations: int) -> None:
+    rng = np.random.default_rng(0)
+    size = users * events * matches
+    match_ids = np.tile(np.arange(events * matches, dtype=np.int32), users)
+    match_home_goals = rng.integers(0, 4, events * matches, dtype=np.int32)
+    match_away_goals = rng.integers(0, 4, events * matches, dtype=np.int32)
+
+    predictions = PredictionArrays(
+        ids=np.arange(size, dtype=np.int64),
+        users=np.repeat(np.arange(users, dtype=np.int32), events * matches),
+        user_ids=[uuid4() for _ in range(users)],
+        event_ids=match_ids // matches,
+        match_ids=match_ids,
+        home_goals=rng.integers(0, 4, size, dtype=np.int32),
+        away_goals=rng.integers(0, 4, size, dtype=np.int32),
+        match_home_goals=match_home_goals[match_ids],
+        match_away_goals=match_away_goals[match_ids],
+        points=np.zeros(size, dtype=np.int32),
+    )
+    rules = RuleSet(goal_difference=1, double_points_matches=range(0, events * matches, matches))
+
+    print(f'predictions:             {size}')
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _, standings = score_predictions(predictions, rules=rules)
+        print(f'score and sum:           {time.perf_counter() - started:.2f} s, {len(standings)} standings')
+
+    last_event = predictions.event_ids == events - 1
+    projection = EventProjection(
+        match_ids=np.arange((events - 1) * matches, events * matches, dtype=np.int32),
+        user_ids=sorted(predictions.user_ids),
+        points=rng.integers(0, 3 * matches * (events - 1), users),
+        users=predictions.users[last_event],
+        matches=predictions.match_ids[last_event] - (events - 1) * matches,
+        home_goals=predictions.home_goals[last_event],
+        away_goals=predictions.away_goals[last_event],
+    )
+    home_goals = rng.integers(0, 4, matches, dtype=np.int32)
+    away_goals = rng.integers(0, 4, matches, dtype=np.int32)
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        leaderboard(projection.project(home_goals, away_goals, rules=rules))
+        print(f'what-if projection:      {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    started = time.perf_counter()
+    finishing_chances(projection, simulations=simulations, rules=rules, seed=0)
+    print(f'chances to win:          {time.perf_counter() - started:.2f} s, {simulations} runs')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--events', type=int, default=38)
+    parser.add_argument('--matches', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--simulations', type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.users, args.events, args.matches, args.repeat, args.simulations)
+
+
+if __name__ == '__main__':
+    main()
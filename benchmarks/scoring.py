@@ -0,0 +1,102 @@
+"""Latency of scoring a finished match.
+
+Needs a migrated Postgres database, by default the test one:
+
+    TESTING=1 alembic upgrade head
+    python -m benchmarks.scoring --sizes 10000 100000 1000000
+
+Users, the event and its matches are created for the run and deleted afterwards.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from src.core.config import settings
+from src.matches.schemas import MatchRead
+from src.predictions.repo import PredictionRepository
+
+EMAIL_DOMAIN = 'scoring.benchmark'
+
+
+async def run(url: str, sizes: list[int], repeat: int) -> None:
+    engine = create_async_engine(url)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as connection:
+        await connection.execute(
+            text(
+                "INSERT INTO users (id, email, hashed_password, is_active, is_superuser) "
+                "SELECT gen_random_uuid(), 'user' || i || '@' || :domain, '', true, false "
+                "FROM generate_series(1, :count) AS i"
+            ),
+            {'domain': EMAIL_DOMAIN, 'count': max(sizes)},
+        )
+        event_id = (await connection.execute(
+            text("INSERT INTO events (name, status, deadline) VALUES ('scoring benchmark', 'ongoing', now()) "
+                 "RETURNING id")
+        )).scalar_one()
+
+    try:
+        for size in sizes:
+            async with engine.begin() as connection:
+                match_id = (await connection.execute(
+                    text("INSERT INTO matches (home_team, away_team, status, start_time, event_id) "
+                         "VALUES ('Home', 'Away', 'ongoing', now(), :event_id) RETURNING id"),
+                    {'event_id': event_id},
+                )).scalar_one()
+                await connection.execute(
+                    text("INSERT INTO predictions (home_goals, away_goals, match_id, user_id) "
+                         "SELECT floor(random() * 4), floor(random() * 4), :match_id, id "
+                         "FROM users WHERE email LIKE '%@' || :domain LIMIT :count"),
+                    {'match_id': match_id, 'domain': EMAIL_DOMAIN, 'count': size},
+                )
+                await connection.execute(text('ANALYZE predictions'))
+
+            match = MatchRead(
+                id=match_id, home_team='Home', away_team='Away', status=2, home_goals=1, away_goals=0,
+                start_time=datetime.now(tz=timezone.utc), event_id=event_id,
+            )
+
+            timings = []
+            for _ in range(repeat):
+                # scoring skips predictions whose points don't change, so every run starts unscored
+                async with engine.begin() as connection:
+                    await connection.execute(text('UPDATE predictions SET points = NULL WHERE match_id = :match_id'),
+                                             {'match_id': match_id})
+                    await connection.execute(text('DELETE FROM event_standings WHERE event_id = :event_id'),
+                                             {'event_id': event_id})
+                    await connection.execute(text('DELETE FROM user_totals WHERE user_id IN '
+                                                  '(SELECT user_id FROM predictions WHERE match_id = :match_id)'),
+                                             {'match_id': match_id})
+
+                async with session_maker() as session:
+                    started = time.perf_counter()
+                    await PredictionRepository(session).update_points_for_match(match=match)
+                    timings.append(time.perf_counter() - started)
+
+            print(f'{size:>9} predictions: best {min(timings) * 1000:9.1f} ms, '
+                  f'mean {sum(timings) / len(timings) * 1000:9.1f} ms')
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(text('DELETE FROM events WHERE id = :id'), {'id': event_id})
+            await connection.execute(text("DELETE FROM users WHERE email LIKE '%@' || :domain"),
+                                     {'domain': EMAIL_DOMAIN})
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default=settings.TEST_DATABASE_URL_POSTGRES)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, args.sizes, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import time
+from typing import Any, Hashable, Iterable, TYPE_CHECKING
+
+from src.core.config import settings
+
+if TYPE_CHECKING:
+    from src.live.bus import Notification
+
+
+class LocalCache:
+    """Per-process cache of event scoped data.
+
+    Entries expire after ``ttl`` seconds and are invalidated earlier by the
+    notification bus whenever another worker commits a change to the event.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if len(self._entries) >= self.max_size and key not in self._entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def handle(self, notifications: Iterable['Notification']) -> None:
+        """Notification bus handler, drops every event touched by the notifications."""
+        for notification in notifications:
+            if notification.event_id is None:
+                self.clear()
+                return
+            self.invalidate(notification.event_id)
+
+
+event_cache = LocalCache(ttl=settings.EVENT_CACHE_TTL_SECONDS)
+
+# per-event prediction arrays of the what-if leaderboard, prediction changes are picked up on expiry
+projection_cache = LocalCache(ttl=settings.EVENT_CACHE_TTL_SECONDS, max_size=64)
+
+# simulated chances of the events, checked against the results of the event's matches instead of expiring
+chances_cache = LocalCache(ttl=float('inf'), max_size=64)
+
+# predictions of locked matches and events, checked against the results of the matches instead of expiring
+consensus_cache = LocalCache(ttl=float('inf'), max_size=64)
@@ -12,6 +12,28 @@ else:
 class Settings(BaseSettings):
     MATCHES_COUNT: int = 5
 
+    LIVE_HEARTBEAT_SECONDS: float = 15
+    LIVE_MAX_PENDING: int = 64
+    LIVE_MAX_SUBSCRIPTIONS: int = 20
+
+    EVENT_CACHE_TTL_SECONDS: float = 30
+    BUS_CHANNEL: str = 'predictions'
+    BUS_COALESCE_SECONDS: float = 0.05
+    EVENT_LOCK_TIMEOUT_SECONDS: float = 5
+    # connections of the pool event locks are held on, apart from the pool of request sessions
+    EVENT_LOCK_POOL_SIZE: int = 5
+
+    # workers share the global leaderboard through this file instead of building it in memory
+    LEADERBOARD_SNAPSHOT_PATH: str | None = None
+
+    # keyword arguments of ``RuleSet``, e.g. {"goal_difference": 1, "double_points_matches": [12]},
+    # every season has to be re-scored with ``python -m src.scoring.rescore --all`` after a change
+    SCORING_RULES: dict = {}
+
+    # runs of the remaining matches of an event behind its chances to win, simulated by this many processes
+    SIMULATIONS: int = 1000
+    SIMULATION_WORKERS: int = 1
+
     TESTING: bool = False
 
     SECRET_KEY: str = 'secret'
@@ -0,0 +1,222 @@
+import asyncio
+import dataclasses
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable
+
+from sqlalchemy import select, func
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from src import exceptions
+from src.core.config import settings
+from src.db.database import engine
+from src.events.models import Match
+
+logger = logging.getLogger(__name__)
+
+# first key of the two keys advisory lock, keeps event locks apart from other advisory locks
+EVENT_LOCK_NAMESPACE = 1
+
+LOCK_NOT_AVAILABLE = '55P03'
+
+
+@dataclasses.dataclass
+class LockStats:
+    acquired: int = 0
+    contended: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0
+    max_wait_seconds: float = 0
+
+
+class EventLocker:
+    """Serializes admin mutations of the same event.
+
+    ``hold`` waits at most ``timeout`` seconds for the lock and raises ``EventLocked`` then.
+    Every acquisition is counted in ``stats``, together with the ones that had to wait.
+    """
+
+    def __init__(self, timeout: float = settings.EVENT_LOCK_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self.stats = LockStats()
+
+    def hold(self, event_id: int) -> AsyncContextManager[None]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+    @asynccontextmanager
+    async def hold_match(
+            self, match_id: int, event_id_of: Callable[[int], Awaitable[int | None]],
+    ) -> AsyncIterator[int | None]:
+        """Holds the lock of the match's event and yields the event id, ``None`` without a lock if there is no match.
+
+        ``event_id_of`` looks the event up, lockers that can find it while locking don't call it.
+        """
+        event_id = await event_id_of(match_id)
+
+        if event_id is None:
+            yield None
+            return
+
+        async with self.hold(event_id):
+            yield event_id
+
+    def _acquired(self, event_id: int, started: float, contended: bool) -> None:
+        wait = time.perf_counter() - started
+
+        self.stats.acquired += 1
+        self.stats.wait_seconds += wait
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait)
+
+        if contended:
+            self.stats.contended += 1
+            logger.info(f'waited {wait:.3f}s for the lock of event {event_id}')
+
+    def _timed_out(self, event_id: int) -> exceptions.EventLocked:
+        self.stats.timeouts += 1
+        logger.warning(f'gave up waiting for the lock of event {event_id} after {self.timeout}s')
+        return exceptions.EventLocked()
+
+
+class AsyncioEventLocker(EventLocker):
+    """Single process locker for SQLite and tests."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._users: dict[int, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, event_id: int) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(event_id, asyncio.Lock())
+        self._users[event_id] = self._users.get(event_id, 0) + 1
+        started = time.perf_counter()
+        contended = lock.locked()
+
+        try:
+            if not contended:
+                await lock.acquire()
+            else:
+                try:
+                    await asyncio.wait_for(lock.acquire(), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    raise self._timed_out(event_id)
+
+            self._acquired(event_id, started=started, contended=contended)
+
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            self._users[event_id] -= 1
+            if not self._users[event_id]:
+                del self._users[event_id]
+                del self._locks[event_id]
+
+
+class PostgresEventLocker(EventLocker):
+    """Locker on top of transaction level advisory locks.
+
+    The lock is held by a transaction on its own connection, so commits of the request session
+    don't release it and it goes away with the connection if the worker dies. The connections
+    should come from a pool of their own, see ``create_event_locker``: a request holding a lock
+    also needs a session connection, so sharing one pool lets concurrent admin mutations take
+    every connection for their locks and wait for each other forever.
+    """
+
+    def __init__(self, engine: AsyncEngine, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    @asynccontextmanager
+    async def hold(self, event_id: int) -> AsyncIterator[None]:
+        started = time.perf_counter()
+
+        async with self._transaction() as connection:
+            stmt = select(func.pg_try_advisory_xact_lock(EVENT_LOCK_NAMESPACE, event_id))
+            acquired = (await connection.execute(stmt)).scalar_one()
+
+            if not acquired:
+                await self._wait(connection, event_id=event_id)
+
+            self._acquired(event_id, started=started, contended=not acquired)
+
+            yield
+
+    @asynccontextmanager
+    async def hold_match(
+            self, match_id: int, event_id_of: Callable[[int], Awaitable[int | None]],
+    ) -> AsyncIterator[int | None]:
+        """Finds the event of the match in the statement taking the lock, on the locker's connection.
+
+        The request session isn't touched before the lock is held, so it doesn't keep a pooled
+        connection in an open transaction while the locker waits for another one.
+        """
+        started = time.perf_counter()
+
+        async with self._transaction() as connection:
+            stmt = select(Match.event_id, func.pg_try_advisory_xact_lock(EVENT_LOCK_NAMESPACE, Match.event_id)) \
+                .where(Match.id == match_id)
+            row = (await connection.execute(stmt)).one_or_none()
+
+            if row is None:
+                yield None
+                return
+
+            event_id, acquired = row
+            if not acquired:
+                await self._wait(connection, event_id=event_id)
+
+            self._acquired(event_id, started=started, contended=not acquired)
+
+            yield event_id
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[AsyncConnection]:
+        """A transaction on a connection of the pool, raises ``EventLocked`` if none frees up in time."""
+        try:
+            connection = await self.engine.connect()
+        except PoolTimeoutError as error:
+            self.stats.timeouts += 1
+            logger.warning(f'no connection for event locks freed up in {self.timeout}s')
+            raise exceptions.EventLocked() from error
+
+        try:
+            async with connection.begin():
+                yield connection
+        finally:
+            await connection.close()
+
+    async def _wait(self, connection: AsyncConnection, event_id: int) -> None:
+        timeout = f'{int(self.timeout * 1000)}ms'
+        await connection.execute(select(func.set_config('lock_timeout', timeout, True)))
+        try:
+            await connection.execute(select(func.pg_advisory_xact_lock(EVENT_LOCK_NAMESPACE, event_id)))
+        except DBAPIError as error:
+            if getattr(error.orig, 'sqlstate', None) == LOCK_NOT_AVAILABLE:
+                raise self._timed_out(event_id) from error
+            raise
+
+
+def create_event_locker(engine: AsyncEngine) -> EventLocker:
+    """Locker for the database of ``engine``, a Postgres locker gets a small pool of its own."""
+    if engine.dialect.name == 'postgresql':
+        lock_engine = create_async_engine(
+            engine.url,
+            pool_size=settings.EVENT_LOCK_POOL_SIZE,
+            max_overflow=0,
+            pool_timeout=settings.EVENT_LOCK_TIMEOUT_SECONDS,
+        )
+        return PostgresEventLocker(lock_engine)
+    return AsyncioEventLocker()
+
+
+event_locker = create_event_locker(engine)
@@ -1,14 +1,26 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import event_cache
+from src.core.locks import EventLocker, event_locker
 from src.db.database import get_async_session
 from src.events.repo import EventRepository
 from src.events.service import EventService
+from src.live.bus import NotificationBus
+from src.live.dependencies import get_bus
 
 
 async def get_event_repo(session: AsyncSession = Depends(get_async_session)):
     yield EventRepository(session)
 
 
-async def get_event_service(repo: EventRepository = Depends(get_event_repo)):
-    yield EventService(repo)
+async def get_event_locker():
+    yield event_locker
+
+
+async def get_event_service(
+        repo: EventRepository = Depends(get_event_repo),
+        bus: NotificationBus = Depends(get_bus),
+        locker: EventLocker = Depends(get_event_locker),
+):
+    yield EventService(repo, bus=bus, cache=event_cache, locker=locker)
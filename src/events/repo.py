@@ -45,8 +45,8 @@ class EventRepository(BaseEventRepository):
 
         return new_event
 
-    async def update(self, event_id: int, event: EventUpdate) -> Event:
-        stmt = update(Event).where(Event.id == event_id).values(**event.dict()).returning(Event)
+    async def update(self, event_id: int, event_data: EventUpdate) -> Event:
+        stmt = update(Event).where(Event.id == event_id).values(**event_data.dict()).returning(Event)
         result = await self.session.execute(stmt)
 
         await self.session.commit()
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from src import exceptions
 from src.auth.dependencies import get_current_superuser
 from src.core.config import settings
+from src.core.locks import EventLocker, LockStats
+from src.db.database import get_async_session
 from src.events.base import BaseEventService
-from src.events.dependencies import get_event_service
+from src.events.dependencies import get_event_service, get_event_locker
 from src.events.schemas import EventRead, EventCreate
+from src.live.dependencies import get_live_hub
+from src.live.hub import LiveHub, serialize, sse_stream
 
 router = APIRouter()
 
@@ -21,6 +27,12 @@ async def get_events(
     return await event_service.get_multiple(admin_mode=admin_mode, offset=offset, limit=limit)
 
 
+@router.get('/locks/stats', response_model=LockStats, dependencies=[Depends(get_current_superuser)])
+async def get_lock_stats(locker: EventLocker = Depends(get_event_locker)):
+    """Counters of the event locks taken by this worker since it started."""
+    return locker.stats
+
+
 @router.get('/{event_id}', response_model=EventRead)
 async def get_event(
         event_id: int,
@@ -33,6 +45,36 @@ async def get_event(
     return event
 
 
+@router.get('/{event_id}/stream', response_class=StreamingResponse)
+async def stream_event(
+        event_id: int,
+        request: Request,
+        session: AsyncSession = Depends(get_async_session),
+        event_service: BaseEventService = Depends(get_event_service),
+        hub: LiveHub = Depends(get_live_hub),
+):
+    try:
+        event = await event_service.get_by_id(event_id=event_id)
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
+
+    # the stream never touches the database, so give the connection back to the pool
+    await session.close()
+
+    stream = sse_stream(
+        hub=hub,
+        event_id=event_id,
+        snapshot=serialize(event_id=event_id, kind='event', data=event),
+        is_disconnected=request.is_disconnected,
+        heartbeat=settings.LIVE_HEARTBEAT_SECONDS,
+    )
+    return StreamingResponse(
+        stream,
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @router.post(
     '',
     response_model=EventRead,
@@ -69,6 +111,8 @@ async def upgrade_event_status(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f'Required min {settings.MATCHES_COUNT} matches'
         )
+    except exceptions.EventLocked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Event is being changed, try again')
     return event
 
 
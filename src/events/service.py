@@ -1,28 +1,49 @@
-from typing import Sequence
+from contextlib import nullcontext
+from typing import AsyncContextManager, Sequence
 
 from src import exceptions
 from src.core.config import settings
 from src.events.base import BaseEventService, BaseEventRepository
 from src.events.models import EventStatus
 from src.events.schemas import EventCreate, EventRead, EventUpdate
+from src.core.cache import LocalCache
+from src.core.locks import EventLocker
+from src.live.bus import NotificationBus
 from src.matches.models import MatchStatus
 
 
 class EventService(BaseEventService):
-    def __init__(self, repo: BaseEventRepository):
+    def __init__(
+            self,
+            repo: BaseEventRepository,
+            bus: NotificationBus | None = None,
+            cache: LocalCache | None = None,
+            locker: EventLocker | None = None,
+    ):
         self.repo = repo
+        self.bus = bus
+        self.cache = cache
+        self.locker = locker
 
     async def get_multiple(self, admin_mode: bool = False, offset: int = 0, limit: int = 100) -> Sequence[EventRead]:
         events = await self.repo.get_multiple(admin_mode=admin_mode, offset=offset, limit=limit)
         return [EventRead.from_orm(event) for event in events]
 
     async def get_by_id(self, event_id: int) -> EventRead:
+        if self.cache is not None and (event := self.cache.get(event_id)) is not None:
+            return event
+
         event = await self.repo.get_by_id(event_id=event_id)
 
         if not event:
             raise exceptions.EventNotFound
 
-        return EventRead.from_orm(event)
+        event = EventRead.from_orm(event)
+
+        if self.cache is not None:
+            self.cache.set(event_id, event)
+
+        return event
 
     async def create(self, event: EventCreate) -> EventRead:
         new_event = await self.repo.create(event=event)
@@ -30,28 +51,34 @@ class EventService(BaseEventService):
         return EventRead.from_orm(new_event)
 
     async def upgrade_status(self, event_id: int) -> EventRead:
-        event = await self.repo.get_by_id(event_id=event_id)
+        async with self._lock(event_id):
+            event = await self.repo.get_by_id(event_id=event_id)
 
-        if not event:
-            raise exceptions.EventNotFound
+            if not event:
+                raise exceptions.EventNotFound
+
+            if event.status == EventStatus.completed:
+                raise exceptions.UnexpectedEventStatus
+
+            if event.status == EventStatus.closed:
+                for match in event.matches:
+                    if match.status != MatchStatus.completed:
+                        raise exceptions.MatchesAreNotFinished
 
-        if event.status == EventStatus.completed:
-            raise exceptions.UnexpectedEventStatus
+            if event.status == EventStatus.created:
+                if len(event.matches) != settings.MATCHES_COUNT:
+                    raise exceptions.TooFewMatches
 
-        if event.status == EventStatus.closed:
-            for match in event.matches:
-                if match.status != MatchStatus.completed:
-                    raise exceptions.MatchesAreNotFinished
+            data = EventUpdate(name=event.name, deadline=event.deadline, status=event.status+1)
 
-        if event.status == EventStatus.created:
-            if len(event.matches) != settings.MATCHES_COUNT:
-                raise exceptions.TooFewMatches
+            updated_event = await self.repo.update(event_id=event_id, event_data=data)
 
-        data = EventUpdate(name=event.name, deadline=event.deadline, status=event.status+1)
+        updated_event = EventRead.from_orm(updated_event)
 
-        updated_event = await self.repo.update(event_id=event_id, event_data=data)
+        if self.bus is not None:
+            await self.bus.publish(event_id=event_id, kind='event', key='event', data=updated_event)
 
-        return EventRead.from_orm(updated_event)
+        return updated_event
 
     async def delete(self, event_id: int) -> None:
         event = await self.repo.get_by_id(event_id=event_id)
@@ -59,4 +86,10 @@ class EventService(BaseEventService):
         if not event:
             raise exceptions.EventNotFound
 
-        return await self.repo.delete(event_id=event_id)
+        await self.repo.delete(event_id=event_id)
+
+        if self.bus is not None:
+            await self.bus.publish(event_id=event_id, kind='event_deleted', key='event', data={'id': event_id})
+
+    def _lock(self, event_id: int) -> AsyncContextManager[None]:
+        return self.locker.hold(event_id) if self.locker is not None else nullcontext()
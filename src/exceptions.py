@@ -22,6 +22,14 @@ class PredictionNotFound(Exception):
     pass
 
 
+class StandingNotFound(Exception):
+    pass
+
+
+class LeagueNotFound(Exception):
+    pass
+
+
 class UnexpectedEventStatus(Exception):
     pass
 
@@ -42,9 +50,21 @@ class MatchesAreNotFinished(Exception):
     pass
 
 
+class MatchAlreadyExists(Exception):
+    pass
+
+
 class PredictionAlreadyExists(Exception):
     pass
 
 
 class UserIsNotAllowed(Exception):
     pass
+
+
+class EventLocked(Exception):
+    pass
+
+
+class PredictionsAreOpen(Exception):
+    pass
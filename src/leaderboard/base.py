@@ -0,0 +1,37 @@
+from typing import AsyncIterator, Sequence
+from uuid import UUID
+
+from src.leaderboard.models import EventStanding
+from src.leaderboard.schemas import StandingRead, RankedStanding, UserRank
+
+
+class BaseLeaderboardRepository:
+    async def get_event_standings(
+            self, event_id: int, after: tuple[int, UUID] | None = None, limit: int = 100,
+    ) -> Sequence[EventStanding]:
+        raise NotImplementedError
+
+    async def get_event_neighbours(self, event_id: int, user_id: UUID, window: int) -> Sequence[EventStanding]:
+        raise NotImplementedError
+
+    async def get_user_totals(self, event_id: int | None = None) -> list[tuple[UUID, int]]:
+        raise NotImplementedError
+
+    def stream_ranked_totals(self) -> AsyncIterator[tuple[UUID, int, int, int, int]]:
+        raise NotImplementedError
+
+
+class BaseLeaderboardService:
+    async def get_event_leaderboard(
+            self, event_id: int, after: tuple[int, UUID] | None = None, limit: int = 100,
+    ) -> list[StandingRead]:
+        raise NotImplementedError
+
+    async def get_global_leaderboard(self, offset: int = 0, limit: int = 100) -> list[RankedStanding]:
+        raise NotImplementedError
+
+    async def get_event_rank(self, event_id: int, user_id: UUID, window: int = 5) -> UserRank:
+        raise NotImplementedError
+
+    async def get_global_rank(self, user_id: UUID, window: int = 5) -> UserRank:
+        raise NotImplementedError
@@ -0,0 +1,31 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.database import get_async_session
+from src.events.base import BaseEventRepository
+from src.events.dependencies import get_event_repo
+from src.leaderboard.base import BaseLeaderboardRepository
+from src.leaderboard.ranking import RankingIndex, global_ranking
+from src.leaderboard.repo import LeaderboardRepository
+from src.leaderboard.service import LeaderboardService
+from src.leaderboard.snapshot import LeaderboardSnapshot, leaderboard_snapshot, snapshot_writer
+
+
+async def get_leaderboard_repo(session: AsyncSession = Depends(get_async_session)):
+    yield LeaderboardRepository(session)
+
+
+async def get_ranking():
+    yield leaderboard_snapshot if leaderboard_snapshot is not None else global_ranking.index
+
+
+async def get_snapshot_writer():
+    yield snapshot_writer
+
+
+async def get_leaderboard_service(
+        repo: BaseLeaderboardRepository = Depends(get_leaderboard_repo),
+        event_repo: BaseEventRepository = Depends(get_event_repo),
+        ranking: RankingIndex | LeaderboardSnapshot = Depends(get_ranking),
+):
+    yield LeaderboardService(repo, event_repo=event_repo, ranking=ranking)
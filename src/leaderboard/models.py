@@ -0,0 +1,39 @@
+import uuid
+
+from sqlalchemy import Integer, ForeignKey, UUID, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.database import Base
+
+
+class EventStanding(Base):
+    """Totals of a user in an event, kept in sync with prediction points by the scoring statements."""
+    __tablename__ = 'event_standings'
+
+    event_id: Mapped[int] = mapped_column(Integer, ForeignKey('events.id', ondelete='CASCADE'), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True, index=True,
+    )
+    points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    exact_hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    outcome_hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # one more than the number of users ahead in the event, stored by scoring after every points change
+    rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+
+class UserTotal(Base):
+    """Totals of a user over all events, kept in sync with prediction points by the scoring statements."""
+    __tablename__ = 'user_totals'
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    exact_hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    outcome_hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+# leaderboard pages are read in (points desc, user_id) order straight from these indexes
+Index(
+    'ix_event_standings_event_id_points_user_id',
+    EventStanding.event_id, EventStanding.points.desc(), EventStanding.user_id,
+)
+Index('ix_user_totals_points_user_id', UserTotal.points.desc(), UserTotal.user_id)
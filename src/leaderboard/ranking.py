@@ -0,0 +1,244 @@
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator, TYPE_CHECKING
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from src.db.database import async_session_maker
+from src.leaderboard.repo import LeaderboardRepository
+
+if TYPE_CHECKING:
+    from src.live.bus import Notification
+
+logger = logging.getLogger(__name__)
+
+# key of the bus notification published when standings of an event change
+STANDINGS_KEY = 'standings'
+
+# user ids are kept as ints in keys, comparing them is much cheaper than comparing UUID objects
+Key = tuple[int, int]
+
+
+class RankingIndex:
+    """Users ordered by ``(points desc, user_id)`` with positional access.
+
+    Keys are kept in sorted sublists of up to ``2 * load`` keys, found by bisecting the sublist
+    maxima. A Fenwick tree over sublist lengths maps between positions and sublists, so rank
+    lookups, score updates and slicing at any position take O(log n) plus a short memmove.
+    Users with equal points share a rank, which is one more than the number of users ahead.
+    """
+
+    def __init__(self, load: int = 1000):
+        self.load = load
+        self._points: dict[UUID, int] = {}
+        self._lists: list[list[Key]] = []
+        self._maxes: list[Key] = []
+        self._tree: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return user_id in self._points
+
+    def build(self, totals: Iterable[tuple[UUID, int]]) -> None:
+        """Replaces the whole index, sorting once instead of inserting user by user."""
+        self._points = dict(totals)
+        keys = sorted((-points, user_id.int) for user_id, points in self._points.items())
+
+        self._lists = [keys[start:start + self.load] for start in range(0, len(keys), self.load)]
+        self._maxes = [keys_list[-1] for keys_list in self._lists]
+        self._rebuild_tree()
+
+    def points(self, user_id: UUID) -> int | None:
+        return self._points.get(user_id)
+
+    def set(self, user_id: UUID, points: int) -> None:
+        old_points = self._points.get(user_id)
+        if old_points == points:
+            return
+
+        if old_points is not None:
+            self._remove_key((-old_points, user_id.int))
+        self._add_key((-points, user_id.int))
+        self._points[user_id] = points
+
+    def add(self, user_id: UUID, delta: int) -> None:
+        self.set(user_id, self._points.get(user_id, 0) + delta)
+
+    def remove(self, user_id: UUID) -> None:
+        points = self._points.pop(user_id, None)
+        if points is not None:
+            self._remove_key((-points, user_id.int))
+
+    def rank(self, user_id: UUID) -> int | None:
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._position((-points,)) + 1
+
+    def position(self, user_id: UUID) -> int | None:
+        """Index of the user in the ordering, unlike ``rank`` it is unique among tied users."""
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._position((-points, user_id.int))
+
+    def slice(self, start: int, stop: int) -> list[tuple[int, UUID, int]]:
+        """``(rank, user_id, points)`` of the users at positions ``start`` to ``stop``."""
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return []
+
+        entries = []
+        rank = None
+        previous_points = None
+
+        for position, (negative_points, user_id) in enumerate(self._iter_from(start), start=start):
+            if position >= stop:
+                break
+
+            points = -negative_points
+            if points != previous_points:
+                rank = position + 1 if rank is not None else self._position((negative_points,)) + 1
+                previous_points = points
+            entries.append((rank, UUID(int=user_id), points))
+
+        return entries
+
+    def top(self, limit: int, offset: int = 0) -> list[tuple[int, UUID, int]]:
+        return self.slice(offset, offset + limit)
+
+    def _position(self, key: tuple) -> int:
+        index = bisect_left(self._maxes, key)
+        if index == len(self._maxes):
+            return len(self)
+        return self._prefix(index) + bisect_left(self._lists[index], key)
+
+    def _iter_from(self, position: int) -> Iterator[Key]:
+        index, offset = self._find(position)
+        for keys_list in self._lists[index:]:
+            yield from keys_list[offset:]
+            offset = 0
+
+    def _add_key(self, key: Key) -> None:
+        if not self._lists:
+            self._lists.append([key])
+            self._maxes.append(key)
+            self._rebuild_tree()
+            return
+
+        index = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        keys_list = self._lists[index]
+        insort(keys_list, key)
+        self._maxes[index] = keys_list[-1]
+
+        if len(keys_list) > 2 * self.load:
+            self._lists[index:index + 1] = [keys_list[:self.load], keys_list[self.load:]]
+            self._maxes[index:index + 1] = [keys_list[self.load - 1], keys_list[-1]]
+            self._rebuild_tree()
+        else:
+            self._update_tree(index, 1)
+
+    def _remove_key(self, key: Key) -> None:
+        index = bisect_left(self._maxes, key)
+        keys_list = self._lists[index]
+        del keys_list[bisect_left(keys_list, key)]
+
+        if keys_list:
+            self._maxes[index] = keys_list[-1]
+            self._update_tree(index, -1)
+        else:
+            del self._lists[index]
+            del self._maxes[index]
+            self._rebuild_tree()
+
+    def _rebuild_tree(self) -> None:
+        tree = [0] + [len(keys_list) for keys_list in self._lists]
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+
+    def _update_tree(self, index: int, delta: int) -> None:
+        index += 1
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _prefix(self, index: int) -> int:
+        """Number of keys in the first ``index`` sublists."""
+        total = 0
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def _find(self, position: int) -> tuple[int, int]:
+        """Sublist index and offset of ``position``."""
+        index = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            next_index = index + step
+            if next_index < len(self._tree) and self._tree[next_index] <= position:
+                index = next_index
+                position -= self._tree[next_index]
+            step >>= 1
+        return index, position
+
+
+class GlobalRanking:
+    """Ranking of every user by total points over all events, kept in memory by every worker.
+
+    It is built from ``event_standings`` on startup. Scoring publishes a ``standings`` notification
+    of the event, then every worker reloads the totals of that event's users only.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession] = async_session_maker):
+        self.index = RankingIndex()
+        self._session_maker = session_maker
+        self._pending: set[int | None] = set()
+        self._refresh: asyncio.Task | None = None
+
+    async def load(self) -> None:
+        async with self._session_maker() as session:
+            totals = await LeaderboardRepository(session).get_user_totals()
+
+        self.index.build(totals)
+        logger.info(f'global ranking loaded with {len(self.index)} users')
+
+    async def refresh_event(self, event_id: int) -> None:
+        async with self._session_maker() as session:
+            totals = await LeaderboardRepository(session).get_user_totals(event_id=event_id)
+
+        for user_id, points in totals:
+            self.index.set(user_id, points)
+
+    def handle(self, notifications: Iterable['Notification']) -> None:
+        """Notification bus handler, schedules reloading totals of events with changed standings."""
+        for notification in notifications:
+            if notification.event_id is None:
+                self._pending.add(None)
+            elif notification.key == STANDINGS_KEY:
+                self._pending.add(notification.event_id)
+
+        if self._pending and (self._refresh is None or self._refresh.done()):
+            self._refresh = asyncio.get_running_loop().create_task(self._refresh_pending())
+
+    async def _refresh_pending(self) -> None:
+        while self._pending:
+            pending, self._pending = self._pending, set()
+            try:
+                if None in pending:
+                    await self.load()
+                else:
+                    for event_id in pending:
+                        await self.refresh_event(event_id)
+            except Exception:
+                logger.exception('global ranking refresh failed')
+
+
+global_ranking = GlobalRanking()
@@ -0,0 +1,137 @@
+from typing import AsyncIterator, Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import select, or_, func, update, union_all, ColumnElement, Select, Update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.leaderboard.base import BaseLeaderboardRepository
+from src.leaderboard.models import EventStanding, UserTotal
+
+
+def standings_after(
+        points: ColumnElement[int], user_id: ColumnElement[UUID], after: tuple[int, UUID],
+) -> ColumnElement[bool]:
+    """Standings behind ``after`` in ``(points desc, user_id)`` order.
+
+    ``points <= :points`` bounds the scan of a ``(points desc, user_id)`` index, the rest only
+    filters the users tied with the last one.
+    """
+    after_points, after_user_id = after
+    return (points <= after_points) & or_(points < after_points, user_id > after_user_id)
+
+
+def ranks_update(event_ids: Iterable[int]) -> Update:
+    """Stores the rank of every standing of the events, writing only the ranks that change.
+
+    Scoring runs it after updating the points in the same transaction, so reading a rank never
+    has to count the users ahead.
+    """
+    standings = EventStanding.__table__
+
+    ranked = select(
+        standings.c.event_id, standings.c.user_id,
+        func.rank().over(partition_by=standings.c.event_id, order_by=standings.c.points.desc()).label('rank'),
+    ).where(standings.c.event_id.in_(list(event_ids))).subquery('ranked')
+
+    return update(standings) \
+        .where(
+            (standings.c.event_id == ranked.c.event_id) &
+            (standings.c.user_id == ranked.c.user_id) &
+            standings.c.rank.is_distinct_from(ranked.c.rank)
+        ) \
+        .values(rank=ranked.c.rank)
+
+
+class LeaderboardRepository(BaseLeaderboardRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_event_standings(
+            self, event_id: int, after: tuple[int, UUID] | None = None, limit: int = 100,
+    ) -> Sequence[EventStanding]:
+        """Standings of the event ordered by ``(points desc, user_id)``.
+
+        ``after`` is the key of the last standing of the previous page, so pages are read from the index.
+        """
+        stmt = select(EventStanding) \
+            .where(EventStanding.event_id == event_id) \
+            .order_by(EventStanding.points.desc(), EventStanding.user_id) \
+            .limit(limit)
+
+        if after is not None:
+            stmt = stmt.where(standings_after(EventStanding.points, EventStanding.user_id, after=after))
+
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_event_neighbours(self, event_id: int, user_id: UUID, window: int) -> Sequence[EventStanding]:
+        """Standing of the user with at most ``window`` standings ahead and behind, ordered as the leaderboard.
+
+        Every part is a short range of the ``(event_id, points desc, user_id)`` index around the user,
+        tied users are read separately so both ranges keep to the index. Empty if the user has no standing.
+        """
+        points = select(EventStanding.points) \
+            .where((EventStanding.event_id == event_id) & (EventStanding.user_id == user_id)) \
+            .scalar_subquery()
+
+        def standings(*where, order_by=()) -> Select:
+            return select(EventStanding).where(EventStanding.event_id == event_id, *where).order_by(*order_by)
+
+        stmt = union_all(
+            standings(EventStanding.user_id == user_id),
+            standings(
+                EventStanding.points == points, EventStanding.user_id < user_id,
+                order_by=[EventStanding.user_id.desc()],
+            ).limit(window),
+            standings(
+                EventStanding.points > points,
+                order_by=[EventStanding.points, EventStanding.user_id.desc()],
+            ).limit(window),
+            standings(
+                EventStanding.points == points, EventStanding.user_id > user_id,
+                order_by=[EventStanding.user_id],
+            ).limit(window),
+            standings(
+                EventStanding.points < points,
+                order_by=[EventStanding.points.desc(), EventStanding.user_id],
+            ).limit(window),
+        )
+
+        result = await self.session.execute(select(EventStanding).from_statement(stmt))
+        ordered = sorted(result.scalars().all(), key=lambda standing: (-standing.points, standing.user_id))
+
+        position = next((i for i, standing in enumerate(ordered) if standing.user_id == user_id), None)
+        if position is None:
+            return []
+
+        return ordered[max(position - window, 0):position + window + 1]
+
+    async def get_user_totals(self, event_id: int | None = None) -> list[tuple[UUID, int]]:
+        """Points of users over all events, only of the users who take part in ``event_id`` if it is passed."""
+        stmt = select(UserTotal.user_id, UserTotal.points)
+
+        if event_id is not None:
+            stmt = stmt.join(
+                EventStanding, (EventStanding.user_id == UserTotal.user_id) & (EventStanding.event_id == event_id),
+            )
+
+        result = await self.session.stream(stmt.execution_options(yield_per=10_000))
+        return [(user_id, points) async for user_id, points in result]
+
+    async def stream_ranked_totals(self) -> AsyncIterator[tuple[UUID, int, int, int, int]]:
+        """``(user_id, points, rank, position, count)`` of every user over all events, ordered by user id.
+
+        Ranks and positions in the ``(points desc, user_id)`` order are computed by the database,
+        ``count`` is the number of users and is the same in every row.
+        """
+        stmt = select(
+            UserTotal.user_id,
+            UserTotal.points,
+            func.rank().over(order_by=UserTotal.points.desc()),
+            func.row_number().over(order_by=(UserTotal.points.desc(), UserTotal.user_id)) - 1,
+            func.count().over(),
+        ).order_by(UserTotal.user_id)
+
+        result = await self.session.stream(stmt.execution_options(yield_per=10_000))
+        async for user_id, points, rank, position, count in result:
+            yield user_id, points, rank, position, count
@@ -0,0 +1,75 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.params import Query
+from starlette import status
+
+from src import exceptions
+from src.auth.dependencies import get_current_user
+from src.auth.schemas import UserRead
+from src.leaderboard.base import BaseLeaderboardService
+from src.leaderboard.dependencies import get_leaderboard_service
+from src.leaderboard.schemas import StandingRead, RankedStanding, UserRank
+
+router = APIRouter()
+
+
+@router.get('/leaderboard', response_model=list[RankedStanding], dependencies=[Depends(get_current_user)])
+async def get_global_leaderboard(
+        offset: int = Query(default=0, ge=0),
+        limit: int = Query(default=100, ge=1, le=500),
+        leaderboard_service: BaseLeaderboardService = Depends(get_leaderboard_service),
+):
+    return await leaderboard_service.get_global_leaderboard(offset=offset, limit=limit)
+
+
+@router.get('/leaderboard/me', response_model=UserRank)
+async def get_global_rank(
+        window: int = Query(default=5, ge=0, le=50),
+        current_user: UserRead = Depends(get_current_user),
+        leaderboard_service: BaseLeaderboardService = Depends(get_leaderboard_service),
+):
+    try:
+        return await leaderboard_service.get_global_rank(user_id=current_user.id, window=window)
+    except exceptions.StandingNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='User has no points yet')
+
+
+@router.get(
+    '/events/{event_id}/leaderboard',
+    response_model=list[StandingRead],
+    dependencies=[Depends(get_current_user)],
+)
+async def get_event_leaderboard(
+        event_id: int,
+        after_points: int | None = None,
+        after_user_id: UUID | None = None,
+        limit: int = Query(default=100, ge=1, le=500),
+        leaderboard_service: BaseLeaderboardService = Depends(get_leaderboard_service),
+):
+    if (after_points is None) != (after_user_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='after_points and after_user_id must be passed together',
+        )
+
+    after = (after_points, after_user_id) if after_user_id is not None else None
+    try:
+        return await leaderboard_service.get_event_leaderboard(event_id=event_id, after=after, limit=limit)
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
+
+
+@router.get('/events/{event_id}/leaderboard/me', response_model=UserRank)
+async def get_event_rank(
+        event_id: int,
+        window: int = Query(default=5, ge=0, le=50),
+        current_user: UserRead = Depends(get_current_user),
+        leaderboard_service: BaseLeaderboardService = Depends(get_leaderboard_service),
+):
+    try:
+        return await leaderboard_service.get_event_rank(event_id=event_id, user_id=current_user.id, window=window)
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
+    except exceptions.StandingNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='User has no points yet')
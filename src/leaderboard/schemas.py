@@ -0,0 +1,23 @@
+from pydantic import BaseModel, UUID4
+
+
+class StandingRead(BaseModel):
+    user_id: UUID4
+    points: int
+    exact_hits: int
+    outcome_hits: int
+
+    class Config:
+        orm_mode = True
+
+
+class RankedStanding(BaseModel):
+    rank: int
+    user_id: UUID4
+    points: int
+
+
+class UserRank(BaseModel):
+    rank: int
+    points: int
+    standings: list[RankedStanding]
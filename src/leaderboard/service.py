@@ -0,0 +1,70 @@
+from uuid import UUID
+
+from src import exceptions
+from src.events.base import BaseEventRepository
+from src.leaderboard.base import BaseLeaderboardService, BaseLeaderboardRepository
+from src.leaderboard.ranking import RankingIndex
+from src.leaderboard.schemas import StandingRead, RankedStanding, UserRank
+from src.leaderboard.snapshot import LeaderboardSnapshot
+
+
+class LeaderboardService(BaseLeaderboardService):
+    def __init__(
+            self,
+            repo: BaseLeaderboardRepository,
+            event_repo: BaseEventRepository,
+            ranking: RankingIndex | LeaderboardSnapshot,
+    ):
+        self.repo = repo
+        self.event_repo = event_repo
+        self.ranking = ranking
+
+    async def get_event_leaderboard(
+            self, event_id: int, after: tuple[int, UUID] | None = None, limit: int = 100,
+    ) -> list[StandingRead]:
+        standings = await self.repo.get_event_standings(event_id=event_id, after=after, limit=limit)
+
+        if not standings and not await self.event_repo.get_by_id(event_id=event_id):
+            raise exceptions.EventNotFound
+
+        return [StandingRead.from_orm(standing) for standing in standings]
+
+    async def get_global_leaderboard(self, offset: int = 0, limit: int = 100) -> list[RankedStanding]:
+        return [
+            RankedStanding(rank=rank, user_id=user_id, points=points)
+            for rank, user_id, points in self.ranking.top(limit=limit, offset=offset)
+        ]
+
+    async def get_event_rank(self, event_id: int, user_id: UUID, window: int = 5) -> UserRank:
+        standings = await self.repo.get_event_neighbours(event_id=event_id, user_id=user_id, window=window)
+
+        if not standings:
+            if not await self.event_repo.get_by_id(event_id=event_id):
+                raise exceptions.EventNotFound
+            raise exceptions.StandingNotFound
+
+        user_standing = next(standing for standing in standings if standing.user_id == user_id)
+
+        return UserRank(
+            rank=user_standing.rank,
+            points=user_standing.points,
+            standings=[
+                RankedStanding(rank=standing.rank, user_id=standing.user_id, points=standing.points)
+                for standing in standings
+            ],
+        )
+
+    async def get_global_rank(self, user_id: UUID, window: int = 5) -> UserRank:
+        position = self.ranking.position(user_id)
+
+        if position is None:
+            raise exceptions.StandingNotFound
+
+        return UserRank(
+            rank=self.ranking.rank(user_id),
+            points=self.ranking.points(user_id),
+            standings=[
+                RankedStanding(rank=rank, user_id=user_id, points=points)
+                for rank, user_id, points in self.ranking.slice(position - window, position + window + 1)
+            ],
+        )
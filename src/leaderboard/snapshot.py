@@ -0,0 +1,241 @@
+"""Global leaderboard shared by the workers through a memory mapped file.
+
+The file holds a header, a record per user in ``(points desc, user_id)`` order and an index
+of positions by user id, all fixed width::
+
+    header   magic (8s), generation (Q), count (Q)
+    records  user_id (16s), points (i), rank (i)      x count
+    users    user_id (16s), position (I)              x count
+
+Snapshots are written to a temporary file and renamed over the previous one, so readers always
+map a complete file. Every worker maps the same file and the pages are shared through the page
+cache, so memory does not grow with the number of workers.
+"""
+import asyncio
+import fcntl
+import logging
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from src.core.config import settings
+from src.db.database import async_session_maker
+from src.leaderboard.repo import LeaderboardRepository
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'LBSNAP01'
+HEADER = struct.Struct('<8sQQ')
+RECORD = struct.Struct('<16sii')
+USER_ENTRY = struct.Struct('<16sI')
+
+
+def snapshot_size(count: int) -> int:
+    return HEADER.size + count * (RECORD.size + USER_ENTRY.size)
+
+
+def read_generation(path: Path) -> int:
+    """Generation of the snapshot at ``path``, 0 if there is none."""
+    try:
+        with path.open('rb') as file:
+            magic, generation, _ = HEADER.unpack(file.read(HEADER.size))
+    except (FileNotFoundError, struct.error):
+        return 0
+    return generation if magic == MAGIC else 0
+
+
+async def write_snapshot(path: Path, rows: AsyncIterator[tuple[UUID, int, int, int, int]]) -> int:
+    """Writes ``(user_id, points, rank, position, count)`` rows ordered by user id and swaps the file in.
+
+    Records are put at their positions while the user index is filled in order, so nothing is
+    sorted or kept in memory. Returns the generation of the new snapshot.
+    """
+    generation = read_generation(path) + 1
+    temporary = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+
+    try:
+        with temporary.open('w+b') as file:
+            first = await anext(rows, None)
+            count = first[4] if first is not None else 0
+            file.truncate(snapshot_size(count))
+
+            with mmap.mmap(file.fileno(), 0) as buffer:
+                HEADER.pack_into(buffer, 0, MAGIC, generation, count)
+                users_offset = HEADER.size + count * RECORD.size
+
+                row, index = first, 0
+                while row is not None:
+                    user_id, points, rank, position, _ = row
+                    RECORD.pack_into(buffer, HEADER.size + position * RECORD.size, user_id.bytes, points, rank)
+                    USER_ENTRY.pack_into(buffer, users_offset + index * USER_ENTRY.size, user_id.bytes, position)
+                    row, index = await anext(rows, None), index + 1
+
+                buffer.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+    return generation
+
+
+class LeaderboardSnapshot:
+    """Read side of the snapshot, answering the same lookups as ``RankingIndex``.
+
+    Every lookup checks whether the file has been replaced and maps the new generation then.
+    Pages are unpacked straight from the mapped buffer.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.generation = 0
+        self._count = 0
+        self._map: mmap.mmap | None = None
+        self._file_id: tuple[int, int] | None = None
+
+    def __len__(self) -> int:
+        self._refresh()
+        return self._count
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return self.position(user_id) is not None
+
+    def points(self, user_id: UUID) -> int | None:
+        record = self._record_of(user_id)
+        return record[1] if record is not None else None
+
+    def rank(self, user_id: UUID) -> int | None:
+        record = self._record_of(user_id)
+        return record[2] if record is not None else None
+
+    def position(self, user_id: UUID) -> int | None:
+        self._refresh()
+
+        key = user_id.bytes
+        users_offset = HEADER.size + self._count * RECORD.size
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = users_offset + middle * USER_ENTRY.size
+            if self._map[offset:offset + 16] < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self._count:
+            return None
+
+        found_id, position = USER_ENTRY.unpack_from(self._map, users_offset + low * USER_ENTRY.size)
+        return position if found_id == key else None
+
+    def slice(self, start: int, stop: int) -> list[tuple[int, UUID, int]]:
+        """``(rank, user_id, points)`` of the users at positions ``start`` to ``stop``."""
+        self._refresh()
+
+        start, stop = max(start, 0), min(stop, self._count)
+        if start >= stop:
+            return []
+
+        with memoryview(self._map) as view:
+            with view[HEADER.size + start * RECORD.size:HEADER.size + stop * RECORD.size] as records:
+                return [
+                    (rank, UUID(bytes=user_id), points)
+                    for user_id, points, rank in RECORD.iter_unpack(records)
+                ]
+
+    def top(self, limit: int, offset: int = 0) -> list[tuple[int, UUID, int]]:
+        return self.slice(offset, offset + limit)
+
+    def _record_of(self, user_id: UUID) -> tuple[bytes, int, int] | None:
+        position = self.position(user_id)
+        if position is None:
+            return None
+        return RECORD.unpack_from(self._map, HEADER.size + position * RECORD.size)
+
+    def _refresh(self) -> None:
+        """Maps the snapshot file if it has been replaced, keeps the current one if there is no new file."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+
+        if (stat.st_dev, stat.st_ino) == self._file_id:
+            return
+
+        with self.path.open('rb') as file:
+            stat = os.fstat(file.fileno())
+            new_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size >= HEADER.size else None
+
+        magic, generation, count = HEADER.unpack_from(new_map) if new_map is not None else (None, 0, 0)
+        if magic != MAGIC or stat.st_size != snapshot_size(count):
+            if new_map is not None:
+                new_map.close()
+            self._file_id = (stat.st_dev, stat.st_ino)
+            logger.warning(f'ignoring invalid leaderboard snapshot {self.path}')
+            return
+
+        old_map = self._map
+        self._map, self._file_id = new_map, (stat.st_dev, stat.st_ino)
+        self.generation, self._count = generation, count
+
+        if old_map is not None:
+            old_map.close()
+
+        logger.info(f'mapped leaderboard snapshot generation {generation} with {count} users')
+
+
+class LeaderboardSnapshotWriter:
+    """Writes snapshots after scoring, one process at a time.
+
+    Writers of all processes take an exclusive lock on a file next to the snapshot, so the last
+    snapshot is always taken from the latest standings. ``schedule`` coalesces the writes
+    requested while one is running.
+    """
+
+    def __init__(self, path: Path, session_maker: async_sessionmaker[AsyncSession] = async_session_maker):
+        self.path = path
+        self._session_maker = session_maker
+        self._pending = False
+        self._task: asyncio.Task | None = None
+
+    async def write(self, if_missing: bool = False) -> int:
+        """Writes a snapshot of the current standings, returns its generation."""
+        with self.path.with_name(f'{self.path.name}.lock').open('a') as lock:
+            await asyncio.to_thread(fcntl.flock, lock.fileno(), fcntl.LOCK_EX)
+
+            if if_missing and self.path.exists():
+                return read_generation(self.path)
+
+            async with self._session_maker() as session:
+                generation = await write_snapshot(self.path, LeaderboardRepository(session).stream_ranked_totals())
+
+        logger.info(f'wrote leaderboard snapshot generation {generation}')
+        return generation
+
+    def schedule(self) -> None:
+        self._pending = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        while self._pending:
+            self._pending = False
+            try:
+                await self.write()
+            except Exception:
+                logger.exception('leaderboard snapshot write failed')
+
+
+leaderboard_snapshot: LeaderboardSnapshot | None = None
+snapshot_writer: LeaderboardSnapshotWriter | None = None
+
+if settings.LEADERBOARD_SNAPSHOT_PATH:
+    leaderboard_snapshot = LeaderboardSnapshot(Path(settings.LEADERBOARD_SNAPSHOT_PATH))
+    snapshot_writer = LeaderboardSnapshotWriter(Path(settings.LEADERBOARD_SNAPSHOT_PATH))
@@ -0,0 +1,50 @@
+from typing import Sequence
+from uuid import UUID
+
+from src.leaderboard.models import EventStanding, UserTotal
+from src.leaderboard.schemas import StandingRead
+from src.leagues.models import League
+from src.leagues.schemas import LeagueCreate, LeagueRead
+
+
+class BaseLeagueRepository:
+    async def get_by_id(self, league_id: int) -> League | None:
+        raise NotImplementedError
+
+    async def get_multiple_by_user_id(self, user_id: UUID) -> Sequence[League]:
+        raise NotImplementedError
+
+    async def create(self, league: LeagueCreate, owner_id: UUID, invite_code: str) -> League:
+        raise NotImplementedError
+
+    async def join(self, invite_code: str, user_id: UUID) -> League | None:
+        raise NotImplementedError
+
+    async def is_member(self, league_id: int, user_id: UUID) -> bool:
+        raise NotImplementedError
+
+    async def get_standings(
+            self, league: League, event_id: int | None = None, after: tuple[int, UUID] | None = None, limit: int = 100,
+    ) -> Sequence[EventStanding | UserTotal]:
+        raise NotImplementedError
+
+
+class BaseLeagueService:
+    async def get_multiple(self, user_id: UUID) -> list[LeagueRead]:
+        raise NotImplementedError
+
+    async def create(self, league: LeagueCreate, user_id: UUID) -> LeagueRead:
+        raise NotImplementedError
+
+    async def join(self, invite_code: str, user_id: UUID) -> LeagueRead:
+        raise NotImplementedError
+
+    async def get_standings(
+            self,
+            league_id: int,
+            user_id: UUID,
+            event_id: int | None = None,
+            after: tuple[int, UUID] | None = None,
+            limit: int = 100,
+    ) -> list[StandingRead]:
+        raise NotImplementedError
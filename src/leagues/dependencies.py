@@ -0,0 +1,20 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.database import get_async_session
+from src.events.base import BaseEventRepository
+from src.events.dependencies import get_event_repo
+from src.leagues.base import BaseLeagueRepository
+from src.leagues.repo import LeagueRepository
+from src.leagues.service import LeagueService
+
+
+async def get_league_repo(session: AsyncSession = Depends(get_async_session)):
+    yield LeagueRepository(session)
+
+
+async def get_league_service(
+        repo: BaseLeagueRepository = Depends(get_league_repo),
+        event_repo: BaseEventRepository = Depends(get_event_repo),
+):
+    yield LeagueService(repo, event_repo=event_repo)
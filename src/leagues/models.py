@@ -0,0 +1,26 @@
+import uuid
+
+from sqlalchemy import Integer, String, ForeignKey, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.db.database import Base
+
+
+class League(Base):
+    __tablename__ = 'leagues'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    owner_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    invite_code: Mapped[str] = mapped_column(String(16), unique=True, nullable=False)
+    # kept by the join statement, picks the query shape of the league standings
+    member_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class LeagueMember(Base):
+    __tablename__ = 'league_members'
+
+    league_id: Mapped[int] = mapped_column(Integer, ForeignKey('leagues.id', ondelete='CASCADE'), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True, index=True,
+    )
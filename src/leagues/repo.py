@@ -0,0 +1,111 @@
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import select, update, exists, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.leaderboard.models import EventStanding, UserTotal
+from src.leaderboard.repo import standings_after
+from src.leagues.base import BaseLeagueRepository
+from src.leagues.models import League, LeagueMember
+from src.leagues.schemas import LeagueCreate
+
+# leagues up to this size are ranked from their members, larger ones from the points index
+SMALL_LEAGUE_MEMBERS = 1000
+
+
+class LeagueRepository(BaseLeagueRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, league_id: int) -> League | None:
+        stmt = select(League).where(League.id == league_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_multiple_by_user_id(self, user_id: UUID) -> Sequence[League]:
+        stmt = select(League) \
+            .join(LeagueMember, LeagueMember.league_id == League.id) \
+            .where(LeagueMember.user_id == user_id) \
+            .order_by(League.id)
+
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def create(self, league: LeagueCreate, owner_id: UUID, invite_code: str) -> League:
+        new_league = League(**league.dict(), owner_id=owner_id, invite_code=invite_code, member_count=1)
+
+        self.session.add(new_league)
+        await self.session.flush()
+        self.session.add(LeagueMember(league_id=new_league.id, user_id=owner_id))
+
+        await self.session.commit()
+        await self.session.refresh(new_league)
+
+        return new_league
+
+    async def join(self, invite_code: str, user_id: UUID) -> League | None:
+        """Adds the user to the league of the invite code, joining twice changes nothing.
+
+        The membership and the member count change in one statement.
+        """
+        members = LeagueMember.__table__
+        leagues = League.__table__
+
+        league = select(leagues.c.id, literal(user_id, members.c.user_id.type)) \
+            .where(leagues.c.invite_code == invite_code)
+        joined = insert(members) \
+            .from_select(['league_id', 'user_id'], league) \
+            .on_conflict_do_nothing(index_elements=[members.c.league_id, members.c.user_id]) \
+            .returning(members.c.league_id) \
+            .cte('joined')
+        stmt = update(leagues) \
+            .where(leagues.c.id.in_(select(joined.c.league_id))) \
+            .values(member_count=leagues.c.member_count + 1)
+
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+        result = await self.session.execute(
+            select(League).where(League.invite_code == invite_code).execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def is_member(self, league_id: int, user_id: UUID) -> bool:
+        stmt = select(exists().where((LeagueMember.league_id == league_id) & (LeagueMember.user_id == user_id)))
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def get_standings(
+            self, league: League, event_id: int | None = None, after: tuple[int, UUID] | None = None, limit: int = 100,
+    ) -> Sequence[EventStanding | UserTotal]:
+        """Standings of the league members in the event, or their totals over all events, ordered by points.
+
+        Standings are joined with memberships, never aggregated from predictions. Small leagues read
+        their members first and look their standings up by primary key. Large leagues walk the
+        ``(points desc, user_id)`` index of the event or of the totals and keep the members, so a page
+        reads about ``limit`` divided by the share of the league among the ranked users.
+        """
+        source = UserTotal if event_id is None else EventStanding
+
+        stmt = select(source).order_by(source.points.desc(), source.user_id).limit(limit)
+        if event_id is not None:
+            stmt = stmt.where(EventStanding.event_id == event_id)
+        if after is not None:
+            stmt = stmt.where(standings_after(source.points, source.user_id, after=after))
+
+        if league.member_count <= SMALL_LEAGUE_MEMBERS:
+            # materialized, so the planner can't turn it into a scan of all the standings
+            members = select(LeagueMember.user_id) \
+                .where(LeagueMember.league_id == league.id) \
+                .cte('members') \
+                .prefix_with('MATERIALIZED')
+            stmt = stmt.join(members, members.c.user_id == source.user_id)
+        else:
+            stmt = stmt.where(
+                exists().where((LeagueMember.league_id == league.id) & (LeagueMember.user_id == source.user_id))
+            )
+
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
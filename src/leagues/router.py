@@ -0,0 +1,73 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.params import Query
+from starlette import status
+
+from src import exceptions
+from src.auth.dependencies import get_current_user
+from src.auth.schemas import UserRead
+from src.leaderboard.schemas import StandingRead
+from src.leagues.base import BaseLeagueService
+from src.leagues.dependencies import get_league_service
+from src.leagues.schemas import LeagueRead, LeagueCreate, LeagueJoin
+
+router = APIRouter()
+
+
+@router.get('', response_model=list[LeagueRead])
+async def get_leagues(
+        current_user: UserRead = Depends(get_current_user),
+        league_service: BaseLeagueService = Depends(get_league_service),
+):
+    return await league_service.get_multiple(user_id=current_user.id)
+
+
+@router.post('', response_model=LeagueRead, status_code=status.HTTP_201_CREATED)
+async def create_league(
+        league: LeagueCreate,
+        current_user: UserRead = Depends(get_current_user),
+        league_service: BaseLeagueService = Depends(get_league_service),
+):
+    return await league_service.create(league=league, user_id=current_user.id)
+
+
+@router.post('/join', response_model=LeagueRead)
+async def join_league(
+        league_join: LeagueJoin,
+        current_user: UserRead = Depends(get_current_user),
+        league_service: BaseLeagueService = Depends(get_league_service),
+):
+    try:
+        return await league_service.join(invite_code=league_join.invite_code, user_id=current_user.id)
+    except exceptions.LeagueNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='League not found')
+
+
+@router.get('/{league_id}/standings', response_model=list[StandingRead])
+async def get_league_standings(
+        league_id: int,
+        event_id: int | None = None,
+        after_points: int | None = None,
+        after_user_id: UUID | None = None,
+        limit: int = Query(default=100, ge=1, le=500),
+        current_user: UserRead = Depends(get_current_user),
+        league_service: BaseLeagueService = Depends(get_league_service),
+):
+    if (after_points is None) != (after_user_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='after_points and after_user_id must be passed together',
+        )
+
+    after = (after_points, after_user_id) if after_user_id is not None else None
+    try:
+        return await league_service.get_standings(
+            league_id=league_id, user_id=current_user.id, event_id=event_id, after=after, limit=limit,
+        )
+    except exceptions.LeagueNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='League not found')
+    except exceptions.UserIsNotAllowed:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Only league members can see its standings')
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field, UUID4
+
+
+class LeagueCreate(BaseModel):
+    name: str = Field(max_length=128)
+
+
+class LeagueJoin(BaseModel):
+    invite_code: str = Field(max_length=16)
+
+
+class LeagueRead(BaseModel):
+    id: int
+    name: str
+    owner_id: UUID4
+    invite_code: str
+    member_count: int
+
+    class Config:
+        orm_mode = True
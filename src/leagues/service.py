@@ -0,0 +1,53 @@
+import secrets
+from uuid import UUID
+
+from src import exceptions
+from src.events.base import BaseEventRepository
+from src.leaderboard.schemas import StandingRead
+from src.leagues.base import BaseLeagueService, BaseLeagueRepository
+from src.leagues.schemas import LeagueCreate, LeagueRead
+
+
+class LeagueService(BaseLeagueService):
+    def __init__(self, repo: BaseLeagueRepository, event_repo: BaseEventRepository):
+        self.repo = repo
+        self.event_repo = event_repo
+
+    async def get_multiple(self, user_id: UUID) -> list[LeagueRead]:
+        leagues = await self.repo.get_multiple_by_user_id(user_id=user_id)
+        return [LeagueRead.from_orm(league) for league in leagues]
+
+    async def create(self, league: LeagueCreate, user_id: UUID) -> LeagueRead:
+        new_league = await self.repo.create(league=league, owner_id=user_id, invite_code=secrets.token_urlsafe(9))
+        return LeagueRead.from_orm(new_league)
+
+    async def join(self, invite_code: str, user_id: UUID) -> LeagueRead:
+        league = await self.repo.join(invite_code=invite_code, user_id=user_id)
+
+        if not league:
+            raise exceptions.LeagueNotFound
+
+        return LeagueRead.from_orm(league)
+
+    async def get_standings(
+            self,
+            league_id: int,
+            user_id: UUID,
+            event_id: int | None = None,
+            after: tuple[int, UUID] | None = None,
+            limit: int = 100,
+    ) -> list[StandingRead]:
+        league = await self.repo.get_by_id(league_id=league_id)
+
+        if not league:
+            raise exceptions.LeagueNotFound
+
+        if not await self.repo.is_member(league_id=league_id, user_id=user_id):
+            raise exceptions.UserIsNotAllowed
+
+        standings = await self.repo.get_standings(league=league, event_id=event_id, after=after, limit=limit)
+
+        if event_id is not None and not standings and not await self.event_repo.get_by_id(event_id=event_id):
+            raise exceptions.EventNotFound
+
+        return [StandingRead.from_orm(standing) for standing in standings]
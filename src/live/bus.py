@@ -0,0 +1,201 @@
+import asyncio
+import contextlib
+import dataclasses
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
+
+from src.core.config import settings
+from src.db.database import engine
+from src.live.hub import serialize
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads are limited to 8000 bytes, bigger messages are sent without data
+MAX_PAYLOAD = 7900
+
+
+@dataclasses.dataclass(frozen=True)
+class Notification:
+    """A committed change of an event.
+
+    ``message`` is the serialized live update, it is ``None`` when only caches
+    have to be invalidated. ``event_id`` is ``None`` when everything has to be
+    invalidated, e.g. after the listener lost notifications.
+    """
+    event_id: int | None
+    key: str
+    message: bytes | None = None
+
+
+Handler = Callable[[Sequence[Notification]], None]
+
+
+class NotificationBus:
+    """Delivers committed changes to the handlers of every worker.
+
+    Incoming notifications are coalesced by ``(event_id, key)`` for ``coalesce``
+    seconds, so a storm of changes to the same match results in one dispatch.
+    """
+
+    def __init__(self, coalesce: float = settings.BUS_COALESCE_SECONDS):
+        self.coalesce = coalesce
+        self._handlers: list[Handler] = []
+        self._pending: OrderedDict[tuple[int | None, str], Notification] = OrderedDict()
+        self._timer: asyncio.TimerHandle | None = None
+
+    def add_handler(self, handler: Handler) -> None:
+        self._handlers.append(handler)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        self.flush()
+
+    async def publish(self, event_id: int, kind: str, key: str, data: Any) -> None:
+        raise NotImplementedError
+
+    def receive(self, notification: Notification) -> None:
+        key = (notification.event_id, notification.key)
+        self._pending.pop(key, None)
+        self._pending[key] = notification
+
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.coalesce, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        notifications = list(self._pending.values())
+        self._pending.clear()
+
+        if not notifications:
+            return
+
+        for handler in self._handlers:
+            try:
+                handler(notifications)
+            except Exception:
+                logger.exception(f'notification handler {handler} failed')
+
+
+class InMemoryBus(NotificationBus):
+    """Single process bus for SQLite and tests."""
+
+    async def publish(self, event_id: int, kind: str, key: str, data: Any) -> None:
+        self.receive(Notification(event_id=event_id, key=key, message=serialize(event_id, kind=kind, data=data)))
+
+
+class PostgresBus(NotificationBus):
+    """Bus on top of Postgres ``LISTEN``/``NOTIFY``.
+
+    Publishing worker receives its own notifications through the listener as well,
+    so all workers handle a change the same way.
+    """
+
+    def __init__(self, engine: AsyncEngine, channel: str = settings.BUS_CHANNEL, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.channel = channel
+        self._connection: AsyncConnection | None = None
+        self._reconnect: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._connection = await self.engine.connect()
+        raw_connection = await self._connection.get_raw_connection()
+        listener = raw_connection.driver_connection
+
+        await listener.add_listener(self.channel, self._on_notify)
+        listener.add_termination_listener(self._on_terminate)
+
+    async def stop(self) -> None:
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reconnect
+            self._reconnect = None
+
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            try:
+                # closing would call the termination listener and UNLISTEN keeps the pooled connection clean
+                listener = (await connection.get_raw_connection()).driver_connection
+                listener.remove_termination_listener(self._on_terminate)
+                await listener.remove_listener(self.channel, self._on_notify)
+            except Exception:
+                logger.exception('failed to remove the notification listener')
+            finally:
+                await connection.close()
+
+        await super().stop()
+
+    async def publish(self, event_id: int, kind: str, key: str, data: Any) -> None:
+        message = serialize(event_id, kind=kind, data=data).decode()
+        payload = f'{event_id} {key}\n{message}'
+
+        if len(payload.encode()) > MAX_PAYLOAD:
+            logger.warning(f'{key} of event {event_id} is too big for NOTIFY, sending invalidation only')
+            payload = f'{event_id} {key}\n'
+
+        try:
+            async with self.engine.connect() as connection:
+                await connection.execute(select(func.pg_notify(self.channel, payload)))
+                await connection.commit()
+        except Exception:
+            # the change itself is already committed, other workers catch up when their caches expire
+            logger.exception(f'failed to notify about {key} of event {event_id}')
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            header, message = payload.split('\n', 1)
+            event_id, key = header.split(' ', 1)
+            event_id = int(event_id)
+        except ValueError:
+            # someone else notified on the channel or the payload got cut, there is nothing to invalidate
+            logger.warning(f'skipping malformed notification {payload[:100]!r} on {channel}')
+            return
+
+        self.receive(Notification(event_id=event_id, key=key, message=message.encode() or None))
+
+    def _on_terminate(self, connection) -> None:
+        logger.warning('notification listener connection lost, reconnecting')
+        connection.remove_termination_listener(self._on_terminate)
+        lost, self._connection = self._connection, None
+        self._reconnect = asyncio.get_running_loop().create_task(self._restart(lost))
+
+    async def _restart(self, lost: AsyncConnection | None = None) -> None:
+        if lost is not None:
+            try:
+                # the connection is dead, it must not go back to the pool
+                await lost.invalidate()
+                await lost.close()
+            except Exception:
+                logger.exception('failed to discard the lost listener connection')
+
+        delay = 0.5
+        while True:
+            try:
+                await self.start()
+            except Exception:
+                logger.exception('notification listener reconnect failed')
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+            else:
+                # notifications sent while disconnected are lost
+                self.receive(Notification(event_id=None, key='*'))
+                return
+
+
+def create_bus(engine: AsyncEngine) -> NotificationBus:
+    if engine.dialect.name == 'postgresql':
+        return PostgresBus(engine)
+    return InMemoryBus()
+
+
+bus = create_bus(engine)
@@ -0,0 +1,10 @@
+from src.live.bus import bus
+from src.live.hub import live_hub
+
+
+async def get_live_hub():
+    yield live_hub
+
+
+async def get_bus():
+    yield bus
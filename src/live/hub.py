@@ -0,0 +1,137 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterable, TYPE_CHECKING
+
+from fastapi.encoders import jsonable_encoder
+
+from src.core.config import settings
+
+if TYPE_CHECKING:
+    from src.live.bus import Notification
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT = b': ping\n\n'
+
+
+class Subscription:
+    """Pending updates of one client.
+
+    Updates are keyed (e.g. ``event`` or ``match:12``) so a slow client only ever
+    receives the latest state of every key instead of the whole backlog. At most
+    ``max_pending`` keys are kept, the stalest ones are dropped first.
+    """
+
+    __slots__ = ('event_ids', 'max_pending', 'dropped', '_pending', '_ready')
+
+    def __init__(self, max_pending: int = settings.LIVE_MAX_PENDING):
+        self.event_ids: set[int] = set()
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: OrderedDict[str, bytes] = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def push(self, key: str, message: bytes) -> None:
+        self._pending.pop(key, None)
+        self._pending[key] = message
+
+        if len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._ready.set()
+
+    async def get(self, timeout: float) -> list[bytes]:
+        """Wait for pending updates, returns an empty list if nothing came in ``timeout`` seconds."""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        messages = list(self._pending.values())
+        self._pending.clear()
+        self._ready.clear()
+        return messages
+
+
+class LiveHub:
+    """In-process pub/sub of event updates."""
+
+    def __init__(self):
+        self._subscribers: dict[int, set[Subscription]] = {}
+
+    def subscribe(self, subscription: Subscription, event_id: int) -> None:
+        self._subscribers.setdefault(event_id, set()).add(subscription)
+        subscription.event_ids.add(event_id)
+
+    def unsubscribe(self, subscription: Subscription, event_id: int) -> None:
+        subscribers = self._subscribers.get(event_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[event_id]
+        subscription.event_ids.discard(event_id)
+
+    def unsubscribe_all(self, subscription: Subscription) -> None:
+        for event_id in list(subscription.event_ids):
+            self.unsubscribe(subscription, event_id=event_id)
+
+    def subscribers_count(self, event_id: int) -> int:
+        return len(self._subscribers.get(event_id, ()))
+
+    def publish(self, event_id: int, kind: str, key: str, data: Any) -> None:
+        if event_id in self._subscribers:
+            self.broadcast(event_id=event_id, key=key, message=serialize(event_id=event_id, kind=kind, data=data))
+
+    def broadcast(self, event_id: int, key: str, message: bytes) -> None:
+        subscribers = self._subscribers.get(event_id)
+        if not subscribers:
+            return
+
+        for subscription in subscribers:
+            subscription.push(f'{event_id}:{key}', message)
+
+        logger.debug(f'broadcast {key} of event {event_id} to {len(subscribers)} subscribers')
+
+    def handle(self, notifications: Iterable['Notification']) -> None:
+        """Notification bus handler, forwards committed changes to the subscribers."""
+        for notification in notifications:
+            if notification.event_id is not None and notification.message is not None:
+                self.broadcast(event_id=notification.event_id, key=notification.key, message=notification.message)
+
+
+def serialize(event_id: int, kind: str, data: Any) -> bytes:
+    payload = {'type': kind, 'event_id': event_id, 'data': jsonable_encoder(data)}
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+async def sse_stream(
+        hub: LiveHub,
+        event_id: int,
+        snapshot: bytes,
+        is_disconnected: Callable[[], Awaitable[bool]],
+        heartbeat: float,
+) -> AsyncGenerator[bytes, None]:
+    subscription = Subscription()
+    hub.subscribe(subscription, event_id=event_id)
+
+    try:
+        yield b'data: ' + snapshot + b'\n\n'
+
+        while not await is_disconnected():
+            messages = await subscription.get(timeout=heartbeat)
+
+            if not messages:
+                yield HEARTBEAT
+                continue
+
+            for message in messages:
+                yield b'data: ' + message + b'\n\n'
+    finally:
+        hub.unsubscribe_all(subscription)
+
+
+live_hub = LiveHub()
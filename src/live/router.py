@@ -0,0 +1,75 @@
+import asyncio
+import contextlib
+import json
+
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from src.core.config import settings
+from src.live.dependencies import get_live_hub
+from src.live.hub import LiveHub, Subscription
+from src.live.schemas import LiveCommand, LiveAck
+
+router = APIRouter()
+
+
+def ack(action: str, event_id: int | None = None, detail: str | None = None) -> bytes:
+    return LiveAck(action=action, event_id=event_id, detail=detail).json(exclude_none=True).encode()
+
+
+async def send_updates(websocket: WebSocket, subscription: Subscription) -> None:
+    try:
+        while True:
+            for message in await subscription.get(timeout=settings.LIVE_HEARTBEAT_SECONDS):
+                await websocket.send_bytes(message)
+    except (WebSocketDisconnect, RuntimeError):
+        return
+
+
+@router.websocket('/ws')
+async def live_scores(websocket: WebSocket, hub: LiveHub = Depends(get_live_hub)):
+    """Multiplexed live updates.
+
+    Clients send ``{"action": "subscribe" | "unsubscribe", "event_id": 1}`` text frames
+    and receive every update as the binary frame the hub serialized once for all of
+    its subscribers. Acks and errors go through the same bounded queue as updates.
+    """
+    await websocket.accept()
+
+    subscription = Subscription()
+    sender = asyncio.create_task(send_updates(websocket=websocket, subscription=subscription))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message['type'] == 'websocket.disconnect':
+                raise WebSocketDisconnect(message.get('code', 1000))
+
+            # binary frames carry ``bytes`` instead of ``text`` and are no commands either
+            try:
+                command = LiveCommand.parse_raw(message['text'])
+            except (KeyError, TypeError, ValidationError, json.JSONDecodeError):
+                subscription.push('error', ack(action='error', detail='Invalid command'))
+                continue
+
+            if command.action == 'unsubscribe':
+                hub.unsubscribe(subscription, event_id=command.event_id)
+            elif (
+                    command.event_id not in subscription.event_ids and
+                    len(subscription.event_ids) >= settings.LIVE_MAX_SUBSCRIPTIONS
+            ):
+                subscription.push('error', ack(action='error', detail='Too many subscriptions'))
+                continue
+            else:
+                hub.subscribe(subscription, event_id=command.event_id)
+
+            subscription.push(
+                f'{command.event_id}:ack', ack(action=command.action, event_id=command.event_id),
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.unsubscribe_all(subscription)
+        sender.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sender
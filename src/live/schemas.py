@@ -0,0 +1,14 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class LiveCommand(BaseModel):
+    action: Literal['subscribe', 'unsubscribe']
+    event_id: int
+
+
+class LiveAck(BaseModel):
+    action: str
+    event_id: int | None = None
+    detail: str | None = None
@@ -6,9 +6,20 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from src.auth.router import router as auth_router
+from src.core.cache import event_cache, projection_cache
+from src.core.locks import event_locker
 from src.events.router import router as event_router
+from src.leaderboard.ranking import global_ranking
+from src.leaderboard.router import router as leaderboard_router
+from src.leaderboard.snapshot import snapshot_writer
+from src.leagues.router import router as league_router
+from src.live.bus import bus
+from src.live.hub import live_hub
+from src.live.router import router as live_router
 from src.matches.router import router as match_router
 from src.predictions.router import router as prediction_router
+from src.scoring.dependencies import simulation_pool
+from src.scoring.router import router as scoring_router
 
 log_file_path = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'logging.ini')
 logging.config.fileConfig(log_file_path, disable_existing_loggers=False)
@@ -20,6 +31,45 @@ app.include_router(auth_router, prefix='/auth', tags=['Auth'])
 app.include_router(event_router, prefix='/events', tags=['Events'])
 app.include_router(match_router, prefix='', tags=['Matches'])
 app.include_router(prediction_router, prefix='/predictions', tags=['Predictions'])
+app.include_router(leaderboard_router, prefix='', tags=['Leaderboard'])
+app.include_router(scoring_router, prefix='', tags=['Leaderboard'])
+app.include_router(league_router, prefix='/leagues', tags=['Leagues'])
+app.include_router(live_router, prefix='/live', tags=['Live'])
+
+
+@app.on_event('startup')
+async def start_notification_bus() -> None:
+    bus.add_handler(event_cache.handle)
+    bus.add_handler(projection_cache.handle)
+    bus.add_handler(live_hub.handle)
+    if snapshot_writer is None:
+        bus.add_handler(global_ranking.handle)
+    await bus.start()
+
+
+@app.on_event('startup')
+async def load_global_ranking() -> None:
+    if snapshot_writer is not None:
+        # the first worker to start writes the snapshot, the others map it
+        await snapshot_writer.write(if_missing=True)
+    else:
+        await global_ranking.load()
+
+
+@app.on_event('shutdown')
+async def stop_notification_bus() -> None:
+    await bus.stop()
+
+
+@app.on_event('shutdown')
+async def close_event_locker() -> None:
+    await event_locker.close()
+
+
+@app.on_event('shutdown')
+def stop_simulation_pool() -> None:
+    simulation_pool.shutdown(wait=False, cancel_futures=True)
+
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,28 +1,79 @@
-from src.events.models import Match
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from src.events.models import Match, EventStatus
 from src.events.schemas import MatchCreate
-from src.matches.schemas import MatchRead, MatchUpdate
+from src.matches.models import MatchStatus
+from src.matches.schemas import (
+    MatchRead, MatchUpdate, MatchScore, MatchFinishResult, MatchCorrection, MatchFeedRow, MatchFilter,
+    MatchBulkCreateResult,
+)
 
 
 class BaseMatchRepository:
-    async def create(self, match: MatchCreate, event_id: int) -> Match:
+    async def create(self, match: MatchCreate, event_id: int) -> Match | None:
+        raise NotImplementedError
+
+    async def create_multiple(
+            self, event_id: int, matches: Sequence[MatchCreate], max_count: int,
+    ) -> tuple[EventStatus | None, int, Sequence[Match]]:
         raise NotImplementedError
 
     async def get_by_id(self, match_id: int) -> Match | None:
         raise NotImplementedError
 
+    async def get_multiple(
+            self, filters: MatchFilter, after: tuple[datetime, int] | None = None, limit: int = 100,
+    ) -> Sequence[Match]:
+        raise NotImplementedError
+
     async def update(self, match_id: int, match_data: MatchUpdate) -> Match:
         raise NotImplementedError
 
     async def delete(self, match_id: int) -> None:
         raise NotImplementedError
 
+    async def finish(self, match_id: int, home_goals: int, away_goals: int) -> tuple[bool, Match | None]:
+        raise NotImplementedError
+
+    async def finish_multiple(self, event_id: int, scores: Sequence[MatchScore]) -> Sequence[Match]:
+        raise NotImplementedError
+
+    async def correct(
+            self, match_id: int, home_goals: int, away_goals: int,
+    ) -> tuple[bool, Match | None, list[tuple[UUID, int]]]:
+        raise NotImplementedError
+
+    async def upsert_multiple(
+            self, matches: Sequence[MatchFeedRow], max_count: int,
+    ) -> tuple[Sequence[Match], int]:
+        raise NotImplementedError
+
+    async def get_statuses(self, event_id: int, match_ids: Sequence[int]) -> dict[int, MatchStatus]:
+        raise NotImplementedError
+
 
 class BaseMatchService:
+    async def get_multiple(
+            self, filters: MatchFilter, after: tuple[datetime, int] | None = None, limit: int = 100,
+    ) -> list[MatchRead]:
+        raise NotImplementedError
+
     async def create(self, match: MatchCreate, event_id: int) -> MatchRead:
         raise NotImplementedError
 
+    async def create_multiple(self, matches: Sequence[MatchCreate], event_id: int) -> MatchBulkCreateResult:
+        raise NotImplementedError
+
     async def delete(self, match_id: int) -> None:
         raise NotImplementedError
 
     async def finish(self, match_id: int, home_goals: int, away_goals: int) -> MatchRead:
         raise NotImplementedError
+
+    async def finish_multiple(self, event_id: int, scores: Sequence[MatchScore]) -> list[MatchFinishResult]:
+        raise NotImplementedError
+
+    async def correct(self, match_id: int, home_goals: int, away_goals: int) -> MatchCorrection:
+        raise NotImplementedError
@@ -3,7 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.database import get_async_session
 from src.events.base import BaseEventRepository
-from src.events.dependencies import get_event_repo
+from src.core.locks import EventLocker
+from src.events.dependencies import get_event_repo, get_event_locker
+from src.leaderboard.dependencies import get_snapshot_writer
+from src.leaderboard.snapshot import LeaderboardSnapshotWriter
+from src.live.bus import NotificationBus
+from src.live.dependencies import get_bus
 from src.matches.repo import MatchRepository
 from src.matches.service import MatchService
 from src.predictions.repo import PredictionRepository
@@ -17,6 +22,16 @@ async def get_match_service(
         session: AsyncSession = Depends(get_async_session),
         repo: MatchRepository = Depends(get_match_repo),
         event_repo: BaseEventRepository = Depends(get_event_repo),
+        bus: NotificationBus = Depends(get_bus),
+        locker: EventLocker = Depends(get_event_locker),
+        snapshot_writer: LeaderboardSnapshotWriter | None = Depends(get_snapshot_writer),
 ):
     prediction_repo = PredictionRepository(session=session)
-    yield MatchService(repo, event_repo=event_repo, prediction_repo=prediction_repo)
+    yield MatchService(
+        repo,
+        event_repo=event_repo,
+        prediction_repo=prediction_repo,
+        bus=bus,
+        locker=locker,
+        snapshot_writer=snapshot_writer,
+    )
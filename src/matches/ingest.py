@@ -0,0 +1,144 @@
+"""Ingestion of fixtures and results from provider feed files.
+
+    python -m src.matches.ingest fixtures.csv results.jsonl --batch-size 1000
+
+CSV files need a header with ``MatchFeedRow`` fields, JSONL files have one object per line.
+Files are streamed and upserted in batches, so memory does not depend on the file size, and
+re-running a file changes nothing.
+"""
+import argparse
+import asyncio
+import csv
+import dataclasses
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar
+
+from pydantic import ValidationError
+
+from src.core.config import settings
+from src.db.database import async_session_maker
+from src.leaderboard.ranking import STANDINGS_KEY
+from src.leaderboard.snapshot import snapshot_writer
+from src.live.bus import NotificationBus, bus
+from src.matches.base import BaseMatchRepository
+from src.matches.models import MatchStatus
+from src.matches.repo import MatchRepository
+from src.matches.schemas import MatchFeedRow, MatchRead
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# every row takes 7 bind parameters, asyncpg accepts at most 32767 per statement
+MAX_BATCH_SIZE = 4000
+
+
+@dataclasses.dataclass
+class IngestStats:
+    rows: int = 0
+    invalid: int = 0
+    changed: int = 0
+    completed: int = 0
+    skipped: int = 0
+
+
+def read_rows(path: Path, file_format: str | None = None) -> Iterator[dict | str]:
+    """Yields CSV rows as dicts and JSONL lines as raw strings, parsing is left to ``parse_rows``."""
+    file_format = (file_format or path.suffix.lstrip('.')).lower()
+
+    if file_format not in ('csv', 'jsonl', 'ndjson'):
+        raise ValueError(f'Unsupported feed format {file_format}')
+
+    with path.open(newline='', encoding='utf-8') as file:
+        if file_format == 'csv':
+            yield from csv.DictReader(file)
+        else:
+            yield from (line for line in file if line.strip())
+
+
+def parse_rows(rows: Iterable[dict | str], stats: IngestStats) -> Iterator[MatchFeedRow]:
+    for number, row in enumerate(rows, start=1):
+        stats.rows += 1
+        try:
+            yield MatchFeedRow.parse_raw(row) if isinstance(row, str) else MatchFeedRow.parse_obj(row)
+        except ValidationError as error:
+            stats.invalid += 1
+            logger.warning(f'skipping feed row {number}: {error}')
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+async def ingest(
+        rows: Iterable[dict | str],
+        repo: BaseMatchRepository,
+        batch_size: int = 1000,
+        bus: NotificationBus | None = None,
+) -> IngestStats:
+    """Upserts feed rows batch by batch, matches completed by the feed get scored by the repository.
+
+    The feed follows the rules of admin mutations: it holds the event locks while writing and adds
+    matches to created events only, up to ``MATCHES_COUNT`` matches per event.
+    """
+    stats = IngestStats()
+
+    for batch in batched(parse_rows(rows, stats=stats), size=min(batch_size, MAX_BATCH_SIZE)):
+        changed, skipped = await repo.upsert_multiple(matches=batch, max_count=settings.MATCHES_COUNT)
+        stats.changed += len(changed)
+        stats.skipped += skipped
+
+        scored_events = set()
+        for match in changed:
+            if match.status == MatchStatus.completed:
+                stats.completed += 1
+                scored_events.add(match.event_id)
+
+            if bus is not None:
+                match = MatchRead.from_orm(match)
+                await bus.publish(event_id=match.event_id, kind='match', key=f'match:{match.id}', data=match)
+
+        if bus is not None:
+            for event_id in scored_events:
+                await bus.publish(event_id=event_id, kind='standings', key=STANDINGS_KEY, data=None)
+
+    return stats
+
+
+async def run(paths: list[Path], file_format: str | None, batch_size: int) -> None:
+    async with async_session_maker() as session:
+        repo = MatchRepository(session)
+        completed = 0
+
+        for path in paths:
+            stats = await ingest(read_rows(path, file_format=file_format), repo=repo, batch_size=batch_size, bus=bus)
+            completed += stats.completed
+            logger.info(
+                f'{path}: {stats.rows} rows, {stats.invalid} invalid, '
+                f'{stats.changed} matches inserted or changed, {stats.completed} completed, {stats.skipped} skipped'
+            )
+
+    if snapshot_writer is not None and completed:
+        await snapshot_writer.write()
+
+    await bus.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Upsert matches from fixtures and results feed files.')
+    parser.add_argument('paths', nargs='+', type=Path)
+    parser.add_argument('--format', dest='file_format', choices=['csv', 'jsonl', 'ndjson'],
+                        help='feed format, taken from the file extension by default')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    asyncio.run(run(paths=args.paths, file_format=args.file_format, batch_size=args.batch_size))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy import Integer, String, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import ENUM as pgEnum
 
@@ -23,6 +23,10 @@ class MatchStatus(enum.IntEnum):
 
 class Match(Base):
     __tablename__ = 'matches'
+    __table_args__ = (
+        UniqueConstraint('event_id', 'home_team', 'away_team', 'start_time', name='uix_matches_natural_key'),
+        Index('ix_matches_start_time_id', 'start_time', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     home_team: Mapped[str] = mapped_column(String(128), nullable=False)
@@ -37,7 +41,7 @@ class Match(Base):
     predictions: Mapped[list['Prediction']] = relationship('Prediction', backref='match')
 
     def result(self) -> MatchResult | None:
-        if not self.home_goals or not self.away_goals:
+        if self.home_goals is None or self.away_goals is None:
             return None
         elif self.home_goals == self.away_goals:
             return MatchResult.draw
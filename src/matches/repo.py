@@ -1,10 +1,23 @@
-from sqlalchemy import select, delete, update
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import (
+    select, delete, update, values, column, literal, exists, true, tuple_, and_, or_, func, Integer, String, DateTime,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from src.events.models import Match
+from src.core.locks import EVENT_LOCK_NAMESPACE
+from src.events.models import Match, Event, EventStatus
 from src.events.schemas import MatchCreate
+from src.leaderboard.repo import ranks_update
 from src.matches.base import BaseMatchRepository
-from src.matches.schemas import MatchUpdate
+from src.matches.models import MatchStatus
+from src.matches.schemas import MatchUpdate, MatchScore, MatchFeedRow, MatchFilter
+from src.predictions.repo import points_rescore_for_matches
+from src.scoring.repo import arrays_table
 
 
 class MatchRepository(BaseMatchRepository):
@@ -16,16 +29,98 @@ class MatchRepository(BaseMatchRepository):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def create(self, match: MatchCreate, event_id: int) -> Match:
-        new_match = Match(**match.dict(), event_id=event_id)
+    async def get_multiple(
+            self, filters: MatchFilter, after: tuple[datetime, int] | None = None, limit: int = 100,
+    ) -> Sequence[Match]:
+        """Matches of all events ordered by ``(start_time, id)``.
+
+        ``after`` is the key of the last match of the previous page, so pages are read from the index.
+        """
+        stmt = select(Match).order_by(Match.start_time, Match.id).limit(limit)
+
+        if filters.start_from is not None:
+            stmt = stmt.where(Match.start_time >= filters.start_from)
+        if filters.start_to is not None:
+            stmt = stmt.where(Match.start_time < filters.start_to)
+        if filters.team is not None:
+            stmt = stmt.where(or_(Match.home_team == filters.team, Match.away_team == filters.team))
+        if filters.status is not None:
+            stmt = stmt.where(Match.status == filters.status)
+        if after is not None:
+            stmt = stmt.where(tuple_(Match.start_time, Match.id) > tuple_(*after))
+
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def create(self, match: MatchCreate, event_id: int) -> Match | None:
+        """Returns ``None`` if the event already has the same match."""
+        stmt = insert(Match) \
+            .values(**match.dict(), event_id=event_id) \
+            .on_conflict_do_nothing(constraint='uix_matches_natural_key') \
+            .returning(Match)
+        new_match = (await self.session.execute(stmt)).scalar_one_or_none()
 
-        self.session.add(new_match)
         await self.session.commit()
-        await self.session.refresh(new_match)
         return new_match
 
-    async def update(self, match_id: int, match: MatchUpdate) -> Match:
-        stmt = update(Match).where(Match.id == match_id).values(**match.dict()).returning(Match)
+    async def create_multiple(
+            self, event_id: int, matches: Sequence[MatchCreate], max_count: int,
+    ) -> tuple[EventStatus | None, int, Sequence[Match]]:
+        """Adds matches to a created event up to ``max_count`` matches in total.
+
+        The event row stays locked until commit, so concurrent calls see each other's matches
+        and can't exceed the limit. Matches the event already has and repeated rows are skipped
+        and don't take places of the limit. Returns the event status, ``None`` if there is no such
+        event, the number of matches the event had places for and the created matches.
+        """
+        stmt = select(Event.status).where(Event.id == event_id).with_for_update()
+        event_status = (await self.session.execute(stmt)).scalar_one_or_none()
+
+        if event_status is None:
+            return None, 0, []
+
+        # counted by a separate statement, which sees matches committed while waiting for the lock
+        stmt = select(func.count(Match.id)).where(Match.event_id == event_id)
+        capacity = max_count - (await self.session.execute(stmt)).scalar_one()
+
+        if event_status != EventStatus.created or capacity <= 0 or not matches:
+            await self.session.rollback()
+            return event_status, capacity, []
+
+        unique = {}
+        for match in matches:
+            unique.setdefault((match.home_team, match.away_team, match.start_time), match)
+
+        payload = values(
+            column('number', Integer), column('home_team', String), column('away_team', String),
+            column('start_time', DateTime(timezone=True)),
+            name='payload',
+        ).data([
+            (number, match.home_team, match.away_team, match.start_time)
+            for number, match in enumerate(unique.values())
+        ])
+        rows = select(literal(event_id, Integer), payload.c.home_team, payload.c.away_team, payload.c.start_time) \
+            .where(~exists().where(
+                Match.event_id == event_id,
+                Match.home_team == payload.c.home_team,
+                Match.away_team == payload.c.away_team,
+                Match.start_time == payload.c.start_time,
+            )) \
+            .order_by(payload.c.number) \
+            .limit(capacity)
+
+        stmt = insert(Match) \
+            .from_select(['event_id', 'home_team', 'away_team', 'start_time'], rows) \
+            .on_conflict_do_nothing(constraint='uix_matches_natural_key') \
+            .returning(Match)
+        created = (await self.session.execute(stmt)).scalars().all()
+
+        await self.session.commit()
+
+        return event_status, capacity, created
+
+    async def update(self, match_id: int, match_data: MatchUpdate) -> Match:
+        stmt = update(Match).where(Match.id == match_id).values(**match_data.dict()).returning(Match)
         result = await self.session.execute(stmt)
 
         await self.session.commit()
@@ -36,3 +131,198 @@ class MatchRepository(BaseMatchRepository):
         stmt = delete(Match).where(Match.id == match_id)
         await self.session.execute(stmt)
         await self.session.commit()
+
+    async def finish(self, match_id: int, home_goals: int, away_goals: int) -> tuple[bool, Match | None]:
+        """Completes the match and scores its predictions.
+
+        Returns whether the match exists and the completed match, which is ``None``
+        if the match had already been completed, e.g. by a concurrent request.
+        """
+        matches = Match.__table__
+
+        target = select(matches.c.id).where(matches.c.id == match_id).cte('target')
+        updated = update(matches) \
+            .where((matches.c.id == match_id) & (matches.c.status != MatchStatus.completed)) \
+            .values(home_goals=home_goals, away_goals=away_goals, status=MatchStatus.completed) \
+            .returning(*matches.c) \
+            .cte('updated')
+        updated_match = aliased(Match, updated)
+
+        stmt = select(target.c.id, updated_match) \
+            .select_from(target) \
+            .outerjoin(updated_match, true()) \
+            .execution_options(populate_existing=True)
+        row = (await self.session.execute(stmt)).one_or_none()
+
+        if row is None:
+            return False, None
+
+        match = row[1]
+
+        if match is not None:
+            await self.session.execute(points_rescore_for_matches(match_ids=[match.id]))
+            await self.session.execute(ranks_update(event_ids=[match.event_id]))
+
+        await self.session.commit()
+
+        return True, match
+
+    async def correct(
+            self, match_id: int, home_goals: int, away_goals: int,
+    ) -> tuple[bool, Match | None, list[tuple[UUID, int]]]:
+        """Corrects the result of a completed match and re-scores the predictions whose points change.
+
+        Returns whether the match exists, the corrected match, which is ``None`` if the match
+        is not completed, and ``(user_id, delta)`` points changes of the re-scored predictions.
+        """
+        matches = Match.__table__
+
+        target = select(matches.c.id).where(matches.c.id == match_id).cte('target')
+        updated = update(matches) \
+            .where((matches.c.id == match_id) & (matches.c.status == MatchStatus.completed)) \
+            .values(home_goals=home_goals, away_goals=away_goals) \
+            .returning(*matches.c) \
+            .cte('updated')
+        updated_match = aliased(Match, updated)
+
+        stmt = select(target.c.id, updated_match) \
+            .select_from(target) \
+            .outerjoin(updated_match, true()) \
+            .execution_options(populate_existing=True)
+        row = (await self.session.execute(stmt)).one_or_none()
+
+        if row is None:
+            return False, None, []
+
+        match = row[1]
+        deltas = []
+
+        if match is not None:
+            result = await self.session.execute(points_rescore_for_matches(match_ids=[match.id]))
+            deltas = [(user_id, delta) for user_id, delta in result.all()]
+            if deltas:
+                await self.session.execute(ranks_update(event_ids=[match.event_id]))
+
+        await self.session.commit()
+
+        return True, match, deltas
+
+    async def finish_multiple(self, event_id: int, scores: Sequence[MatchScore]) -> Sequence[Match]:
+        """Completes not yet completed matches of the event and scores their predictions in one transaction."""
+        results = values(
+            column('match_id', Integer), column('home_goals', Integer), column('away_goals', Integer),
+            name='results',
+        ).data([(score.match_id, score.home_goals, score.away_goals) for score in scores])
+
+        stmt = update(Match) \
+            .where(
+                (Match.id == results.c.match_id) &
+                (Match.event_id == event_id) &
+                (Match.status != MatchStatus.completed)
+            ) \
+            .values(home_goals=results.c.home_goals, away_goals=results.c.away_goals, status=MatchStatus.completed) \
+            .returning(Match) \
+            .execution_options(synchronize_session=False)
+        result = await self.session.execute(stmt)
+        matches = result.scalars().all()
+
+        if matches:
+            await self.session.execute(points_rescore_for_matches(match_ids=[match.id for match in matches]))
+            await self.session.execute(ranks_update(event_ids=[event_id]))
+
+        await self.session.commit()
+
+        return matches
+
+    async def upsert_multiple(
+            self, matches: Sequence[MatchFeedRow], max_count: int,
+    ) -> tuple[Sequence[Match], int]:
+        """Inserts new and updates changed matches by their natural key in one transaction.
+
+        The events of the rows are locked with the advisory locks of ``PostgresEventLocker`` and
+        their rows like in ``create_multiple``, both until commit, so the feed is serialized with
+        admin mutations of the events. New matches are only added to created events and up to
+        ``max_count`` matches in total, the other new rows and rows of not existing events are
+        skipped. Completed matches are never changed, their results are fixed through ``correct``,
+        so every returned completed match has just been completed and its predictions are scored.
+        The last of duplicated rows wins. Returns inserted and changed matches only, so re-running
+        the same feed changes nothing, and the number of skipped rows.
+        """
+        rows = list({(row.event_id, row.home_team, row.away_team, row.start_time): row for row in matches}.values())
+        event_ids = sorted({row.event_id for row in rows})
+
+        events = arrays_table('events', event_id=(Integer(), event_ids))
+        await self.session.execute(select(func.pg_advisory_xact_lock(EVENT_LOCK_NAMESPACE, events.c.event_id)))
+
+        stmt = select(Event.id, Event.status).where(Event.id.in_(event_ids)).order_by(Event.id).with_for_update()
+        statuses = dict((await self.session.execute(stmt)).all())
+
+        stmt = select(Match.event_id, func.count(Match.id)).where(Match.event_id.in_(statuses)).group_by(Match.event_id)
+        counts = dict((await self.session.execute(stmt)).all())
+
+        # existing matches are found by the database, which compares start times of any timezone
+        feed = values(
+            column('number', Integer), column('event_id', Integer), column('home_team', String),
+            column('away_team', String), column('start_time', DateTime(timezone=True)),
+            name='feed',
+        ).data([
+            (number, row.event_id, row.home_team, row.away_team, row.start_time)
+            for number, row in enumerate(rows) if row.event_id in statuses
+        ])
+        stmt = select(feed.c.number).join(Match, and_(
+            Match.event_id == feed.c.event_id,
+            Match.home_team == feed.c.home_team,
+            Match.away_team == feed.c.away_team,
+            Match.start_time == feed.c.start_time,
+        ))
+        existing = set((await self.session.execute(stmt)).scalars().all()) if statuses else set()
+
+        accepted = []
+        for number, row in enumerate(rows):
+            if row.event_id not in statuses:
+                continue
+
+            if number not in existing:
+                if statuses[row.event_id] != EventStatus.created or counts.get(row.event_id, 0) >= max_count:
+                    continue
+                counts[row.event_id] = counts.get(row.event_id, 0) + 1
+
+            accepted.append(row)
+
+        skipped = len(rows) - len(accepted)
+
+        if not accepted:
+            await self.session.rollback()
+            return [], skipped
+
+        stmt = insert(Match).values([row.dict() for row in accepted])
+        stmt = stmt.on_conflict_do_update(
+            constraint='uix_matches_natural_key',
+            set_={
+                'status': stmt.excluded.status,
+                'home_goals': stmt.excluded.home_goals,
+                'away_goals': stmt.excluded.away_goals,
+            },
+            where=(Match.status != MatchStatus.completed) & (
+                tuple_(Match.status, Match.home_goals, Match.away_goals).is_distinct_from(
+                    tuple_(stmt.excluded.status, stmt.excluded.home_goals, stmt.excluded.away_goals)
+                )
+            ),
+        ).returning(Match)
+
+        result = await self.session.execute(stmt.execution_options(populate_existing=True))
+        changed = result.scalars().all()
+
+        completed = [match for match in changed if match.status == MatchStatus.completed]
+        if completed:
+            await self.session.execute(points_rescore_for_matches(match_ids=[match.id for match in completed]))
+            await self.session.execute(ranks_update(event_ids={match.event_id for match in completed}))
+
+        await self.session.commit()
+
+        return changed, skipped
+
+    async def get_statuses(self, event_id: int, match_ids: Sequence[int]) -> dict[int, MatchStatus]:
+        stmt = select(Match.id, Match.status).where(Match.event_id == event_id, Match.id.in_(match_ids))
+        result = await self.session.execute(stmt)
+        return {match_id: match_status for match_id, match_status in result.all()}
@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.params import Query
+from pydantic import conlist
 from starlette import status
 
 from src import exceptions
@@ -7,11 +10,31 @@ from src.auth.dependencies import get_current_superuser
 from src.core.config import settings
 from src.matches.base import BaseMatchService
 from src.matches.dependencies import get_match_service
-from src.matches.schemas import MatchRead, MatchCreate
+from src.matches.schemas import (
+    MatchRead, MatchCreate, MatchScore, MatchFinishResult, MatchCorrection, MatchFilter, MatchBulkCreateResult,
+)
 
 router = APIRouter()
 
 
+@router.get('/matches', response_model=list[MatchRead])
+async def get_matches(
+        filters: MatchFilter = Depends(),
+        after_start_time: datetime | None = None,
+        after_id: int | None = None,
+        limit: int = Query(default=100, ge=1, le=500),
+        match_service: BaseMatchService = Depends(get_match_service),
+):
+    if (after_start_time is None) != (after_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='after_start_time and after_id must be passed together',
+        )
+
+    after = (after_start_time, after_id) if after_id is not None else None
+    return await match_service.get_multiple(filters=filters, after=after, limit=limit)
+
+
 @router.post(
     '/events/{event_id}/matches',
     response_model=MatchRead,
@@ -37,9 +60,43 @@ async def create_match(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f'Event already has {settings.MATCHES_COUNT} matches',
         )
+    except exceptions.MatchAlreadyExists:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Event already has this match')
+    except exceptions.EventLocked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Event is being changed, try again')
     return match
 
 
+@router.post(
+    '/events/{event_id}/matches/bulk',
+    response_model=MatchBulkCreateResult,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(get_current_superuser)],
+)
+async def create_matches(
+        event_id: int,
+        matches: list[MatchCreate],
+        match_service: BaseMatchService = Depends(get_match_service),
+):
+    try:
+        result = await match_service.create_multiple(matches=matches, event_id=event_id)
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
+    except exceptions.UnexpectedEventStatus:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Event already is running',
+        )
+    except exceptions.MatchesLimitError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Event already has {settings.MATCHES_COUNT} matches',
+        )
+    except exceptions.EventLocked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Event is being changed, try again')
+    return result
+
+
 @router.delete(
     '/matches/{match_id}',
     status_code=status.HTTP_200_OK,
@@ -53,6 +110,8 @@ async def delete_match(
         await match_service.delete(match_id=match_id)
     except exceptions.MatchNotFound:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Match not found')
+    except exceptions.EventLocked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Event is being changed, try again')
 
 
 @router.patch(
@@ -72,4 +131,47 @@ async def finish_match(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Match not found')
     except exceptions.UnexpectedMatchStatus:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Match is already completed')
+    except exceptions.EventLocked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Event is being changed, try again')
     return match
+
+
+@router.patch(
+    '/events/{event_id}/matches/finish',
+    response_model=list[MatchFinishResult],
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_superuser)],
+)
+async def finish_matches(
+        event_id: int,
+        scores: conlist(MatchScore, min_items=1, max_items=settings.MATCHES_COUNT),
+        match_service: BaseMatchService = Depends(get_match_service),
+):
+    try:
+        results = await match_service.finish_multiple(event_id=event_id, scores=scores)
+    except exceptions.EventLocked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Event is being changed, try again')
+    return results
+
+
+@router.patch(
+    '/matches/{match_id}/correct',
+    response_model=MatchCorrection,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(get_current_superuser)],
+)
+async def correct_match(
+        match_id: int,
+        home_goals: int = Query(ge=0, le=9),
+        away_goals: int = Query(ge=0, le=9),
+        match_service: BaseMatchService = Depends(get_match_service),
+):
+    try:
+        correction = await match_service.correct(match_id=match_id, home_goals=home_goals, away_goals=away_goals)
+    except exceptions.MatchNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Match not found')
+    except exceptions.UnexpectedMatchStatus:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Match is not completed yet')
+    except exceptions.EventLocked:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail='Event is being changed, try again')
+    return correction
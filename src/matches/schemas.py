@@ -1,6 +1,9 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, UUID4, validator, root_validator
+
+from src.matches.models import MatchStatus
 
 
 class MatchBase(BaseModel):
@@ -39,3 +42,73 @@ class MatchRead(MatchBase):
 
     class Config:
         orm_mode = True
+
+
+class MatchFilter(BaseModel):
+    start_from: datetime | None = None
+    start_to: datetime | None = None
+    team: str | None = None
+    status: MatchStatus | None = None
+
+
+class MatchBulkCreateResult(BaseModel):
+    matches: list[MatchRead]
+    skipped: int
+
+
+class MatchScore(BaseModel):
+    match_id: int
+    home_goals: int = Field(ge=0, le=9)
+    away_goals: int = Field(ge=0, le=9)
+
+
+class MatchFinishResult(BaseModel):
+    match_id: int
+    status: Literal['finished', 'not_found', 'already_completed']
+    match: MatchRead | None = None
+
+
+class PointsDelta(BaseModel):
+    user_id: UUID4
+    delta: int
+
+
+class MatchCorrection(BaseModel):
+    match: MatchRead
+    deltas: list[PointsDelta]
+
+
+class MatchFeedRow(BaseModel):
+    """Fixture or result from a provider feed, identified by event, teams and start time."""
+    event_id: int
+    home_team: str = Field(max_length=128, min_length=3)
+    away_team: str = Field(max_length=128, min_length=3)
+    start_time: datetime
+    status: MatchStatus = MatchStatus.upcoming
+    home_goals: int | None = Field(default=None, ge=0)
+    away_goals: int | None = Field(default=None, ge=0)
+
+    @validator('home_goals', 'away_goals', pre=True)
+    def empty_goals(cls, value):
+        return None if value == '' else value
+
+    @validator('status', pre=True)
+    def parse_status(cls, value):
+        if value is None or value == '':
+            return MatchStatus.upcoming
+        if isinstance(value, str) and not value.isdigit():
+            try:
+                return MatchStatus[value.lower()]
+            except KeyError:
+                raise ValueError(f'unknown match status {value}')
+        return value
+
+    @validator('start_time')
+    def aware_start_time(cls, value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+    @root_validator(skip_on_failure=True)
+    def completed_has_score(cls, values):
+        if values['status'] == MatchStatus.completed and (values['home_goals'] is None or values['away_goals'] is None):
+            raise ValueError('completed match needs home_goals and away_goals')
+        return values
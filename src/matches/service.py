@@ -1,11 +1,21 @@
+from datetime import datetime
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncContextManager, AsyncIterator, Sequence
+
 from src import exceptions
 from src.core.config import settings
+from src.core.locks import EventLocker
 from src.events.base import BaseEventRepository
 from src.events.models import EventStatus
 from src.events.schemas import MatchCreate
+from src.leaderboard.ranking import STANDINGS_KEY
+from src.leaderboard.snapshot import LeaderboardSnapshotWriter
+from src.live.bus import NotificationBus
 from src.matches.base import BaseMatchService, BaseMatchRepository
 from src.matches.models import MatchStatus
-from src.matches.schemas import MatchRead, MatchUpdate
+from src.matches.schemas import (
+    MatchRead, MatchScore, MatchFinishResult, MatchCorrection, PointsDelta, MatchFilter, MatchBulkCreateResult,
+)
 from src.predictions.base import BasePredictionRepository
 
 
@@ -15,57 +25,175 @@ class MatchService(BaseMatchService):
             repo: BaseMatchRepository,
             event_repo: BaseEventRepository,
             prediction_repo: BasePredictionRepository,
+            bus: NotificationBus | None = None,
+            locker: EventLocker | None = None,
+            snapshot_writer: LeaderboardSnapshotWriter | None = None,
     ):
         self.repo = repo
         self.event_repo = event_repo
         self.prediction_repo = prediction_repo
+        self.bus = bus
+        self.locker = locker
+        self.snapshot_writer = snapshot_writer
+
+    async def get_multiple(
+            self, filters: MatchFilter, after: tuple[datetime, int] | None = None, limit: int = 100,
+    ) -> list[MatchRead]:
+        matches = await self.repo.get_multiple(filters=filters, after=after, limit=limit)
+        return [MatchRead.from_orm(match) for match in matches]
 
     async def create(self, match: MatchCreate, event_id: int) -> MatchRead:
-        event = await self.event_repo.get_by_id(event_id=event_id)
+        result = await self.create_multiple(matches=[match], event_id=event_id)
+
+        if not result.matches:
+            raise exceptions.MatchAlreadyExists
+
+        return result.matches[0]
+
+    async def create_multiple(self, matches: Sequence[MatchCreate], event_id: int) -> MatchBulkCreateResult:
+        async with self._lock(event_id):
+            event_status, capacity, created = await self.repo.create_multiple(
+                event_id=event_id, matches=matches, max_count=settings.MATCHES_COUNT,
+            )
 
-        if not event:
+        if event_status is None:
             raise exceptions.EventNotFound
 
-        if event.status != EventStatus.created:
+        if event_status != EventStatus.created:
             raise exceptions.UnexpectedEventStatus
 
-        if len(event.matches) == settings.MATCHES_COUNT:
+        if matches and capacity <= 0:
             raise exceptions.MatchesLimitError
 
-        new_match = await self.repo.create(match=match, event_id=event_id)
+        created = [MatchRead.from_orm(match) for match in created]
 
-        new_match = MatchRead.from_orm(new_match)
+        if self.bus is not None:
+            for match in created:
+                await self.bus.publish(event_id=event_id, kind='match', key=f'match:{match.id}', data=match)
 
-        return new_match
+        return MatchBulkCreateResult(matches=created, skipped=len(matches) - len(created))
 
     async def finish(self, match_id, home_goals: int, away_goals: int) -> MatchRead:
-        match = await self.repo.get_by_id(match_id=match_id)
+        async with self._lock_match(match_id) as event_id:
+            if event_id is None:
+                raise exceptions.MatchNotFound
+
+            exists, updated_match = await self.repo.finish(
+                match_id=match_id, home_goals=home_goals, away_goals=away_goals,
+            )
+
+        if not exists:
+            raise exceptions.MatchNotFound
+
+        if updated_match is None:
+            raise exceptions.UnexpectedMatchStatus
+
+        updated_match = MatchRead.from_orm(updated_match)
+
+        if self.bus is not None:
+            await self.bus.publish(
+                event_id=updated_match.event_id, kind='match', key=f'match:{match_id}', data=updated_match,
+            )
+
+        await self._standings_changed(event_id=updated_match.event_id)
+
+        return updated_match
+
+    async def finish_multiple(self, event_id: int, scores: Sequence[MatchScore]) -> list[MatchFinishResult]:
+        scores = list({score.match_id: score for score in scores}.values())
+
+        if not scores:
+            return []
 
-        if not match:
+        async with self._lock(event_id):
+            finished = await self.repo.finish_multiple(event_id=event_id, scores=scores)
+        finished = {match.id: MatchRead.from_orm(match) for match in finished}
+
+        missing = [score.match_id for score in scores if score.match_id not in finished]
+        statuses = await self.repo.get_statuses(event_id=event_id, match_ids=missing) if missing else {}
+
+        results = []
+        for score in scores:
+            if score.match_id in finished:
+                results.append(
+                    MatchFinishResult(match_id=score.match_id, status='finished', match=finished[score.match_id])
+                )
+            elif score.match_id in statuses:
+                results.append(MatchFinishResult(match_id=score.match_id, status='already_completed'))
+            else:
+                results.append(MatchFinishResult(match_id=score.match_id, status='not_found'))
+
+        if self.bus is not None:
+            for match in finished.values():
+                await self.bus.publish(event_id=event_id, kind='match', key=f'match:{match.id}', data=match)
+
+        if finished:
+            await self._standings_changed(event_id=event_id)
+
+        return results
+
+    async def correct(self, match_id: int, home_goals: int, away_goals: int) -> MatchCorrection:
+        async with self._lock_match(match_id) as event_id:
+            if event_id is None:
+                raise exceptions.MatchNotFound
+
+            exists, corrected_match, deltas = await self.repo.correct(
+                match_id=match_id, home_goals=home_goals, away_goals=away_goals,
+            )
+
+        if not exists:
             raise exceptions.MatchNotFound
 
-        if match.status == MatchStatus.completed:
+        if corrected_match is None:
             raise exceptions.UnexpectedMatchStatus
 
-        new_data = MatchUpdate(
-            home_team=match.home_team,
-            away_team=match.away_team,
-            start_time=match.start_time,
-            home_goals=home_goals,
-            away_goals=away_goals,
-            status=MatchStatus.completed,
+        correction = MatchCorrection(
+            match=MatchRead.from_orm(corrected_match),
+            deltas=[PointsDelta(user_id=user_id, delta=delta) for user_id, delta in deltas],
         )
 
-        updated_match = await self.repo.update(match_id=match_id, match_data=new_data)
+        if self.bus is not None:
+            await self.bus.publish(
+                event_id=correction.match.event_id, kind='match', key=f'match:{match_id}', data=correction.match,
+            )
 
-        await self.prediction_repo.update_points_for_match(match=updated_match)
+        if correction.deltas:
+            await self._standings_changed(event_id=correction.match.event_id)
 
-        return MatchRead.from_orm(updated_match)
+        return correction
 
     async def delete(self, match_id: int) -> None:
-        match = await self.repo.get_by_id(match_id=match_id)
+        async with self._lock_match(match_id) as event_id:
+            if event_id is None:
+                raise exceptions.MatchNotFound
 
-        if not match:
-            raise exceptions.MatchNotFound
+            await self.repo.delete(match_id=match_id)
+
+        if self.bus is not None:
+            await self.bus.publish(
+                event_id=event_id, kind='match_deleted', key=f'match:{match_id}', data={'id': match_id},
+            )
+
+    async def _standings_changed(self, event_id: int) -> None:
+        if self.bus is not None:
+            await self.bus.publish(event_id=event_id, kind='standings', key=STANDINGS_KEY, data=None)
+
+        if self.snapshot_writer is not None:
+            self.snapshot_writer.schedule()
 
-        return await self.repo.delete(match_id=match_id)
+    def _lock(self, event_id: int) -> AsyncContextManager[None]:
+        return self.locker.hold(event_id) if self.locker is not None else nullcontext()
+
+    @asynccontextmanager
+    async def _lock_match(self, match_id: int) -> AsyncIterator[int | None]:
+        """Locks the event of the match and yields its id, the locker looks the event up under the lock."""
+        if self.locker is None:
+            yield await self._event_id_of(match_id)
+            return
+
+        async with self.locker.hold_match(match_id, event_id_of=self._event_id_of) as event_id:
+            yield event_id
+
+    async def _event_id_of(self, match_id: int) -> int | None:
+        match = await self.repo.get_by_id(match_id=match_id)
+        return match.event_id if match is not None else None
@@ -2,8 +2,11 @@ from typing import Sequence
 from uuid import UUID
 
 from src.matches.schemas import MatchRead
-from src.predictions.models import Prediction
-from src.predictions.schemas import PredictionCreate, PredictionUpdate, PredictionRead
+from src.predictions.consensus import LockedPredictions
+from src.predictions.models import Prediction, PredictionScoreCount
+from src.predictions.schemas import (
+    PredictionCreate, PredictionUpdate, PredictionRead, PredictionStats, PredictionBulkResult, Consensus,
+)
 
 
 class BasePredictionRepository:
@@ -13,18 +16,34 @@ class BasePredictionRepository:
     async def get_multiple_by_event_id(self, event_id: int, user_id: UUID) -> Sequence[Prediction]:
         raise NotImplementedError
 
-    async def create(self, prediction: PredictionCreate, user_id: UUID) -> Prediction:
+    async def create(self, prediction: PredictionCreate, user_id: UUID) -> Prediction | None:
         raise NotImplementedError
 
-    async def update(self, prediction_id: int, prediction_data: PredictionUpdate) -> Prediction | None:
+    async def update(self, prediction_id: int, prediction_data: PredictionUpdate, user_id: UUID) -> Prediction | None:
         raise NotImplementedError
 
-    async def exists_in_db(self, user_id: UUID, match_id: int) -> bool:
+    async def get_score_counts(self, match_id: int) -> Sequence[PredictionScoreCount]:
+        raise NotImplementedError
+
+    async def upsert_multiple(
+            self, event_id: int, user_id: UUID, predictions: Sequence[PredictionCreate],
+    ) -> Sequence[int]:
+        raise NotImplementedError
+
+    async def get_prediction_state(self, match_id: int, user_id: UUID) -> tuple[bool, bool] | None:
         raise NotImplementedError
 
     async def update_points_for_match(self, match: MatchRead) -> None:
         raise NotImplementedError
 
+    async def get_lock_states(
+            self, event_id: int | None = None, match_id: int | None = None,
+    ) -> Sequence[tuple[int, bool, int | None, int | None]]:
+        raise NotImplementedError
+
+    async def get_locked_predictions(self, match_ids: Sequence[int]) -> LockedPredictions:
+        raise NotImplementedError
+
 
 class BasePredictionService:
     async def get_by_id(self, prediction_id: int) -> PredictionRead:
@@ -36,5 +55,19 @@ class BasePredictionService:
     async def create(self, prediction: PredictionCreate, user_id: UUID) -> PredictionRead:
         raise NotImplementedError
 
+    async def upsert_multiple(
+            self, event_id: int, predictions: Sequence[PredictionCreate], user_id: UUID,
+    ) -> PredictionBulkResult:
+        raise NotImplementedError
+
     async def update(self, prediction_id: int, prediction: PredictionUpdate, user_id: UUID) -> PredictionRead:
         raise NotImplementedError
+
+    async def get_match_stats(self, match_id: int) -> PredictionStats:
+        raise NotImplementedError
+
+    async def get_match_consensus(self, match_id: int, user_id: UUID, offset: int = 0, limit: int = 100) -> Consensus:
+        raise NotImplementedError
+
+    async def get_event_consensus(self, event_id: int, user_id: UUID, offset: int = 0, limit: int = 100) -> Consensus:
+        raise NotImplementedError
@@ -0,0 +1,52 @@
+"""Predictions of locked matches held in memory.
+
+Predictions of a locked match do not change any more, only their points do when the match is
+finished or corrected. So they are loaded into arrays once per result and every page of the
+crowd's predictions is cut from the arrays instead of being queried.
+"""
+import dataclasses
+from bisect import bisect_left
+from uuid import UUID
+
+import numpy as np
+
+from src.predictions.schemas import CrowdPrediction, UserPredictions
+from src.scoring.engine import MISSING
+
+
+@dataclasses.dataclass
+class LockedPredictions:
+    """Predictions of some matches ordered by ``(user_id, match_id)``, ``MISSING`` for goals and points not set.
+
+    ``user_ids`` are the distinct users sorted, the predictions of user ``i`` are ``starts[i]:starts[i + 1]``.
+    """
+    user_ids: list[UUID]
+    starts: np.ndarray
+    match_ids: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    points: np.ndarray
+
+    def page(self, user_id: UUID, offset: int, limit: int) -> list[UserPredictions]:
+        """Predictions of the users from ``offset`` on, leaving out ``user_id``."""
+        own = bisect_left(self.user_ids, user_id)
+        if own == len(self.user_ids) or self.user_ids[own] != user_id:
+            own = None
+
+        start = offset + 1 if own is not None and own <= offset else offset
+        users = [user for user in range(start, min(start + limit + 1, len(self.user_ids))) if user != own][:limit]
+
+        def value(number: int) -> int | None:
+            return None if number == MISSING else number
+
+        pages = []
+        for user in users:
+            rows = slice(self.starts[user], self.starts[user + 1])
+            pages.append(UserPredictions(user_id=self.user_ids[user], predictions=[
+                CrowdPrediction(match_id=match_id, home_goals=value(home), away_goals=value(away), points=value(points))
+                for match_id, home, away, points in zip(
+                    self.match_ids[rows].tolist(), self.home_goals[rows].tolist(),
+                    self.away_goals[rows].tolist(), self.points[rows].tolist(),
+                )
+            ]))
+        return pages
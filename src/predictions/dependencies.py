@@ -1,7 +1,10 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import consensus_cache
 from src.db.database import get_async_session
+from src.events.base import BaseEventRepository
+from src.events.dependencies import get_event_repo
 from src.matches.base import BaseMatchRepository
 from src.matches.dependencies import get_match_repo
 from src.predictions.base import BasePredictionRepository
@@ -16,5 +19,6 @@ async def get_prediction_repo(session: AsyncSession = Depends(get_async_session)
 async def get_prediction_service(
         repo: BasePredictionRepository = Depends(get_prediction_repo),
         match_repo: BaseMatchRepository = Depends(get_match_repo),
+        event_repo: BaseEventRepository = Depends(get_event_repo),
 ):
-    yield PredictionService(repo, match_repo=match_repo)
+    yield PredictionService(repo, match_repo=match_repo, event_repo=event_repo, consensus_cache=consensus_cache)
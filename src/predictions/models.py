@@ -19,3 +19,13 @@ class Prediction(Base):
 
     match_id: Mapped[int] = mapped_column(Integer, ForeignKey('matches.id', ondelete='CASCADE'))
     user_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey('users.id', ondelete='CASCADE'))
+
+
+class PredictionScoreCount(Base):
+    """Number of predictions of a match with the same score, kept in sync by the repository."""
+    __tablename__ = 'prediction_score_counts'
+
+    match_id: Mapped[int] = mapped_column(Integer, ForeignKey('matches.id', ondelete='CASCADE'), primary_key=True)
+    home_goals: Mapped[int] = mapped_column(Integer, primary_key=True)
+    away_goals: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -1,15 +1,142 @@
-from typing import Sequence
+from typing import Callable, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, update
+import numpy as np
+from sqlalchemy import (
+    select, update, case, func, literal, or_, exists, values, column, tuple_, union_all, ColumnElement, Integer,
+    Select, Table, Column, CTE,
+)
+from sqlalchemy.dialects.postgresql import insert, Insert, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, aliased
 
-from src.events.models import Match
+from src.events.models import Match, Event
+from src.leaderboard.models import EventStanding, UserTotal
+from src.leaderboard.repo import ranks_update
+from src.matches.models import MatchStatus
 from src.matches.schemas import MatchRead
 from src.predictions.base import BasePredictionRepository
-from src.predictions.models import Prediction
+from src.predictions.consensus import LockedPredictions
+from src.predictions.models import Prediction, PredictionScoreCount
 from src.predictions.schemas import PredictionCreate, PredictionUpdate
+from src.scoring.engine import MISSING
+from src.scoring.rules import RuleSet, scoring_rules
+
+
+def points_case(
+        home_goals: int | ColumnElement[int],
+        away_goals: int | ColumnElement[int],
+        match_id: int | ColumnElement[int],
+        rules: RuleSet = scoring_rules,
+) -> ColumnElement[int]:
+    """Points of a prediction for the given result of the match, see ``RuleSet``.
+
+    The result and the match id are either known values or columns of ``matches``.
+    """
+    predicted_difference = Prediction.home_goals - Prediction.away_goals
+    difference = home_goals - away_goals
+    outcome_guessed = func.sign(predicted_difference) == func.sign(difference)
+
+    whens = [((Prediction.home_goals == home_goals) & (Prediction.away_goals == away_goals), rules.exact_score)]
+    if rules.goal_difference:
+        whens.append((outcome_guessed & (predicted_difference == difference), rules.outcome + rules.goal_difference))
+    whens.append((outcome_guessed, rules.outcome))
+
+    points = case(*whens, else_=0)
+    multiplier = rules.multiplier(match_id)
+    return points if isinstance(multiplier, int) and multiplier == 1 else points * multiplier
+
+
+def points_rescore(points: ColumnElement[int], where: ColumnElement[bool], rules: RuleSet = scoring_rules) -> Select:
+    """Scores the predictions of the matches selected by ``where`` and updates event standings and user totals.
+
+    All happens in one statement, which touches only predictions whose points change, so re-scoring
+    a match is idempotent and a correction moves the standings by the difference. It returns
+    ``(user_id, delta)`` of every re-scored prediction. Requires ``matches`` in ``where``.
+    """
+    predictions = Prediction.__table__
+    previous = aliased(predictions)
+
+    scored = update(predictions) \
+        .where(
+            where &
+            (predictions.c.match_id == Match.id) &
+            (previous.c.id == predictions.c.id) &
+            predictions.c.points.is_distinct_from(points)
+        ) \
+        .values(points=points) \
+        .returning(
+            predictions.c.user_id, Match.event_id, predictions.c.match_id,
+            predictions.c.points, previous.c.points.label('previous_points'),
+        ) \
+        .cte('scored')
+
+    exact_score = rules.exact_score * rules.multiplier(scored.c.match_id)
+
+    def exact_hit(points: ColumnElement[int]) -> ColumnElement[bool]:
+        return points == exact_score
+
+    def outcome_hit(points: ColumnElement[int]) -> ColumnElement[bool]:
+        return (points > 0) & (points != exact_score)
+
+    def hits(hit: Callable[[ColumnElement[int]], ColumnElement[bool]]) -> ColumnElement[int]:
+        return func.count().filter(hit(scored.c.points)) - func.count().filter(hit(scored.c.previous_points))
+
+    deltas = (
+        func.sum(scored.c.points - func.coalesce(scored.c.previous_points, 0)),
+        hits(exact_hit), hits(outcome_hit),
+    )
+    totals = ('points', 'exact_hits', 'outcome_hits')
+
+    def totals_add(table: Table, *keys: Column, name: str) -> CTE:
+        """Adds the deltas grouped by ``keys`` to the rows of ``table``, inserting missing rows."""
+        group = [scored.c[key.name] for key in keys]
+        stmt = insert(table).from_select(
+            [key.name for key in keys] + list(totals), select(*group, *deltas).group_by(*group),
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={total: table.c[total] + stmt.excluded[total] for total in totals},
+        ).cte(name)
+
+    standings = EventStanding.__table__
+    user_totals = UserTotal.__table__
+    standings_update = totals_add(standings, standings.c.event_id, standings.c.user_id, name='standings_update')
+    user_totals_update = totals_add(user_totals, user_totals.c.user_id, name='user_totals_update')
+
+    return select(scored.c.user_id, (scored.c.points - func.coalesce(scored.c.previous_points, 0)).label('delta')) \
+        .add_cte(standings_update, user_totals_update)
+
+
+def points_rescore_for_matches(match_ids: Sequence[int]) -> Select:
+    """Scores the predictions of finished matches, taking the results from ``matches``."""
+    return points_rescore(
+        points=points_case(Match.home_goals, Match.away_goals, match_id=Match.id), where=Match.id.in_(match_ids),
+    )
+
+
+def score_count_add(stmt: Insert) -> Insert:
+    """Makes an insert of ``prediction_score_counts`` rows add its counts to the existing ones."""
+    counts = PredictionScoreCount.__table__
+
+    return stmt.on_conflict_do_update(
+        index_elements=[counts.c.match_id, counts.c.home_goals, counts.c.away_goals],
+        set_={'count': counts.c.count + stmt.excluded.count},
+    )
+
+
+def predictions_open() -> ColumnElement[bool]:
+    """Whether the match still accepts predictions, evaluated by the database at write time.
+
+    Requires ``matches`` and ``events`` in the statement. The lock does not wait for an admin
+    to change the match status, it applies as soon as the match starts or the event deadline passes.
+    """
+    return (
+        (Match.event_id == Event.id) &
+        (Match.status == MatchStatus.upcoming) &
+        (Match.start_time > func.now()) &
+        or_(Event.deadline.is_(None), Event.deadline > func.now())
+    )
 
 
 class PredictionRepository(BasePredictionRepository):
@@ -32,78 +159,220 @@ class PredictionRepository(BasePredictionRepository):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def create(self, prediction: PredictionCreate, user_id: UUID) -> Prediction:
-        new_prediction = Prediction(**prediction.dict(), user_id=user_id)
+    async def create(self, prediction: PredictionCreate, user_id: UUID) -> Prediction | None:
+        """Inserts the prediction and counts its score in one statement.
+
+        Returns ``None`` if the match is not open or the user has already predicted it,
+        ``get_prediction_state`` tells which one.
+        """
+        predictions = Prediction.__table__
 
-        self.session.add(new_prediction)
+        open_match = select(
+            literal(prediction.home_goals, Integer), literal(prediction.away_goals, Integer),
+            Match.id, literal(user_id, predictions.c.user_id.type),
+        ).where((Match.id == prediction.match_id) & predictions_open())
+
+        inserted = insert(predictions) \
+            .from_select(['home_goals', 'away_goals', 'match_id', 'user_id'], open_match) \
+            .on_conflict_do_nothing(constraint='uix_predictions_match_id_user_id') \
+            .returning(*predictions.c) \
+            .cte('inserted')
+        counted = score_count_add(insert(PredictionScoreCount.__table__).from_select(
+            ['match_id', 'home_goals', 'away_goals', 'count'],
+            select(inserted.c.match_id, inserted.c.home_goals, inserted.c.away_goals, literal(1, Integer)),
+        )).cte('counted')
+
+        stmt = select(Prediction).from_statement(select(*inserted.c).add_cte(counted))
+        new_prediction = (await self.session.execute(stmt)).scalar_one_or_none()
 
         await self.session.commit()
-        await self.session.refresh(new_prediction)
 
         return new_prediction
 
-    async def update(self, prediction_id: int, prediction: PredictionUpdate) -> Prediction | None:
-        stmt = update(Prediction).values(**prediction.dict()).where(Prediction.id == prediction_id).returning(
-            Prediction)
-        result = await self.session.execute(stmt)
+    async def upsert_multiple(
+            self, event_id: int, user_id: UUID, predictions: Sequence[PredictionCreate],
+    ) -> Sequence[int]:
+        """Inserts or updates the user's predictions of an event and moves their score counts in one statement.
+
+        Existing predictions are locked while their previous scores are read, so the counts move from
+        the scores that get overwritten. A prediction inserted by a concurrent request in the meantime
+        is left as it is. Predictions of matches which are not open or belong to another event are
+        skipped, the last of duplicated matches wins. Returns ids of the matches whose predictions were saved.
+        """
+        scores = {
+            prediction.match_id: (prediction.match_id, prediction.home_goals, prediction.away_goals)
+            for prediction in predictions
+        }
+        if not scores:
+            return []
+
+        predictions_table = Prediction.__table__
+
+        new = values(
+            column('match_id', Integer), column('home_goals', Integer), column('away_goals', Integer),
+            name='scores',
+        ).data(list(scores.values()))
+        open_scores = select(new) \
+            .where((new.c.match_id == Match.id) & (Match.event_id == event_id) & predictions_open()) \
+            .cte('open_scores')
+        previous = select(
+            predictions_table.c.id, predictions_table.c.match_id,
+            predictions_table.c.home_goals, predictions_table.c.away_goals,
+        ).where(
+            (predictions_table.c.user_id == user_id) & (predictions_table.c.match_id == open_scores.c.match_id)
+        ).with_for_update(of=predictions_table).cte('previous')
+
+        updated = update(predictions_table) \
+            .where((predictions_table.c.id == previous.c.id) & (open_scores.c.match_id == previous.c.match_id)) \
+            .values(home_goals=open_scores.c.home_goals, away_goals=open_scores.c.away_goals) \
+            .returning(
+                predictions_table.c.match_id, predictions_table.c.home_goals, predictions_table.c.away_goals,
+                previous.c.home_goals.label('old_home_goals'), previous.c.away_goals.label('old_away_goals'),
+            ) \
+            .cte('updated')
+        missing = select(
+            open_scores.c.home_goals, open_scores.c.away_goals, open_scores.c.match_id,
+            literal(user_id, predictions_table.c.user_id.type),
+        ).where(~exists().where(previous.c.match_id == open_scores.c.match_id))
+        inserted = insert(predictions_table) \
+            .from_select(['home_goals', 'away_goals', 'match_id', 'user_id'], missing) \
+            .on_conflict_do_nothing(constraint='uix_predictions_match_id_user_id') \
+            .returning(predictions_table.c.match_id, predictions_table.c.home_goals, predictions_table.c.away_goals) \
+            .cte('inserted')
+
+        changed = tuple_(updated.c.home_goals, updated.c.away_goals) \
+            .is_distinct_from(tuple_(updated.c.old_home_goals, updated.c.old_away_goals))
+        moves = union_all(
+            select(inserted.c.match_id, inserted.c.home_goals, inserted.c.away_goals, literal(1, Integer)),
+            select(updated.c.match_id, updated.c.home_goals, updated.c.away_goals, literal(1, Integer))
+            .where(changed),
+            select(updated.c.match_id, updated.c.old_home_goals, updated.c.old_away_goals, literal(-1, Integer))
+            .where(changed & updated.c.old_home_goals.is_not(None) & updated.c.old_away_goals.is_not(None)),
+        )
+        moved = score_count_add(insert(PredictionScoreCount.__table__).from_select(
+            ['match_id', 'home_goals', 'away_goals', 'count'], moves,
+        )).cte('moved')
+
+        stmt = union_all(select(updated.c.match_id), select(inserted.c.match_id)).add_cte(moved)
+        saved = (await self.session.execute(stmt)).scalars().all()
+
         await self.session.commit()
 
-        return result.scalar_one_or_none()
+        return saved
 
-    async def update_points_for_match(self, match: MatchRead) -> None:
-        stmt1 = update(Prediction) \
+    async def get_prediction_state(self, match_id: int, user_id: UUID) -> tuple[bool, bool] | None:
+        """Whether the match is open for predictions and whether the user has predicted it, ``None`` without match."""
+        predicted = exists().where((Prediction.match_id == Match.id) & (Prediction.user_id == user_id))
+        stmt = select(predictions_open(), predicted).join(Match.event).where(Match.id == match_id)
+
+        row = (await self.session.execute(stmt)).one_or_none()
+        return tuple(row) if row is not None else None
+
+    async def update(self, prediction_id: int, prediction_data: PredictionUpdate, user_id: UUID) -> Prediction | None:
+        """Updates the user's prediction and moves its score count in one statement.
+
+        Returns ``None`` if there is no such prediction of the user or its match is not open.
+        """
+        predictions = Prediction.__table__
+        previous = aliased(predictions)
+
+        updated = update(predictions) \
             .where(
-            (Prediction.match_id == match.id) &
-            (Prediction.home_goals == match.home_goals) &
-            (Prediction.away_goals == match.away_goals)
-        ) \
-            .values(points=3)
-
-        if match.home_goals - match.away_goals > 0:
-            stmt2 = update(Prediction) \
-                .where(
-                Prediction.points.is_(None) &
-                Prediction.home_goals.is_not(None) &
-                Prediction.away_goals.is_not(None) &
-                (Prediction.match_id == match.id) &
-                ((Prediction.home_goals - Prediction.away_goals) > 0)
-            ) \
-                .values(points=1)
-        elif match.home_goals - match.away_goals < 0:
-            stmt2 = update(Prediction) \
-                .where(
-                Prediction.points.is_(None) &
-                Prediction.home_goals.is_not(None) &
-                Prediction.away_goals.is_not(None) &
-                (Prediction.match_id == match.id) &
-                ((Prediction.home_goals - Prediction.away_goals) < 0)
+                (predictions.c.id == prediction_id) &
+                (predictions.c.user_id == user_id) &
+                (previous.c.id == predictions.c.id) &
+                (predictions.c.match_id == Match.id) &
+                predictions_open()
             ) \
-                .values(points=1)
-        else:
-            stmt2 = update(Prediction) \
-                .where(
-                Prediction.points.is_(None) &
-                Prediction.home_goals.is_not(None) &
-                Prediction.away_goals.is_not(None) &
-                (Prediction.match_id == match.id) &
-                ((Prediction.home_goals - Prediction.away_goals) == 0)
+            .values(**prediction_data.dict()) \
+            .returning(
+                *predictions.c,
+                previous.c.home_goals.label('old_home_goals'), previous.c.away_goals.label('old_away_goals'),
             ) \
-                .values(points=1)
+            .cte('updated')
 
-        stmt3 = update(Prediction).where(Prediction.points.is_(None) & (Prediction.match_id == match.id)).values(
-            points=0)
+        changed = tuple_(updated.c.home_goals, updated.c.away_goals) \
+            .is_distinct_from(tuple_(updated.c.old_home_goals, updated.c.old_away_goals))
+        moves = union_all(
+            select(updated.c.match_id, updated.c.home_goals, updated.c.away_goals, literal(1, Integer))
+            .where(changed),
+            select(updated.c.match_id, updated.c.old_home_goals, updated.c.old_away_goals, literal(-1, Integer))
+            .where(changed & updated.c.old_home_goals.is_not(None) & updated.c.old_away_goals.is_not(None)),
+        )
+        moved = score_count_add(insert(PredictionScoreCount.__table__).from_select(
+            ['match_id', 'home_goals', 'away_goals', 'count'], moves,
+        )).cte('moved')
 
-        await self.session.execute(stmt1)
-        await self.session.execute(stmt2)
-        await self.session.execute(stmt3)
+        stmt = select(Prediction).from_statement(
+            select(*(updated.c[column.name] for column in predictions.c)).add_cte(moved),
+        )
+        updated_prediction = (await self.session.execute(stmt)).scalar_one_or_none()
 
         await self.session.commit()
 
-    async def exists_in_db(self, user_id: UUID, match_id: int) -> bool:
-        stmt = select(Prediction).where(Prediction.user_id == user_id, Prediction.match_id == match_id)
+        return updated_prediction
+
+    async def get_score_counts(self, match_id: int) -> Sequence[PredictionScoreCount]:
+        stmt = select(PredictionScoreCount) \
+            .where(PredictionScoreCount.match_id == match_id, PredictionScoreCount.count > 0) \
+            .order_by(PredictionScoreCount.count.desc())
 
         result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def update_points_for_match(self, match: MatchRead) -> None:
+        points = points_case(home_goals=match.home_goals, away_goals=match.away_goals, match_id=match.id)
+
+        await self.session.execute(points_rescore(points=points, where=Match.id == match.id))
+        await self.session.execute(ranks_update(event_ids=[match.event_id]))
+        await self.session.commit()
+
+    async def get_lock_states(
+            self, event_id: int | None = None, match_id: int | None = None,
+    ) -> Sequence[tuple[int, bool, int | None, int | None]]:
+        """Matches of the event or the match, whether they accept predictions and the results of the completed ones."""
+        completed = Match.status == MatchStatus.completed
+        stmt = select(
+            Match.id, predictions_open(), case((completed, Match.home_goals)), case((completed, Match.away_goals)),
+        ) \
+            .join(Match.event) \
+            .where((Match.event_id == event_id) if event_id is not None else (Match.id == match_id)) \
+            .order_by(Match.id)
+
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def get_locked_predictions(self, match_ids: Sequence[int]) -> LockedPredictions:
+        """Predictions of the matches as arrays in one statement, the users and their counts come aggregated."""
+        predicted = select(
+            Prediction.user_id, Prediction.match_id,
+            func.coalesce(Prediction.home_goals, MISSING).label('home_goals'),
+            func.coalesce(Prediction.away_goals, MISSING).label('away_goals'),
+            func.coalesce(Prediction.points, MISSING).label('points'),
+        ).where(Prediction.match_id.in_(match_ids)).cte('predicted')
+        users = select(predicted.c.user_id, func.count().label('count')) \
+            .group_by(predicted.c.user_id) \
+            .subquery('users')
+
+        def array(column: ColumnElement, *order_by: ColumnElement) -> ColumnElement:
+            return func.array_agg(aggregate_order_by(column, *order_by))
+
+        user_arrays = select(array(users.c.user_id, users.c.user_id), array(users.c.count, users.c.user_id)) \
+            .subquery('user_arrays')
+        prediction_arrays = select(*(
+            array(predicted.c[name], predicted.c.user_id, predicted.c.match_id)
+            for name in ('match_id', 'home_goals', 'away_goals', 'points')
+        )).subquery('prediction_arrays')
+
+        stmt = select(*user_arrays.c, *prediction_arrays.c)
+        user_ids, counts, match_ids, home_goals, away_goals, points = (await self.session.execute(stmt)).one()
+
+        def to_numpy(values: list[int] | None) -> np.ndarray:
+            return np.array(values or [], dtype=np.int32)
 
-        if result.scalar_one_or_none():
-            return True
-        return False
+        return LockedPredictions(
+            user_ids=user_ids or [],
+            starts=np.concatenate(([0], np.cumsum(to_numpy(counts)))),
+            match_ids=to_numpy(match_ids), home_goals=to_numpy(home_goals),
+            away_goals=to_numpy(away_goals), points=to_numpy(points),
+        )
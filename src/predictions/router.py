@@ -1,17 +1,73 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.params import Query
+from pydantic import conlist
 from starlette import status
 
 from src import exceptions
 from src.auth.dependencies import get_current_user
 from src.auth.schemas import UserRead
+from src.core.config import settings
 from src.predictions.base import BasePredictionService
 from src.predictions.dependencies import get_prediction_service
-from src.predictions.schemas import PredictionRead, PredictionCreate, PredictionUpdate
+from src.predictions.schemas import (
+    PredictionRead, PredictionCreate, PredictionUpdate, PredictionStats, PredictionBulkResult, Consensus,
+)
 from src.predictions.service import PredictionService
 
 router = APIRouter()
 
 
+@router.get(
+    '/matches/{match_id}/stats',
+    response_model=PredictionStats,
+    dependencies=[Depends(get_current_user)],
+)
+async def get_match_stats(
+        match_id: int,
+        prediction_service: BasePredictionService = Depends(get_prediction_service),
+):
+    try:
+        return await prediction_service.get_match_stats(match_id=match_id)
+    except exceptions.MatchNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Match not found')
+
+
+@router.get('/matches/{match_id}/consensus', response_model=Consensus)
+async def get_match_consensus(
+        match_id: int,
+        offset: int = Query(default=0, ge=0),
+        limit: int = Query(default=100, ge=1, le=500),
+        current_user: UserRead = Depends(get_current_user),
+        prediction_service: BasePredictionService = Depends(get_prediction_service),
+):
+    try:
+        return await prediction_service.get_match_consensus(
+            match_id=match_id, user_id=current_user.id, offset=offset, limit=limit,
+        )
+    except exceptions.MatchNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Match not found')
+    except exceptions.PredictionsAreOpen:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='The match is not locked yet')
+
+
+@router.get('/events/{event_id}/consensus', response_model=Consensus)
+async def get_event_consensus(
+        event_id: int,
+        offset: int = Query(default=0, ge=0),
+        limit: int = Query(default=100, ge=1, le=500),
+        current_user: UserRead = Depends(get_current_user),
+        prediction_service: BasePredictionService = Depends(get_prediction_service),
+):
+    try:
+        return await prediction_service.get_event_consensus(
+            event_id=event_id, user_id=current_user.id, offset=offset, limit=limit,
+        )
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
+    except exceptions.PredictionsAreOpen:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='The event is not locked yet')
+
+
 @router.get('/{event_id}', response_model=list[PredictionRead])
 async def get_predictions(
         event_id: int,
@@ -38,6 +94,18 @@ async def create_prediction(
     return new_prediction
 
 
+@router.put('/events/{event_id}', response_model=PredictionBulkResult)
+async def upsert_predictions(
+        event_id: int,
+        predictions: conlist(PredictionCreate, min_items=1, max_items=settings.MATCHES_COUNT),
+        current_user: UserRead = Depends(get_current_user),
+        prediction_service: BasePredictionService = Depends(get_prediction_service),
+):
+    return await prediction_service.upsert_multiple(
+        event_id=event_id, predictions=predictions, user_id=current_user.id,
+    )
+
+
 @router.put('/{prediction_id}', response_model=PredictionRead)
 async def update_prediction(
         prediction_id: int,
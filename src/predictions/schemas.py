@@ -1,3 +1,5 @@
+from enum import Enum
+
 from pydantic import BaseModel, UUID4
 
 
@@ -25,3 +27,57 @@ class PredictionRead(PredictionBase):
 
     class Config:
         orm_mode = True
+
+
+class ScoreCount(BaseModel):
+    home_goals: int
+    away_goals: int
+    count: int
+
+    class Config:
+        orm_mode = True
+
+
+class PredictionStats(BaseModel):
+    match_id: int
+    total: int
+    home_win: int
+    draw: int
+    away_win: int
+    scores: list[ScoreCount]
+
+
+class CrowdPrediction(BaseModel):
+    match_id: int
+    home_goals: int | None
+    away_goals: int | None
+    points: int | None
+
+
+class UserPredictions(BaseModel):
+    user_id: UUID4
+    predictions: list[CrowdPrediction]
+
+
+class Consensus(BaseModel):
+    """Score distributions of locked matches and a page of the other users' predictions of them."""
+    matches: list[PredictionStats]
+    participants: int
+    predictions: list[UserPredictions]
+
+
+class PredictionItemStatus(str, Enum):
+    saved = 'saved'
+    locked = 'locked'
+    match_not_found = 'match_not_found'
+
+
+class PredictionItemResult(BaseModel):
+    match_id: int
+    status: PredictionItemStatus
+
+
+class PredictionBulkResult(BaseModel):
+    """Outcome of every submitted match and all predictions of the user for the event afterwards."""
+    items: list[PredictionItemResult]
+    predictions: list[PredictionRead]
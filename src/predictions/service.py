@@ -1,20 +1,32 @@
 import logging
-from typing import Sequence
+from typing import Hashable, Sequence
 from uuid import UUID
 
 from src import exceptions
+from src.core.cache import LocalCache
+from src.events.base import BaseEventRepository
 from src.matches.base import BaseMatchRepository
-from src.matches.models import MatchStatus
 from src.predictions.base import BasePredictionService, BasePredictionRepository
-from src.predictions.schemas import PredictionCreate, PredictionUpdate, PredictionRead
+from src.predictions.schemas import (
+    PredictionCreate, PredictionUpdate, PredictionRead, PredictionStats, ScoreCount,
+    PredictionBulkResult, PredictionItemResult, PredictionItemStatus, Consensus,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class PredictionService(BasePredictionService):
-    def __init__(self, repo: BasePredictionRepository, match_repo: BaseMatchRepository):
+    def __init__(
+            self,
+            repo: BasePredictionRepository,
+            match_repo: BaseMatchRepository,
+            event_repo: BaseEventRepository,
+            consensus_cache: LocalCache | None = None,
+    ):
         self.repo = repo
         self.match_repo = match_repo
+        self.event_repo = event_repo
+        self.consensus_cache = consensus_cache
 
     async def get_by_id(self, prediction_id: int) -> PredictionRead:
         prediction = await self.repo.get_by_id(prediction_id=prediction_id)
@@ -29,34 +41,119 @@ class PredictionService(BasePredictionService):
         return [PredictionRead.from_orm(prediction) for prediction in predictions]
 
     async def create(self, prediction: PredictionCreate, user_id: UUID) -> PredictionRead:
-        match = await self.match_repo.get_by_id(match_id=prediction.match_id)
+        new_prediction = await self.repo.create(prediction=prediction, user_id=user_id)
 
-        if not match:
-            raise exceptions.MatchNotFound
+        if new_prediction is None:
+            state = await self.repo.get_prediction_state(match_id=prediction.match_id, user_id=user_id)
+            if state is None:
+                raise exceptions.MatchNotFound
 
-        if match.status != MatchStatus.upcoming:
+            is_open, is_predicted = state
+            if is_predicted:
+                raise exceptions.PredictionAlreadyExists
             raise exceptions.UnexpectedMatchStatus
 
-        if await self.repo.exists_in_db(user_id=user_id, match_id=prediction.match_id):
-            raise exceptions.PredictionAlreadyExists
+        return PredictionRead.from_orm(new_prediction)
 
-        prediction = await self.repo.create(prediction=prediction, user_id=user_id)
-        return PredictionRead.from_orm(prediction)
+    async def upsert_multiple(
+            self, event_id: int, predictions: Sequence[PredictionCreate], user_id: UUID,
+    ) -> PredictionBulkResult:
+        match_ids = list(dict.fromkeys(prediction.match_id for prediction in predictions))
 
-    async def update(self, prediction_id: int, prediction: PredictionUpdate, user_id: UUID) -> PredictionRead:
-        predict = await self.repo.get_by_id(prediction_id=prediction_id)
+        saved = set(await self.repo.upsert_multiple(event_id=event_id, user_id=user_id, predictions=predictions))
 
-        if not predict:
-            raise exceptions.PredictionNotFound
+        missing = [match_id for match_id in match_ids if match_id not in saved]
+        statuses = await self.match_repo.get_statuses(event_id=event_id, match_ids=missing) if missing else {}
 
-        match = await self.match_repo.get_by_id(match_id=predict.match_id)
+        items = []
+        for match_id in match_ids:
+            if match_id in saved:
+                item_status = PredictionItemStatus.saved
+            elif match_id in statuses:
+                item_status = PredictionItemStatus.locked
+            else:
+                item_status = PredictionItemStatus.match_not_found
+            items.append(PredictionItemResult(match_id=match_id, status=item_status))
 
-        if predict.user_id != user_id:
-            raise exceptions.UserIsNotAllowed
+        return PredictionBulkResult(
+            items=items,
+            predictions=await self.get_multiple_by_event_id(event_id=event_id, user_id=user_id),
+        )
 
-        if match.status != MatchStatus.upcoming:
+    async def update(self, prediction_id: int, prediction: PredictionUpdate, user_id: UUID) -> PredictionRead:
+        predict = await self.repo.update(prediction_id=prediction_id, prediction_data=prediction, user_id=user_id)
+
+        if predict is None:
+            predict = await self.repo.get_by_id(prediction_id=prediction_id)
+            if not predict:
+                raise exceptions.PredictionNotFound
+            if predict.user_id != user_id:
+                raise exceptions.UserIsNotAllowed
             raise exceptions.UnexpectedMatchStatus
 
-        predict = await self.repo.update(prediction_id=prediction_id, prediction_data=prediction)
-
         return PredictionRead.from_orm(predict)
+
+    async def get_match_stats(self, match_id: int) -> PredictionStats:
+        scores = [ScoreCount.from_orm(score) for score in await self.repo.get_score_counts(match_id=match_id)]
+
+        if not scores and await self.match_repo.get_by_id(match_id=match_id) is None:
+            raise exceptions.MatchNotFound
+
+        return PredictionStats(
+            match_id=match_id,
+            total=sum(score.count for score in scores),
+            home_win=sum(score.count for score in scores if score.home_goals > score.away_goals),
+            draw=sum(score.count for score in scores if score.home_goals == score.away_goals),
+            away_win=sum(score.count for score in scores if score.home_goals < score.away_goals),
+            scores=scores,
+        )
+
+    async def get_match_consensus(self, match_id: int, user_id: UUID, offset: int = 0, limit: int = 100) -> Consensus:
+        states = await self.repo.get_lock_states(match_id=match_id)
+
+        if not states:
+            raise exceptions.MatchNotFound
+
+        return await self._get_consensus(('match', match_id), states, user_id=user_id, offset=offset, limit=limit)
+
+    async def get_event_consensus(self, event_id: int, user_id: UUID, offset: int = 0, limit: int = 100) -> Consensus:
+        states = await self.repo.get_lock_states(event_id=event_id)
+
+        if not states and not await self.event_repo.get_by_id(event_id=event_id):
+            raise exceptions.EventNotFound
+
+        return await self._get_consensus(('event', event_id), states, user_id=user_id, offset=offset, limit=limit)
+
+    async def _get_consensus(
+            self,
+            key: Hashable,
+            states: Sequence[tuple[int, bool, int | None, int | None]],
+            user_id: UUID,
+            offset: int,
+            limit: int,
+    ) -> Consensus:
+        """Distributions and predictions of the matches once none of them accepts predictions any more.
+
+        They are loaded once and kept with the results of the matches, which is all that can change
+        after the lock, so they are loaded again only when a match is finished or corrected.
+        """
+        if not states or any(is_open for _, is_open, _, _ in states):
+            raise exceptions.PredictionsAreOpen
+
+        version = tuple((match_id, home_goals, away_goals) for match_id, _, home_goals, away_goals in states)
+
+        entry = self.consensus_cache.get(key) if self.consensus_cache is not None else None
+        if entry is None or entry[0] != version:
+            match_ids = [match_id for match_id, _, _ in version]
+            stats = [await self.get_match_stats(match_id=match_id) for match_id in match_ids]
+            entry = version, stats, await self.repo.get_locked_predictions(match_ids=match_ids)
+
+            if self.consensus_cache is not None:
+                self.consensus_cache.set(key, entry)
+
+        _, stats, predictions = entry
+        return Consensus(
+            matches=stats,
+            participants=len(predictions.user_ids),
+            predictions=predictions.page(user_id=user_id, offset=offset, limit=limit),
+        )
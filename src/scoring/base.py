@@ -0,0 +1,41 @@
+from typing import Sequence
+from uuid import UUID
+
+import numpy as np
+
+from src.scoring.engine import PredictionArrays, Standings, EventProjection
+from src.scoring.schemas import WhatIf, ProjectedLeaderboard, FinishingChances
+
+
+class BaseScoringRepository:
+    async def get_scored_event_ids(self) -> Sequence[int]:
+        raise NotImplementedError
+
+    async def lock_events(self, event_ids: Sequence[int]) -> None:
+        raise NotImplementedError
+
+    async def load_predictions(self, event_ids: Sequence[int]) -> PredictionArrays:
+        raise NotImplementedError
+
+    async def get_event_version(self, event_id: int) -> tuple[tuple[int, int | None, int | None, bool], ...]:
+        raise NotImplementedError
+
+    async def get_event_projection(self, event_id: int) -> EventProjection:
+        raise NotImplementedError
+
+    async def save_scores(
+            self, event_ids: Sequence[int], predictions: PredictionArrays, points: np.ndarray, standings: Standings,
+    ) -> None:
+        raise NotImplementedError
+
+
+class BaseScoringService:
+    async def get_what_if_leaderboard(
+            self, event_id: int, what_if: WhatIf, user_id: UUID, offset: int = 0, limit: int = 100,
+    ) -> ProjectedLeaderboard:
+        raise NotImplementedError
+
+    async def get_finishing_chances(
+            self, event_id: int, user_id: UUID, offset: int = 0, limit: int = 100,
+    ) -> FinishingChances:
+        raise NotImplementedError
@@ -0,0 +1,33 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import projection_cache, chances_cache
+from src.core.config import settings
+from src.db.database import get_async_session
+from src.events.base import BaseEventRepository
+from src.events.dependencies import get_event_repo
+from src.scoring.base import BaseScoringRepository
+from src.scoring.repo import ScoringRepository
+from src.scoring.service import ScoringService
+
+# simulations are CPU bound and run in other processes, which are spawned because forking would copy
+# the event loop and the open database connections
+simulation_pool = ProcessPoolExecutor(
+    max_workers=settings.SIMULATION_WORKERS, mp_context=multiprocessing.get_context('spawn'),
+)
+
+
+async def get_scoring_repo(session: AsyncSession = Depends(get_async_session)):
+    yield ScoringRepository(session)
+
+
+async def get_scoring_service(
+        repo: BaseScoringRepository = Depends(get_scoring_repo),
+        event_repo: BaseEventRepository = Depends(get_event_repo),
+):
+    yield ScoringService(
+        repo, event_repo=event_repo, cache=projection_cache, chances_cache=chances_cache, executor=simulation_pool,
+    )
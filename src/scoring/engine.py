@@ -0,0 +1,294 @@
+"""Scoring of predictions in bulk with NumPy.
+
+Predictions are held as parallel arrays, one element per prediction, so scoring a whole season
+is a handful of vectorized operations instead of a row by row computation in the database.
+Users are kept as indexes into a list of user ids, standings are grouped on ``(event, user)``
+keys.
+"""
+import dataclasses
+from uuid import UUID
+
+import numpy as np
+
+from src.scoring.rules import RuleSet
+
+# goals of predictions without a score and points of predictions that were never scored
+MISSING = -1
+# keys are grouped through a dense table up to this many slots per key
+DENSE_GROUPS_FACTOR = 4
+# mean goals of a side of a simulated match which nobody predicted
+DEFAULT_MEAN_GOALS = 1.3
+# simulated results scored per points table
+SIMULATION_BATCH_SIZE = 100
+# finishing in the top this many counts as a podium
+PODIUM = 3
+
+
+@dataclasses.dataclass
+class PredictionArrays:
+    """Predictions with the results of their matches, ``users`` index ``user_ids``."""
+    ids: np.ndarray
+    users: np.ndarray
+    user_ids: list[UUID]
+    event_ids: np.ndarray
+    match_ids: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    match_home_goals: np.ndarray
+    match_away_goals: np.ndarray
+    points: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclasses.dataclass
+class Standings:
+    """Points, hits and rank of every user of every event, ordered by ``(event_id, user)``."""
+    event_ids: np.ndarray
+    users: np.ndarray
+    points: np.ndarray
+    exact_hits: np.ndarray
+    outcome_hits: np.ndarray
+    ranks: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+
+def score(
+        home_goals: np.ndarray,
+        away_goals: np.ndarray,
+        match_home_goals: np.ndarray,
+        match_away_goals: np.ndarray,
+        multipliers: np.ndarray,
+        rules: RuleSet,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Points, exact hits and outcome hits of every prediction, the same as ``points_case`` gives.
+
+    Predictions with ``MISSING`` goals score nothing.
+    """
+    predicted = (home_goals != MISSING) & (away_goals != MISSING)
+    predicted_difference = home_goals - away_goals
+    difference = match_home_goals - match_away_goals
+
+    exact = predicted & (home_goals == match_home_goals) & (away_goals == match_away_goals)
+    outcome = predicted & ~exact & (np.sign(predicted_difference) == np.sign(difference))
+
+    points = np.where(exact, rules.exact_score, 0)
+    points += np.where(outcome, rules.outcome + rules.goal_difference * (predicted_difference == difference), 0)
+
+    return (points * multipliers).astype(np.int32), exact, outcome
+
+
+def ranks(groups: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Rank of every element by points within its group, tied elements share the rank."""
+    order = np.lexsort((-points, groups))
+    sorted_groups, sorted_points = groups[order], points[order]
+    positions = np.arange(len(order))
+
+    group_starts = np.ones(len(order), dtype=bool)
+    group_starts[1:] = sorted_groups[1:] != sorted_groups[:-1]
+    tie_starts = group_starts.copy()
+    tie_starts[1:] |= sorted_points[1:] != sorted_points[:-1]
+
+    first_of_group = np.maximum.accumulate(np.where(group_starts, positions, 0))
+    first_of_tie = np.maximum.accumulate(np.where(tie_starts, positions, 0))
+
+    result = np.empty(len(order), dtype=np.int32)
+    result[order] = first_of_tie - first_of_group + 1
+    return result
+
+
+def group(keys: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct keys and the group index of every key, keys are in ``range(size)``.
+
+    Keys are counted into a dense table when it is not much bigger than the keys, which needs no
+    sort, sparse keys are sorted by ``np.unique``.
+    """
+    if size > DENSE_GROUPS_FACTOR * len(keys):
+        return np.unique(keys, return_inverse=True)
+
+    present = np.bincount(keys, minlength=size) > 0
+    indexes = np.cumsum(present) - 1
+    return np.flatnonzero(present), indexes[keys]
+
+
+def sum_by(groups: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Sums of ``values`` by group index."""
+    return np.bincount(groups, weights=values, minlength=count).astype(np.int64)
+
+
+def event_standings(
+        event_ids: np.ndarray, users: np.ndarray, points: np.ndarray, exact: np.ndarray, outcome: np.ndarray,
+) -> Standings:
+    """Standings of every user with a prediction in an event, summed from the scored predictions."""
+    events, event_indexes = group(event_ids, size=int(event_ids.max(initial=0)) + 1)
+    user_count = int(users.max(initial=0)) + 1
+
+    keys, groups = group(event_indexes.astype(np.int64) * user_count + users, size=len(events) * user_count)
+    standing_event_ids = events[keys // user_count].astype(np.int32)
+    standing_points = sum_by(groups, points, count=len(keys))
+
+    return Standings(
+        event_ids=standing_event_ids,
+        users=(keys % user_count).astype(np.int32),
+        points=standing_points,
+        exact_hits=sum_by(groups, exact, count=len(keys)),
+        outcome_hits=sum_by(groups, outcome, count=len(keys)),
+        ranks=ranks(standing_event_ids, standing_points),
+    )
+
+
+def score_predictions(predictions: PredictionArrays, rules: RuleSet) -> tuple[np.ndarray, Standings]:
+    """Points of every prediction and the event standings they add up to."""
+    points, exact, outcome = score(
+        predictions.home_goals, predictions.away_goals,
+        predictions.match_home_goals, predictions.match_away_goals,
+        multipliers=rules.multipliers(predictions.match_ids),
+        rules=rules,
+    )
+    return points, event_standings(predictions.event_ids, predictions.users, points, exact, outcome)
+
+
+@dataclasses.dataclass
+class EventProjection:
+    """Current standings of an event and the predictions of its matches that are not completed.
+
+    ``user_ids`` are sorted, so ordering users by index breaks ties as the leaderboard does.
+    Predictions refer to users by index and to matches by their index in ``match_ids``.
+
+    Points of a prediction only depend on its match and score, so projecting scores every possible
+    predicted score of every match once and looks the predictions up by ``codes``.
+    """
+    match_ids: np.ndarray
+    user_ids: list[UUID]
+    points: np.ndarray
+    users: np.ndarray
+    matches: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+
+    def __post_init__(self):
+        self.min_goals = int(min(self.home_goals.min(initial=0), self.away_goals.min(initial=0), MISSING))
+        self.goal_range = int(max(self.home_goals.max(initial=0), self.away_goals.max(initial=0))) - self.min_goals + 1
+        self.codes = (
+            (self.matches.astype(np.int64) * self.goal_range + self.home_goals - self.min_goals) * self.goal_range +
+            self.away_goals - self.min_goals
+        )
+
+    def points_table(self, match_home_goals: np.ndarray, match_away_goals: np.ndarray, rules: RuleSet) -> np.ndarray:
+        """Points of every predicted score of every match, flat in ``codes`` order, 0 for ``MISSING`` results.
+
+        The goals may have a leading dimension of simulations, then there is a table per simulation.
+        """
+        scores = self.goal_range ** 2
+        predicted_home, predicted_away = np.divmod(np.arange(scores), self.goal_range)
+        predicted_home, predicted_away = predicted_home + self.min_goals, predicted_away + self.min_goals
+
+        shape = (*match_home_goals.shape, scores)
+        home_goals = np.broadcast_to(match_home_goals[..., None], shape)
+        away_goals = np.broadcast_to(match_away_goals[..., None], shape)
+        points, _, _ = score(
+            np.broadcast_to(predicted_home, shape), np.broadcast_to(predicted_away, shape), home_goals, away_goals,
+            multipliers=np.broadcast_to(rules.multipliers(self.match_ids)[:, None], shape),
+            rules=rules,
+        )
+        points[(home_goals == MISSING) | (away_goals == MISSING)] = 0
+        return points.reshape(*match_home_goals.shape[:-1], -1)
+
+    def project(self, match_home_goals: np.ndarray, match_away_goals: np.ndarray, rules: RuleSet) -> np.ndarray:
+        """Points of every user if the matches ended with the given goals, ``MISSING`` for matches left out."""
+        points = self.points_table(match_home_goals, match_away_goals, rules=rules)[self.codes]
+        return self.points + sum_by(self.users, points, count=len(self.user_ids))
+
+    def mean_goals(self) -> tuple[np.ndarray, np.ndarray]:
+        """Mean predicted home and away goals of every match, ``DEFAULT_MEAN_GOALS`` if nobody predicted it."""
+        predicted = (self.home_goals != MISSING) & (self.away_goals != MISSING)
+        matches = self.matches[predicted]
+        counts = np.bincount(matches, minlength=len(self.match_ids))
+
+        def mean(goals: np.ndarray) -> np.ndarray:
+            sums = np.bincount(matches, weights=goals[predicted], minlength=len(self.match_ids))
+            return np.divide(sums, counts, out=np.full(len(counts), DEFAULT_MEAN_GOALS), where=counts > 0)
+
+        return mean(self.home_goals), mean(self.away_goals)
+
+    def user_codes(self) -> np.ndarray:
+        """``codes`` as a matches by users table, users without a prediction have the code of a ``MISSING`` score."""
+        missing = (MISSING - self.min_goals) * (self.goal_range + 1)
+        codes = np.repeat(
+            np.arange(len(self.match_ids), dtype=np.int64)[:, None] * self.goal_range ** 2 + missing,
+            len(self.points), axis=1,
+        )
+        codes[self.matches, self.users] = self.codes
+        return codes
+
+
+def leaderboard(points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Users ordered by ``(points desc, index)`` and their ranks, tied users share the rank.
+
+    Keys are the points behind the leader, a stable sort of 16 bit keys is a radix sort and the
+    rank of a key is one more than the number of users with smaller keys.
+    """
+    behind = points.max(initial=0) - points
+    if behind.max(initial=0) < 2 ** 15:
+        behind = behind.astype(np.int16)
+
+    order = np.argsort(behind, kind='stable')
+    counts = np.bincount(behind)
+    ahead = np.cumsum(counts) - counts
+    return order, (ahead[behind[order]] + 1).astype(np.int32)
+
+
+@dataclasses.dataclass
+class Chances:
+    """How often every user of a projection finished first and on the podium in ``simulations`` runs.
+
+    Tied users share the rank, so a simulation can have several winners. ``order`` sorts users by
+    ``(wins desc, rank_sums, index)``.
+    """
+    simulations: int
+    wins: np.ndarray
+    podiums: np.ndarray
+    rank_sums: np.ndarray
+    order: np.ndarray
+
+
+def finishing_chances(projection: EventProjection, simulations: int, rules: RuleSet, seed: int) -> Chances:
+    """Simulates the remaining matches of the projection and counts the finishing positions of the users.
+
+    Goals of a side are Poisson distributed around the mean the users predicted for the match. Results
+    are drawn and tabled in batches, then every simulation looks up the points of the ``matches x users``
+    codes and ranks users by counting points, as ``leaderboard`` does, without sorting.
+    """
+    rng = np.random.default_rng(seed)
+    home_means, away_means = projection.mean_goals()
+    codes = projection.user_codes()
+    current_points = projection.points.astype(np.int64)
+
+    wins, podiums, rank_sums = (np.zeros(len(current_points), dtype=np.int64) for _ in range(3))
+
+    for start in range(0, simulations, SIMULATION_BATCH_SIZE):
+        shape = (min(SIMULATION_BATCH_SIZE, simulations - start), len(projection.match_ids))
+        tables = projection.points_table(rng.poisson(home_means, shape), rng.poisson(away_means, shape), rules=rules)
+        # points of a match are small, gathering bytes is faster than gathering words
+        tables = tables.astype(np.min_scalar_type(int(tables.max(initial=0))))
+
+        for table in tables:
+            points = current_points + table[codes].sum(axis=0, dtype=np.int32)
+            behind = points.max(initial=0) - points
+            counts = np.bincount(behind)
+            user_ranks = (np.cumsum(counts) - counts)[behind] + 1
+
+            wins += behind == 0
+            podiums += user_ranks <= PODIUM
+            rank_sums += user_ranks
+
+    return Chances(
+        simulations=simulations,
+        wins=wins,
+        podiums=podiums,
+        rank_sums=rank_sums,
+        order=np.lexsort((rank_sums, -wins)),
+    )
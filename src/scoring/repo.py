@@ -0,0 +1,233 @@
+from typing import Any, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import (
+    select, update, delete, func, literal, column, exists, union, case, ARRAY, ColumnElement, Function, Integer,
+    Label, UUID as UUIDType,
+)
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.selectable import TableValuedAlias
+from sqlalchemy.types import TypeEngine
+
+from src.core.locks import EVENT_LOCK_NAMESPACE
+from src.events.models import Match, Event
+from src.leaderboard.models import EventStanding, UserTotal
+from src.matches.models import MatchStatus
+from src.predictions.models import Prediction
+from src.predictions.repo import predictions_open
+from src.scoring.base import BaseScoringRepository
+from src.scoring.engine import PredictionArrays, Standings, EventProjection, MISSING
+
+# rows fetched per round trip while loading predictions
+LOAD_BATCH_SIZE = 50_000
+# rows sent per statement while saving, every column goes as one array parameter
+SAVE_BATCH_SIZE = 100_000
+
+
+def arrays_table(name: str, **arrays: tuple[TypeEngine, Sequence[Any]]) -> TableValuedAlias:
+    """Parallel arrays as rows of a table, ``unnest`` of one array parameter per column."""
+    parameters = [literal(list(values), ARRAY(type_)) for type_, values in arrays.values()]
+    columns = [column(key, type_) for key, (type_, _) in arrays.items()]
+    return func.unnest(*parameters).table_valued(*columns).render_derived(name=name)
+
+
+class ScoringRepository(BaseScoringRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_scored_event_ids(self) -> Sequence[int]:
+        stmt = select(Match.event_id).where(Match.status == MatchStatus.completed).distinct().order_by(Match.event_id)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def lock_events(self, event_ids: Sequence[int]) -> None:
+        """Takes the event locks in the session's transaction, so they are held until ``save_scores`` commits.
+
+        The locks are the advisory locks of ``PostgresEventLocker``, so no match of the events gets
+        finished or corrected between loading the predictions and saving the scores.
+        """
+        events = arrays_table('events', event_id=(Integer(), sorted(event_ids)))
+        stmt = select(func.pg_advisory_xact_lock(EVENT_LOCK_NAMESPACE, events.c.event_id))
+        await self.session.execute(stmt)
+
+    async def load_predictions(self, event_ids: Sequence[int]) -> PredictionArrays:
+        """Predictions of the completed matches of the events, streamed into arrays batch by batch."""
+        stmt = select(
+            Prediction.id, Prediction.user_id, Match.event_id, Prediction.match_id,
+            func.coalesce(Prediction.home_goals, MISSING), func.coalesce(Prediction.away_goals, MISSING),
+            Match.home_goals, Match.away_goals, func.coalesce(Prediction.points, MISSING),
+        ) \
+            .join(Prediction.match) \
+            .where(
+                Match.event_id.in_(event_ids),
+                Match.status == MatchStatus.completed,
+                Match.home_goals.is_not(None),
+                Match.away_goals.is_not(None),
+            ) \
+            .execution_options(yield_per=LOAD_BATCH_SIZE)
+
+        user_indexes: dict[UUID, int] = {}
+        batches: list[list[np.ndarray]] = []
+
+        result = await self.session.stream(stmt)
+        async for rows in result.partitions():
+            ids, user_ids, *numbers = zip(*rows)
+            users = [user_indexes.setdefault(user_id, len(user_indexes)) for user_id in user_ids]
+            batches.append([
+                np.array(ids, dtype=np.int64), np.array(users, dtype=np.int32),
+                *(np.array(values, dtype=np.int32) for values in numbers),
+            ])
+
+        arrays = [np.concatenate(values) for values in zip(*batches)] if batches else [
+            np.empty(0, dtype=np.int64), *(np.empty(0, dtype=np.int32) for _ in range(8)),
+        ]
+        ids, users, event_ids, match_ids, home_goals, away_goals, match_home_goals, match_away_goals, points = arrays
+
+        return PredictionArrays(
+            ids=ids, users=users, user_ids=list(user_indexes), event_ids=event_ids, match_ids=match_ids,
+            home_goals=home_goals, away_goals=away_goals,
+            match_home_goals=match_home_goals, match_away_goals=match_away_goals, points=points,
+        )
+
+    async def get_event_version(self, event_id: int) -> tuple[tuple[int, int | None, int | None, bool], ...]:
+        """Matches of the event with the results of the completed ones and whether they are still open.
+
+        It changes when a match is finished or corrected and when the predictions of a match get locked.
+        """
+        completed = Match.status == MatchStatus.completed
+        stmt = select(
+            Match.id, case((completed, Match.home_goals)), case((completed, Match.away_goals)), predictions_open(),
+        ).join(Event, Event.id == Match.event_id).where(Match.event_id == event_id).order_by(Match.id)
+        result = await self.session.execute(stmt)
+        return tuple(tuple(row) for row in result.all())
+
+    async def get_event_projection(self, event_id: int) -> EventProjection:
+        """Current standings and predictions of the locked matches that are not completed, in one statement.
+
+        Predictions of open matches are left out, so projections can't reveal them before the lock.
+        Every column comes back as one array, so loading does not create an object per prediction.
+        Users with a standing or a prediction are numbered in ``user_id`` order.
+        """
+        def numbered(order_by: ColumnElement) -> Label:
+            return (func.row_number().over(order_by=order_by) - 1).label('index')
+
+        remaining = select(Match.id, numbered(Match.id)) \
+            .join(Event, Event.id == Match.event_id) \
+            .where((Match.event_id == event_id) & (Match.status != MatchStatus.completed) & ~predictions_open()) \
+            .cte('remaining')
+        predicted = select(
+            Prediction.user_id, Prediction.match_id, remaining.c.index.label('match_index'),
+            func.coalesce(Prediction.home_goals, MISSING).label('home_goals'),
+            func.coalesce(Prediction.away_goals, MISSING).label('away_goals'),
+        ).join(remaining, remaining.c.id == Prediction.match_id).cte('predicted')
+        standing = select(EventStanding.user_id, EventStanding.points) \
+            .where(EventStanding.event_id == event_id) \
+            .cte('standing')
+
+        user_ids = union(select(standing.c.user_id), select(predicted.c.user_id)).subquery('user_ids')
+        participants = select(
+            user_ids.c.user_id, func.coalesce(standing.c.points, 0).label('points'), numbered(user_ids.c.user_id),
+        ).outerjoin(standing, standing.c.user_id == user_ids.c.user_id).cte('participants')
+
+        def array(column: ColumnElement, *order_by: ColumnElement) -> Function:
+            return func.array_agg(aggregate_order_by(column, *order_by))
+
+        prediction_columns = (
+            participants.c.index, predicted.c.match_index, predicted.c.home_goals, predicted.c.away_goals,
+        )
+        prediction_arrays = select(*(
+            array(column, predicted.c.match_id, predicted.c.user_id) for column in prediction_columns
+        )).select_from(predicted.join(participants, participants.c.user_id == predicted.c.user_id)).subquery('arrays')
+
+        stmt = select(
+            select(array(remaining.c.id, remaining.c.index)).scalar_subquery(),
+            select(array(participants.c.user_id, participants.c.index)).scalar_subquery(),
+            select(array(participants.c.points, participants.c.index)).scalar_subquery(),
+            *prediction_arrays.c,
+        )
+        match_ids, user_ids, points, users, matches, home_goals, away_goals = \
+            (await self.session.execute(stmt)).one()
+
+        def to_numpy(values: list[int] | None, dtype: type = np.int32) -> np.ndarray:
+            return np.array(values or [], dtype=dtype)
+
+        return EventProjection(
+            match_ids=to_numpy(match_ids), user_ids=user_ids or [], points=to_numpy(points, dtype=np.int64),
+            users=to_numpy(users), matches=to_numpy(matches),
+            home_goals=to_numpy(home_goals), away_goals=to_numpy(away_goals),
+        )
+
+    async def save_scores(
+            self, event_ids: Sequence[int], predictions: PredictionArrays, points: np.ndarray, standings: Standings,
+    ) -> None:
+        """Writes the points that changed and replaces the standings of the events, then commits.
+
+        User totals of everyone who had or has a standing in the events are summed again from
+        ``event_standings``.
+        """
+        predictions_table = Prediction.__table__
+        changed = points != predictions.points
+        changed_ids, changed_points = predictions.ids[changed], points[changed]
+
+        for start in range(0, len(changed_ids), SAVE_BATCH_SIZE):
+            scores = arrays_table(
+                'scores',
+                id=(Integer(), changed_ids[start:start + SAVE_BATCH_SIZE].tolist()),
+                points=(Integer(), changed_points[start:start + SAVE_BATCH_SIZE].tolist()),
+            )
+            stmt = update(predictions_table) \
+                .where(predictions_table.c.id == scores.c.id) \
+                .values(points=scores.c.points)
+            await self.session.execute(stmt)
+
+        standings_table = EventStanding.__table__
+        stmt = delete(standings_table) \
+            .where(standings_table.c.event_id.in_(event_ids)) \
+            .returning(standings_table.c.user_id)
+        affected_users = set((await self.session.execute(stmt)).scalars())
+
+        user_ids = [predictions.user_ids[user] for user in standings.users.tolist()]
+        affected_users.update(user_ids)
+
+        for start in range(0, len(standings), SAVE_BATCH_SIZE):
+            stop = start + SAVE_BATCH_SIZE
+            rows = arrays_table(
+                'rows',
+                event_id=(Integer(), standings.event_ids[start:stop].tolist()),
+                user_id=(UUIDType(), user_ids[start:stop]),
+                points=(Integer(), standings.points[start:stop].tolist()),
+                exact_hits=(Integer(), standings.exact_hits[start:stop].tolist()),
+                outcome_hits=(Integer(), standings.outcome_hits[start:stop].tolist()),
+                rank=(Integer(), standings.ranks[start:stop].tolist()),
+            )
+            stmt = insert(standings_table).from_select(rows.c.keys(), select(*rows.c))
+            await self.session.execute(stmt)
+
+        await self._sum_user_totals(sorted(affected_users))
+        await self.session.commit()
+
+    async def _sum_user_totals(self, user_ids: list[UUID]) -> None:
+        standings = EventStanding.__table__
+        user_totals = UserTotal.__table__
+        totals = ('points', 'exact_hits', 'outcome_hits')
+
+        for start in range(0, len(user_ids), SAVE_BATCH_SIZE):
+            users = arrays_table('users', user_id=(UUIDType(), user_ids[start:start + SAVE_BATCH_SIZE]))
+
+            summed = select(standings.c.user_id, *(func.sum(standings.c[total]) for total in totals)) \
+                .where(standings.c.user_id == users.c.user_id) \
+                .group_by(standings.c.user_id)
+            stmt = insert(user_totals).from_select(['user_id', *totals], summed)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[user_totals.c.user_id],
+                set_={total: stmt.excluded[total] for total in totals},
+            )
+            await self.session.execute(stmt)
+
+            stmt = delete(user_totals).where(
+                (user_totals.c.user_id == users.c.user_id) &
+                ~exists().where(standings.c.user_id == user_totals.c.user_id)
+            )
+            await self.session.execute(stmt)
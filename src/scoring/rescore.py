@@ -0,0 +1,95 @@
+"""Re-scoring of whole events or seasons, e.g. after a change of the scoring rules.
+
+    python -m src.scoring.rescore --event 3 --event 4
+    python -m src.scoring.rescore --all
+
+Predictions of completed matches are loaded into arrays and scored with NumPy, then the points
+that changed, the event standings and the user totals are written back in bulk. Everything
+happens in one transaction holding the locks of the events, so re-running it changes nothing.
+"""
+import argparse
+import asyncio
+import dataclasses
+import logging
+import time
+from typing import Sequence
+
+from src.db.database import async_session_maker
+from src.leaderboard.ranking import STANDINGS_KEY
+from src.leaderboard.snapshot import snapshot_writer
+from src.live.bus import NotificationBus, bus
+from src.scoring.base import BaseScoringRepository
+from src.scoring.engine import score_predictions
+from src.scoring.repo import ScoringRepository
+from src.scoring.rules import RuleSet, scoring_rules
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class RescoreStats:
+    events: int = 0
+    predictions: int = 0
+    changed: int = 0
+    standings: int = 0
+
+
+async def rescore(
+        event_ids: Sequence[int],
+        repo: BaseScoringRepository,
+        rules: RuleSet = scoring_rules,
+        bus: NotificationBus | None = None,
+) -> RescoreStats:
+    """Scores every prediction of the events with ``rules`` and replaces their standings."""
+    await repo.lock_events(event_ids)
+    predictions = await repo.load_predictions(event_ids)
+
+    points, standings = score_predictions(predictions, rules=rules)
+    await repo.save_scores(event_ids, predictions=predictions, points=points, standings=standings)
+
+    if bus is not None:
+        for event_id in event_ids:
+            await bus.publish(event_id=event_id, kind='standings', key=STANDINGS_KEY, data=None)
+
+    return RescoreStats(
+        events=len(event_ids),
+        predictions=len(predictions),
+        changed=int((points != predictions.points).sum()),
+        standings=len(standings),
+    )
+
+
+async def run(event_ids: list[int] | None) -> None:
+    started = time.perf_counter()
+
+    async with async_session_maker() as session:
+        repo = ScoringRepository(session)
+        if event_ids is None:
+            event_ids = await repo.get_scored_event_ids()
+
+        stats = await rescore(event_ids, repo=repo, bus=bus)
+
+    logger.info(
+        f'{stats.events} events, {stats.predictions} predictions re-scored in {time.perf_counter() - started:.2f}s, '
+        f'{stats.changed} points changed, {stats.standings} standings written'
+    )
+
+    if snapshot_writer is not None:
+        await snapshot_writer.write()
+
+    await bus.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Re-score predictions of completed matches with the current rules.')
+    scope = parser.add_mutually_exclusive_group(required=True)
+    scope.add_argument('--event', dest='event_ids', type=int, action='append', help='event to re-score, repeatable')
+    scope.add_argument('--all', action='store_true', help='re-score every event with completed matches')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    asyncio.run(run(event_ids=None if args.all else args.event_ids))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.params import Query
+from starlette import status
+
+from src import exceptions
+from src.auth.dependencies import get_current_user
+from src.auth.schemas import UserRead
+from src.scoring.base import BaseScoringService
+from src.scoring.dependencies import get_scoring_service
+from src.scoring.schemas import WhatIf, ProjectedLeaderboard, FinishingChances
+
+router = APIRouter()
+
+
+@router.post('/events/{event_id}/leaderboard/what-if', response_model=ProjectedLeaderboard)
+async def get_what_if_leaderboard(
+        event_id: int,
+        what_if: WhatIf,
+        offset: int = Query(default=0, ge=0),
+        limit: int = Query(default=100, ge=1, le=500),
+        current_user: UserRead = Depends(get_current_user),
+        scoring_service: BaseScoringService = Depends(get_scoring_service),
+):
+    try:
+        return await scoring_service.get_what_if_leaderboard(
+            event_id=event_id, what_if=what_if, user_id=current_user.id, offset=offset, limit=limit,
+        )
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
+    except exceptions.UnexpectedMatchStatus:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Scores can be given for locked matches of the event which are not completed only',
+        )
+
+
+@router.get('/events/{event_id}/leaderboard/chances', response_model=FinishingChances)
+async def get_finishing_chances(
+        event_id: int,
+        offset: int = Query(default=0, ge=0),
+        limit: int = Query(default=100, ge=1, le=500),
+        current_user: UserRead = Depends(get_current_user),
+        scoring_service: BaseScoringService = Depends(get_scoring_service),
+):
+    try:
+        return await scoring_service.get_finishing_chances(
+            event_id=event_id, user_id=current_user.id, offset=offset, limit=limit,
+        )
+    except exceptions.EventNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Event not found')
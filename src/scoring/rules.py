@@ -0,0 +1,47 @@
+import dataclasses
+
+import numpy as np
+from sqlalchemy import case, ColumnElement
+
+from src.core.config import settings
+
+
+@dataclasses.dataclass(frozen=True)
+class RuleSet:
+    """How predictions are scored.
+
+    A prediction gets ``exact_score`` points for the exact score, ``outcome`` points for the
+    outcome plus ``goal_difference`` if the goal difference is right too, 0 otherwise. Points
+    of the ``double_points_matches`` are doubled. An exact score has to be worth more than any
+    outcome, so the kind of hit can always be told from the points and the match.
+    """
+    exact_score: int = 3
+    outcome: int = 1
+    goal_difference: int = 0
+    double_points_matches: frozenset[int] = frozenset()
+
+    def __post_init__(self):
+        object.__setattr__(self, 'double_points_matches', frozenset(self.double_points_matches))
+
+        if self.outcome < 1 or self.goal_difference < 0 or self.exact_score <= self.outcome + self.goal_difference:
+            raise ValueError(f'Invalid scoring rules {self}')
+
+    def multiplier(self, match_id: int | ColumnElement[int]) -> int | ColumnElement[int]:
+        """Points multiplier of a match, ``match_id`` is either a known id or a column."""
+        if isinstance(match_id, int):
+            return 2 if match_id in self.double_points_matches else 1
+        if not self.double_points_matches:
+            return 1
+        return case((match_id.in_(sorted(self.double_points_matches)), 2), else_=1)
+
+    def multipliers(self, match_ids: np.ndarray) -> np.ndarray:
+        """Points multipliers of an array of match ids."""
+        if not self.double_points_matches:
+            return np.ones(len(match_ids), dtype=np.int32)
+
+        table = np.ones(max(*self.double_points_matches, int(match_ids.max(initial=0))) + 1, dtype=np.int32)
+        table[list(self.double_points_matches)] = 2
+        return table[match_ids]
+
+
+scoring_rules = RuleSet(**settings.SCORING_RULES)
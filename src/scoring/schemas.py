@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, UUID4
+
+from src.matches.schemas import MatchScore
+
+
+class WhatIf(BaseModel):
+    """Hypothetical scores of matches that are not completed, matches left out are not scored."""
+    scores: list[MatchScore] = Field(max_items=100)
+
+
+class ProjectedStanding(BaseModel):
+    rank: int
+    user_id: UUID4
+    points: int
+    current_points: int
+
+
+class ProjectedLeaderboard(BaseModel):
+    participants: int
+    standings: list[ProjectedStanding]
+    user: ProjectedStanding | None
+
+
+class ChanceStanding(BaseModel):
+    user_id: UUID4
+    points: int
+    win_probability: float
+    podium_probability: float
+    average_rank: float
+
+
+class FinishingChances(BaseModel):
+    simulations: int
+    participants: int
+    standings: list[ChanceStanding]
+    user: ChanceStanding | None
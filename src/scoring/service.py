@@ -0,0 +1,170 @@
+import asyncio
+import dataclasses
+from bisect import bisect_left
+from concurrent.futures import Executor
+from uuid import UUID
+
+import numpy as np
+
+from src import exceptions
+from src.core.cache import LocalCache
+from src.core.config import settings
+from src.events.base import BaseEventRepository
+from src.scoring.base import BaseScoringService, BaseScoringRepository
+from src.scoring.engine import EventProjection, Chances, MISSING, leaderboard, finishing_chances
+from src.scoring.rules import RuleSet, scoring_rules
+from src.scoring.schemas import WhatIf, ProjectedLeaderboard, ProjectedStanding, FinishingChances, ChanceStanding
+
+
+class ScoringService(BaseScoringService):
+    def __init__(
+            self,
+            repo: BaseScoringRepository,
+            event_repo: BaseEventRepository,
+            cache: LocalCache | None = None,
+            rules: RuleSet = scoring_rules,
+            chances_cache: LocalCache | None = None,
+            executor: Executor | None = None,
+            simulations: int = settings.SIMULATIONS,
+    ):
+        self.repo = repo
+        self.event_repo = event_repo
+        self.cache = cache
+        self.rules = rules
+        self.chances_cache = chances_cache
+        self.executor = executor
+        self.simulations = simulations
+
+    async def get_what_if_leaderboard(
+            self, event_id: int, what_if: WhatIf, user_id: UUID, offset: int = 0, limit: int = 100,
+    ) -> ProjectedLeaderboard:
+        """Standings of the event if its remaining matches ended with the given scores, nothing is written.
+
+        Predictions are scored in memory against the scores and added to the current points. Only
+        locked matches can be given scores, predictions of open matches must not be revealed.
+        """
+        projection = await self._get_projection(event_id)
+
+        home_goals = np.full(len(projection.match_ids), MISSING, dtype=np.int32)
+        away_goals = home_goals.copy()
+        for score in what_if.scores:
+            index = int(np.searchsorted(projection.match_ids, score.match_id))
+            if index == len(projection.match_ids) or projection.match_ids[index] != score.match_id:
+                raise exceptions.UnexpectedMatchStatus
+            home_goals[index], away_goals[index] = score.home_goals, score.away_goals
+
+        # sorting 100k users takes milliseconds, keep it off the event loop
+        return await asyncio.to_thread(
+            self._project, projection, home_goals, away_goals, user_id=user_id, offset=offset, limit=limit,
+        )
+
+    async def get_finishing_chances(
+            self, event_id: int, user_id: UUID, offset: int = 0, limit: int = 100,
+    ) -> FinishingChances:
+        """Chances of the users to win the event and to finish on the podium, ordered by the chance to win.
+
+        The remaining matches are simulated in the executor, the chances are kept until the version of
+        the event changes, i.e. until one of its matches is finished or corrected.
+        """
+        projection, chances = await self._get_chances(event_id)
+
+        def standing(user: int) -> ChanceStanding:
+            return ChanceStanding(
+                user_id=projection.user_ids[user],
+                points=projection.points[user],
+                win_probability=chances.wins[user] / chances.simulations,
+                podium_probability=chances.podiums[user] / chances.simulations,
+                average_rank=chances.rank_sums[user] / chances.simulations,
+            )
+
+        user = bisect_left(projection.user_ids, user_id)
+        user_standing = None
+        if user < len(projection.user_ids) and projection.user_ids[user] == user_id:
+            user_standing = standing(user)
+
+        return FinishingChances(
+            simulations=chances.simulations,
+            participants=len(projection.user_ids),
+            standings=[standing(user) for user in chances.order[offset:offset + limit].tolist()],
+            user=user_standing,
+        )
+
+    async def _get_chances(self, event_id: int) -> tuple[EventProjection, Chances]:
+        version = await self.repo.get_event_version(event_id=event_id)
+
+        entry = self.chances_cache.get(event_id) if self.chances_cache is not None else None
+        if entry is None or entry[0] != version:
+            projection = await self._load_projection(event_id)
+            # user ids are the slowest part to pickle and the simulation does not need them
+            simulation = asyncio.get_running_loop().run_in_executor(
+                self.executor, finishing_chances,
+                dataclasses.replace(projection, user_ids=[]), self.simulations, self.rules, event_id,
+            )
+            entry = version, projection, simulation
+            if self.chances_cache is not None:
+                self.chances_cache.set(event_id, entry)
+
+        _, projection, simulation = entry
+        try:
+            # the simulation is shared by the requests of the version, one leaving must not cancel it
+            chances = await asyncio.shield(simulation)
+        except Exception:
+            if self.chances_cache is not None and self.chances_cache.get(event_id) is entry:
+                self.chances_cache.invalidate(event_id)
+            raise
+
+        return projection, chances
+
+    async def _get_projection(self, event_id: int) -> EventProjection:
+        if self.cache is not None and (projection := self.cache.get(event_id)) is not None:
+            return projection
+
+        projection = await self._load_projection(event_id)
+
+        if self.cache is not None:
+            self.cache.set(event_id, projection)
+
+        return projection
+
+    async def _load_projection(self, event_id: int) -> EventProjection:
+        projection = await self.repo.get_event_projection(event_id=event_id)
+
+        if not projection.user_ids and not len(projection.match_ids):
+            if not await self.event_repo.get_by_id(event_id=event_id):
+                raise exceptions.EventNotFound
+
+        return projection
+
+    def _project(
+            self,
+            projection: EventProjection,
+            home_goals: np.ndarray,
+            away_goals: np.ndarray,
+            user_id: UUID,
+            offset: int,
+            limit: int,
+    ) -> ProjectedLeaderboard:
+        points = projection.project(home_goals, away_goals, rules=self.rules)
+        order, ranks = leaderboard(points)
+
+        def standing(user: int, rank: int) -> ProjectedStanding:
+            return ProjectedStanding(
+                rank=rank,
+                user_id=projection.user_ids[user],
+                points=points[user],
+                current_points=projection.points[user],
+            )
+
+        user = bisect_left(projection.user_ids, user_id)
+        user_standing = None
+        if user < len(projection.user_ids) and projection.user_ids[user] == user_id:
+            user_standing = standing(user, rank=int(np.count_nonzero(points > points[user])) + 1)
+
+        return ProjectedLeaderboard(
+            participants=len(projection.user_ids),
+            standings=[
+                standing(user, rank)
+                for user, rank in zip(order[offset:offset + limit].tolist(), ranks[offset:offset + limit].tolist())
+            ],
+            user=user_standing,
+        )
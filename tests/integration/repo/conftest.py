@@ -1,7 +1,7 @@
 import logging.config
 import pathlib
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from os import path
 
 import pytest
@@ -14,17 +14,24 @@ from src.auth.base import BaseAuthRepository
 from src.auth.models import User
 from src.auth.repo import AuthRepository
 from src.core.config import settings
+from src.core.locks import EventLocker, PostgresEventLocker
 from src.core.security import get_password_hash
 from src.db.database import Base
 from src.events.base import BaseEventRepository
 from src.events.models import Event, EventStatus
 from src.events.repo import EventRepository
+from src.leaderboard.base import BaseLeaderboardRepository
+from src.leaderboard.repo import LeaderboardRepository
+from src.leagues.base import BaseLeagueRepository
+from src.leagues.repo import LeagueRepository
 from src.matches.base import BaseMatchRepository
 from src.matches.models import Match
 from src.matches.repo import MatchRepository
 from src.predictions.base import BasePredictionRepository
 from src.predictions.models import Prediction
 from src.predictions.repo import PredictionRepository
+from src.scoring.base import BaseScoringRepository
+from src.scoring.repo import ScoringRepository
 
 log_file_path = path.join(path.dirname(path.dirname(path.dirname(path.dirname(path.abspath(__file__))))), 'logging.ini')
 logging.config.fileConfig(log_file_path, disable_existing_loggers=False)
@@ -54,7 +61,7 @@ def test_event() -> Event:
     return Event(
         id=123,
         name='Event',
-        deadline=datetime.now(tz=timezone.utc),
+        deadline=datetime.now(tz=timezone.utc) + timedelta(days=1),
         status=EventStatus.created,
     )
 
@@ -65,7 +72,7 @@ def test_match(test_event: Event) -> Match:
         id=123,
         home_team='Team 1',
         away_team='Team 2',
-        start_time=datetime.now(tz=timezone.utc),
+        start_time=datetime.now(tz=timezone.utc) + timedelta(days=1),
         event_id=test_event.id,
     )
 
@@ -76,7 +83,7 @@ def another_match(test_event: Event) -> Match:
         id=124,
         home_team='Team 3',
         away_team='Team 4',
-        start_time=datetime.now(tz=timezone.utc),
+        start_time=datetime.now(tz=timezone.utc) + timedelta(days=1),
         event_id=test_event.id,
     )
 
@@ -144,6 +151,11 @@ async def db_session() -> AsyncSession:
         await conn.rollback()
 
 
+@pytest.fixture
+def event_locker() -> EventLocker:
+    return PostgresEventLocker(async_engine, timeout=0.1)
+
+
 @pytest.fixture
 def auth_repo(db_session: AsyncSession) -> BaseAuthRepository: # noqa
     yield AuthRepository(session=db_session)
@@ -162,3 +174,18 @@ def match_repo(db_session: AsyncSession) -> BaseMatchRepository: # noqa
 @pytest.fixture
 def prediction_repo(db_session: AsyncSession) -> BasePredictionRepository: # noqa
     yield PredictionRepository(session=db_session)
+
+
+@pytest.fixture
+def leaderboard_repo(db_session: AsyncSession) -> BaseLeaderboardRepository: # noqa
+    yield LeaderboardRepository(session=db_session)
+
+
+@pytest.fixture
+def league_repo(db_session: AsyncSession) -> BaseLeagueRepository: # noqa
+    yield LeagueRepository(session=db_session)
+
+
+@pytest.fixture
+def scoring_repo(db_session: AsyncSession) -> BaseScoringRepository: # noqa
+    yield ScoringRepository(session=db_session)
@@ -47,7 +47,7 @@ class TestUpdate:
 
         event = EventUpdate(name=test_event.name, deadline=test_event.deadline, status=EventStatus.upcoming)
 
-        updated_event = await event_repo.update(event_id=test_event.id, event=event)
+        updated_event = await event_repo.update(event_id=test_event.id, event_data=event)
 
         assert updated_event.status == EventStatus.upcoming
 
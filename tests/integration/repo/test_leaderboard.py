@@ -0,0 +1,116 @@
+import pytest
+
+from src.auth.models import User
+from src.events.models import Event
+from src.leaderboard.base import BaseLeaderboardRepository
+from src.matches.base import BaseMatchRepository
+from src.matches.models import Match, MatchStatus
+from src.matches.schemas import MatchRead
+from src.predictions.base import BasePredictionRepository
+from src.predictions.models import Prediction
+
+
+@pytest.mark.asyncio
+async def test_finish_updates_standings(
+        leaderboard_repo: BaseLeaderboardRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    await match_repo.finish(match_id=test_match.id, home_goals=test_prediction.home_goals,
+                            away_goals=test_prediction.away_goals)
+
+    standings = await leaderboard_repo.get_event_standings(event_id=test_event.id)
+
+    assert [(s.user_id, s.points, s.exact_hits, s.outcome_hits) for s in standings] == [(test_user.id, 3, 1, 0)]
+
+
+@pytest.mark.asyncio
+async def test_correction_moves_standings(
+        leaderboard_repo: BaseLeaderboardRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+) -> None:
+    await match_repo.finish(match_id=test_match.id, home_goals=test_prediction.home_goals,
+                            away_goals=test_prediction.away_goals)
+    await match_repo.correct(match_id=test_match.id, home_goals=0, away_goals=0)
+
+    standings = await leaderboard_repo.get_event_standings(event_id=test_event.id)
+
+    assert [(s.points, s.exact_hits, s.outcome_hits) for s in standings] == [(1, 0, 1)]
+
+
+@pytest.mark.asyncio
+async def test_rescoring_is_idempotent(
+        leaderboard_repo: BaseLeaderboardRepository,
+        prediction_repo: BasePredictionRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+) -> None:
+    match = MatchRead(
+        id=test_match.id,
+        home_team=test_match.home_team,
+        away_team=test_match.away_team,
+        home_goals=1,
+        away_goals=1,
+        start_time=test_match.start_time,
+        event_id=test_match.event_id,
+        status=MatchStatus.completed,
+    )
+
+    await prediction_repo.update_points_for_match(match=match)
+    await prediction_repo.update_points_for_match(match=match)
+
+    standings = await leaderboard_repo.get_event_standings(event_id=test_event.id)
+
+    assert [(s.points, s.exact_hits, s.outcome_hits) for s in standings] == [(1, 0, 1)]
+
+
+@pytest.mark.asyncio
+async def test_standings_pages(
+        leaderboard_repo: BaseLeaderboardRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+) -> None:
+    await match_repo.finish(match_id=test_match.id, home_goals=1, away_goals=1)
+
+    first_page = await leaderboard_repo.get_event_standings(event_id=test_event.id, limit=1)
+    last = first_page[-1]
+    second_page = await leaderboard_repo.get_event_standings(
+        event_id=test_event.id, after=(last.points, last.user_id), limit=1,
+    )
+
+    assert len(first_page) == 1
+    assert second_page == []
+
+
+@pytest.mark.asyncio
+async def test_scoring_stores_ranks(
+        leaderboard_repo: BaseLeaderboardRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    await match_repo.finish(match_id=test_match.id, home_goals=1, away_goals=1)
+
+    neighbours = await leaderboard_repo.get_event_neighbours(event_id=test_event.id, user_id=test_user.id, window=5)
+
+    assert [(s.user_id, s.rank) for s in neighbours] == [(test_user.id, 1)]
+
+
+@pytest.mark.asyncio
+async def test_no_neighbours_without_standing(
+        leaderboard_repo: BaseLeaderboardRepository,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    assert await leaderboard_repo.get_event_neighbours(event_id=test_event.id, user_id=test_user.id, window=5) == []
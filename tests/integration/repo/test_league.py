@@ -0,0 +1,79 @@
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import User
+from src.core.security import get_password_hash
+from src.events.models import Event
+from src.leaderboard.base import BaseLeaderboardRepository
+from src.leagues import repo as league_repo_module
+from src.leagues.base import BaseLeagueRepository
+from src.leagues.schemas import LeagueCreate
+from src.matches.base import BaseMatchRepository
+from src.matches.models import Match
+from src.predictions.models import Prediction
+
+
+@pytest_asyncio.fixture
+async def other_user(db_session: AsyncSession) -> User:
+    user = User(id=uuid4(), email='test_user2@test.com', hashed_password=get_password_hash('1234'))
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_owner_is_member(league_repo: BaseLeagueRepository, test_user: User) -> None:
+    league = await league_repo.create(league=LeagueCreate(name='Office'), owner_id=test_user.id, invite_code='code')
+
+    assert league.member_count == 1
+    assert await league_repo.is_member(league_id=league.id, user_id=test_user.id)
+    assert [league.id for league in await league_repo.get_multiple_by_user_id(user_id=test_user.id)] == [league.id]
+
+
+@pytest.mark.asyncio
+async def test_join_counts_members_once(league_repo: BaseLeagueRepository, test_user: User, other_user: User) -> None:
+    league = await league_repo.create(league=LeagueCreate(name='Office'), owner_id=test_user.id, invite_code='code')
+
+    await league_repo.join(invite_code='code', user_id=other_user.id)
+    joined = await league_repo.join(invite_code='code', user_id=other_user.id)
+
+    assert joined.id == league.id
+    assert joined.member_count == 2
+    assert await league_repo.join(invite_code='nope', user_id=other_user.id) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('small_league_members', [0, 1000])
+async def test_standings_of_members(
+        league_repo: BaseLeagueRepository,
+        leaderboard_repo: BaseLeaderboardRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+        test_user: User,
+        other_user: User,
+        small_league_members: int,
+        monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(league_repo_module, 'SMALL_LEAGUE_MEMBERS', small_league_members)
+    await match_repo.finish(match_id=test_match.id, home_goals=test_prediction.home_goals,
+                            away_goals=test_prediction.away_goals)
+
+    member_league = await league_repo.create(
+        league=LeagueCreate(name='Members'), owner_id=test_user.id, invite_code='members',
+    )
+    other_league = await league_repo.create(
+        league=LeagueCreate(name='Others'), owner_id=other_user.id, invite_code='others',
+    )
+
+    event_standings = await league_repo.get_standings(league=member_league, event_id=test_event.id)
+    season_standings = await league_repo.get_standings(league=member_league)
+
+    assert [(s.user_id, s.points) for s in event_standings] == [(test_user.id, 3)]
+    assert [(s.user_id, s.points) for s in season_standings] == [(test_user.id, 3)]
+    assert await league_repo.get_standings(league=other_league) == []
+    assert await leaderboard_repo.get_user_totals() == [(test_user.id, 3)]
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src import exceptions
+from src.core.config import settings
+from src.core.locks import EventLocker, PostgresEventLocker
+from src.matches.models import Match
+
+
+@pytest.mark.asyncio
+async def test_event_lock_wait_timeout(event_locker: EventLocker) -> None:
+    async with event_locker.hold(123):
+        with pytest.raises(exceptions.EventLocked):
+            async with event_locker.hold(123):
+                pass
+
+        async with event_locker.hold(124):
+            pass
+
+    async with event_locker.hold(123):
+        pass
+
+    assert event_locker.stats.acquired == 3
+    assert event_locker.stats.timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_match_lock_finds_the_event(event_locker: EventLocker, test_match: Match) -> None:
+    async def event_id_of(match_id: int) -> int | None:
+        raise AssertionError('the event is found while locking')
+
+    async with event_locker.hold_match(test_match.id, event_id_of=event_id_of) as event_id:
+        assert event_id == test_match.event_id
+
+        with pytest.raises(exceptions.EventLocked):
+            async with event_locker.hold(test_match.event_id):
+                pass
+
+    async with event_locker.hold_match(987, event_id_of=event_id_of) as event_id:
+        assert event_id is None
+
+
+@pytest.mark.asyncio
+async def test_lock_pool_wait_timeout() -> None:
+    engine = create_async_engine(settings.TEST_DATABASE_URL_POSTGRES, pool_size=1, max_overflow=0, pool_timeout=0.1)
+    locker = PostgresEventLocker(engine, timeout=0.1)
+
+    async with locker.hold(123):
+        with pytest.raises(exceptions.EventLocked):
+            async with locker.hold(124):
+                pass
+
+    assert locker.stats.timeouts == 1
+
+    await locker.close()
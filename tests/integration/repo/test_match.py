@@ -2,10 +2,13 @@ from datetime import datetime, timezone
 
 import pytest
 
-from src.events.models import Event
+from src.core.config import settings
+from src.events.models import Event, EventStatus
 from src.matches.base import BaseMatchRepository
 from src.matches.models import Match, MatchStatus
-from src.matches.schemas import MatchCreate, MatchUpdate
+from src.matches.schemas import MatchCreate, MatchUpdate, MatchScore, MatchFeedRow, MatchFilter
+from src.predictions.base import BasePredictionRepository
+from src.predictions.models import Prediction
 
 
 @pytest.mark.asyncio
@@ -41,6 +44,46 @@ async def test_create_match(match_repo: BaseMatchRepository, test_event: Event)
     assert db_match.event_id == test_event.id
 
 
+@pytest.mark.asyncio
+async def test_create_multiple_matches_up_to_limit(match_repo: BaseMatchRepository, test_event: Event) -> None:
+    matches = [
+        MatchCreate(home_team='Team 5', away_team='Team 6', start_time=datetime.now(tz=timezone.utc)),
+        MatchCreate(home_team='Team 7', away_team='Team 8', start_time=datetime.now(tz=timezone.utc)),
+    ]
+
+    event_status, capacity, created = await match_repo.create_multiple(
+        event_id=test_event.id, matches=matches, max_count=3,
+    )
+
+    assert (event_status, capacity) == (EventStatus.created, 1)
+    assert [match.home_team for match in created] == ['Team 5']
+
+    event_status, capacity, created = await match_repo.create_multiple(
+        event_id=test_event.id, matches=matches, max_count=3,
+    )
+
+    assert (event_status, capacity, created) == (EventStatus.created, 0, [])
+
+    assert await match_repo.create_multiple(event_id=987, matches=matches, max_count=3) == (None, 0, [])
+
+
+@pytest.mark.asyncio
+async def test_create_multiple_matches_skips_duplicates(
+        match_repo: BaseMatchRepository, test_event: Event, test_match: Match,
+) -> None:
+    existing = MatchCreate(home_team=test_match.home_team, away_team=test_match.away_team,
+                           start_time=test_match.start_time)
+    new = MatchCreate(home_team='Team 5', away_team='Team 6', start_time=datetime.now(tz=timezone.utc))
+
+    _, _, created = await match_repo.create_multiple(
+        event_id=test_event.id, matches=[existing, new, new], max_count=settings.MATCHES_COUNT,
+    )
+
+    assert [match.home_team for match in created] == ['Team 5']
+
+    assert await match_repo.create(match=existing, event_id=test_event.id) is None
+
+
 @pytest.mark.asyncio
 async def test_update_match(match_repo: BaseMatchRepository, test_match: Match) -> None:
     data = MatchUpdate(
@@ -52,12 +95,179 @@ async def test_update_match(match_repo: BaseMatchRepository, test_match: Match)
         status=MatchStatus.completed,
     )
 
-    updated_match = await match_repo.update(match_id=test_match.id, match=data)
+    updated_match = await match_repo.update(match_id=test_match.id, match_data=data)
 
     assert updated_match.id == test_match.id
     assert updated_match.status == MatchStatus.completed
 
 
+@pytest.mark.asyncio
+async def test_finish_match(
+        match_repo: BaseMatchRepository,
+        prediction_repo: BasePredictionRepository,
+        test_match: Match,
+        test_prediction: Prediction,
+) -> None:
+    exists, finished = await match_repo.finish(match_id=test_match.id, home_goals=2, away_goals=2)
+
+    assert exists
+    assert finished.status == MatchStatus.completed
+    assert (finished.home_goals, finished.away_goals) == (2, 2)
+
+    prediction = await prediction_repo.get_by_id(prediction_id=test_prediction.id)
+
+    assert prediction.points == 3
+
+    exists, finished_again = await match_repo.finish(match_id=test_match.id, home_goals=1, away_goals=0)
+
+    assert exists
+    assert finished_again is None
+
+
+@pytest.mark.asyncio
+async def test_finish_not_existing_match(match_repo: BaseMatchRepository) -> None:
+    exists, finished = await match_repo.finish(match_id=987, home_goals=1, away_goals=0)
+
+    assert not exists
+    assert finished is None
+
+
+@pytest.mark.asyncio
+async def test_finish_multiple_matches(
+        match_repo: BaseMatchRepository,
+        prediction_repo: BasePredictionRepository,
+        test_match: Match,
+        another_match: Match,
+        test_prediction: Prediction,
+) -> None:
+    scores = [
+        MatchScore(match_id=test_match.id, home_goals=0, away_goals=0),
+        MatchScore(match_id=987, home_goals=1, away_goals=0),
+    ]
+
+    finished = await match_repo.finish_multiple(event_id=test_match.event_id, scores=scores)
+
+    assert [match.id for match in finished] == [test_match.id]
+    assert finished[0].status == MatchStatus.completed
+    assert (finished[0].home_goals, finished[0].away_goals) == (0, 0)
+
+    prediction = await prediction_repo.get_by_id(prediction_id=test_prediction.id)
+
+    assert prediction.points == 1
+
+    statuses = await match_repo.get_statuses(event_id=test_match.event_id, match_ids=[test_match.id, another_match.id])
+
+    assert statuses == {test_match.id: MatchStatus.completed, another_match.id: MatchStatus.upcoming}
+
+
+@pytest.mark.asyncio
+async def test_correct_match(
+        match_repo: BaseMatchRepository,
+        prediction_repo: BasePredictionRepository,
+        test_match: Match,
+        test_prediction: Prediction,
+) -> None:
+    exists, corrected, deltas = await match_repo.correct(match_id=test_match.id, home_goals=1, away_goals=1)
+
+    assert exists
+    assert corrected is None
+    assert deltas == []
+
+    await match_repo.finish(match_id=test_match.id, home_goals=2, away_goals=2)
+
+    exists, corrected, deltas = await match_repo.correct(match_id=test_match.id, home_goals=1, away_goals=1)
+
+    assert exists
+    assert (corrected.home_goals, corrected.away_goals) == (1, 1)
+    assert deltas == [(test_prediction.user_id, -2)]
+
+    prediction = await prediction_repo.get_by_id(prediction_id=test_prediction.id)
+
+    assert prediction.points == 1
+
+    exists, corrected, deltas = await match_repo.correct(match_id=test_match.id, home_goals=3, away_goals=3)
+
+    assert exists
+    assert deltas == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_matches_by_natural_key(
+        match_repo: BaseMatchRepository,
+        prediction_repo: BasePredictionRepository,
+        test_match: Match,
+        test_prediction: Prediction,
+) -> None:
+    feed = [
+        MatchFeedRow(
+            event_id=test_match.event_id,
+            home_team=test_match.home_team,
+            away_team=test_match.away_team,
+            start_time=test_match.start_time,
+            status=MatchStatus.completed,
+            home_goals=2,
+            away_goals=2,
+        ),
+        MatchFeedRow(event_id=test_match.event_id, home_team='Team 5', away_team='Team 6',
+                     start_time=test_match.start_time),
+        MatchFeedRow(event_id=987, home_team='Team 7', away_team='Team 8', start_time=test_match.start_time),
+    ]
+
+    changed, skipped = await match_repo.upsert_multiple(matches=feed, max_count=settings.MATCHES_COUNT)
+
+    assert sorted((match.home_team, match.status) for match in changed) == [
+        ('Team 1', MatchStatus.completed), ('Team 5', MatchStatus.upcoming),
+    ]
+    assert [match.id for match in changed if match.home_team == 'Team 1'] == [test_match.id]
+    assert skipped == 1
+
+    prediction = await prediction_repo.get_by_id(prediction_id=test_prediction.id)
+
+    assert prediction.points == 3
+
+    assert await match_repo.upsert_multiple(matches=feed, max_count=settings.MATCHES_COUNT) == ([], 1)
+
+
+@pytest.mark.asyncio
+async def test_upsert_matches_keeps_the_limit(match_repo: BaseMatchRepository, test_match: Match) -> None:
+    feed = [
+        MatchFeedRow(
+            event_id=test_match.event_id,
+            home_team=test_match.home_team,
+            away_team=test_match.away_team,
+            start_time=test_match.start_time,
+            status=MatchStatus.completed,
+            home_goals=1,
+            away_goals=0,
+        ),
+        MatchFeedRow(event_id=test_match.event_id, home_team='Team 5', away_team='Team 6',
+                     start_time=test_match.start_time),
+    ]
+
+    changed, skipped = await match_repo.upsert_multiple(matches=feed, max_count=1)
+
+    assert [match.id for match in changed] == [test_match.id]
+    assert skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_get_matches(match_repo: BaseMatchRepository, test_match: Match, another_match: Match) -> None:
+    matches = await match_repo.get_multiple(filters=MatchFilter(team='Team 4'))
+
+    assert [match.id for match in matches] == [another_match.id]
+
+    first_page = await match_repo.get_multiple(filters=MatchFilter(status=MatchStatus.upcoming), limit=1)
+    second_page = await match_repo.get_multiple(
+        filters=MatchFilter(status=MatchStatus.upcoming), after=(first_page[0].start_time, first_page[0].id),
+    )
+
+    assert sorted(match.id for match in first_page + second_page) == sorted([test_match.id, another_match.id])
+
+    matches = await match_repo.get_multiple(filters=MatchFilter(start_to=test_match.start_time))
+
+    assert matches == []
+
+
 @pytest.mark.asyncio
 async def test_delete_match(match_repo: BaseMatchRepository, test_match: Match) -> None:
     await match_repo.delete(match_id=test_match.id)
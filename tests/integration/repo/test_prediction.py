@@ -1,11 +1,13 @@
-import pytest
+from datetime import datetime, timezone, timedelta
+from uuid import uuid4
 
-from sqlalchemy.exc import IntegrityError
+import pytest
 
 from src.auth.models import User
 from src.events.models import Event
-from src.matches.models import Match
-from src.matches.schemas import MatchRead
+from src.matches.base import BaseMatchRepository
+from src.matches.models import Match, MatchStatus
+from src.matches.schemas import MatchRead, MatchUpdate
 from src.predictions.base import BasePredictionRepository
 from src.predictions.models import Prediction
 from src.predictions.schemas import PredictionCreate, PredictionUpdate
@@ -37,15 +39,20 @@ async def test_get_predictions_by_event_id(
 
 
 @pytest.mark.asyncio
-async def test_unique_prediction(prediction_repo: BasePredictionRepository, test_match: Match, test_user: User) -> None:
+async def test_unique_prediction(
+        prediction_repo: BasePredictionRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_user: User,
+) -> None:
     prediction = PredictionCreate(
         home_goals=1,
         away_goals=1,
         match_id=test_match.id,
     )
 
-    with pytest.raises(IntegrityError):
-        await prediction_repo.create(prediction=prediction, user_id=test_user.id)
+    assert await prediction_repo.create(prediction=prediction, user_id=test_user.id) is None
+    assert await prediction_repo.get_prediction_state(match_id=test_match.id, user_id=test_user.id) == (True, True)
 
 
 @pytest.mark.asyncio
@@ -67,6 +74,138 @@ async def test_create_prediction(prediction_repo: BasePredictionRepository, anot
     assert db_prediction.match_id == another_match.id
 
 
+@pytest.mark.asyncio
+async def test_create_prediction_for_started_match(
+        prediction_repo: BasePredictionRepository,
+        match_repo: BaseMatchRepository,
+        another_match: Match,
+        test_user: User,
+) -> None:
+    data = MatchUpdate(
+        home_team=another_match.home_team,
+        away_team=another_match.away_team,
+        start_time=datetime.now(tz=timezone.utc) - timedelta(minutes=1),
+        status=MatchStatus.upcoming,
+    )
+    await match_repo.update(match_id=another_match.id, match_data=data)
+
+    prediction = PredictionCreate(home_goals=1, away_goals=1, match_id=another_match.id)
+
+    assert await prediction_repo.create(prediction=prediction, user_id=test_user.id) is None
+    assert await prediction_repo.get_score_counts(match_id=another_match.id) == []
+    assert await prediction_repo.get_prediction_state(match_id=another_match.id, user_id=test_user.id) == (False, False)
+
+
+@pytest.mark.asyncio
+async def test_prediction_state_of_not_existing_match(
+        prediction_repo: BasePredictionRepository,
+        test_user: User,
+) -> None:
+    assert await prediction_repo.get_prediction_state(match_id=987, user_id=test_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_update_prediction_for_started_match(
+        prediction_repo: BasePredictionRepository,
+        match_repo: BaseMatchRepository,
+        test_match: Match,
+        test_prediction: Prediction,
+) -> None:
+    data = MatchUpdate(
+        home_team=test_match.home_team,
+        away_team=test_match.away_team,
+        start_time=datetime.now(tz=timezone.utc) - timedelta(minutes=1),
+        status=MatchStatus.upcoming,
+    )
+    await match_repo.update(match_id=test_match.id, match_data=data)
+
+    updated = await prediction_repo.update(
+        prediction_id=test_prediction.id,
+        prediction_data=PredictionUpdate(home_goals=0, away_goals=0),
+        user_id=test_prediction.user_id,
+    )
+
+    assert updated is None
+
+    prediction = await prediction_repo.get_by_id(prediction_id=test_prediction.id)
+
+    assert (prediction.home_goals, prediction.away_goals) == (test_prediction.home_goals, test_prediction.away_goals)
+
+
+@pytest.mark.asyncio
+async def test_create_prediction_counts_score(
+        prediction_repo: BasePredictionRepository,
+        another_match: Match,
+        test_user: User,
+) -> None:
+    prediction = PredictionCreate(home_goals=2, away_goals=1, match_id=another_match.id)
+
+    await prediction_repo.create(prediction=prediction, user_id=test_user.id)
+
+    score_counts = await prediction_repo.get_score_counts(match_id=another_match.id)
+
+    assert [(score.home_goals, score.away_goals, score.count) for score in score_counts] == [(2, 1, 1)]
+
+
+@pytest.mark.asyncio
+async def test_update_prediction_moves_score_count(
+        prediction_repo: BasePredictionRepository,
+        test_prediction: Prediction,
+) -> None:
+    data = PredictionUpdate(home_goals=0, away_goals=1)
+
+    await prediction_repo.update(
+        prediction_id=test_prediction.id, prediction_data=data, user_id=test_prediction.user_id,
+    )
+
+    score_counts = await prediction_repo.get_score_counts(match_id=test_prediction.match_id)
+
+    assert [(score.home_goals, score.away_goals, score.count) for score in score_counts] == [(0, 1, 1)]
+
+
+@pytest.mark.asyncio
+async def test_upsert_predictions(
+        prediction_repo: BasePredictionRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        another_match: Match,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    predictions = [
+        PredictionCreate(home_goals=0, away_goals=1, match_id=test_match.id),
+        PredictionCreate(home_goals=2, away_goals=1, match_id=another_match.id),
+        PredictionCreate(home_goals=1, away_goals=1, match_id=987),
+    ]
+
+    saved = await prediction_repo.upsert_multiple(event_id=test_event.id, user_id=test_user.id, predictions=predictions)
+
+    assert sorted(saved) == sorted([test_match.id, another_match.id])
+
+    predictions = await prediction_repo.get_multiple_by_event_id(event_id=test_event.id, user_id=test_user.id)
+    scores = {prediction.match_id: (prediction.home_goals, prediction.away_goals) for prediction in predictions}
+
+    assert scores == {test_match.id: (0, 1), another_match.id: (2, 1)}
+
+    score_counts = await prediction_repo.get_score_counts(match_id=test_match.id)
+
+    assert [(score.home_goals, score.away_goals, score.count) for score in score_counts] == [(0, 1, 1)]
+
+    # saving the same scores again moves no counts
+    predictions = [
+        PredictionCreate(home_goals=home_goals, away_goals=away_goals, match_id=match_id)
+        for match_id, (home_goals, away_goals) in scores.items()
+    ]
+    await prediction_repo.upsert_multiple(event_id=test_event.id, user_id=test_user.id, predictions=predictions)
+
+    for match_id, (home_goals, away_goals) in scores.items():
+        score_counts = await prediction_repo.get_score_counts(match_id=match_id)
+
+        assert [(score.home_goals, score.away_goals, score.count) for score in score_counts] == [
+            (home_goals, away_goals, 1),
+        ]
+
+
 @pytest.mark.asyncio
 async def test_update_prediction(prediction_repo: BasePredictionRepository, test_prediction: Prediction) -> None:
     data = PredictionUpdate(
@@ -74,7 +213,9 @@ async def test_update_prediction(prediction_repo: BasePredictionRepository, test
         away_goals=5,
     )
 
-    updated_prediction = await prediction_repo.update(prediction_id=test_prediction.id, prediction=data)
+    updated_prediction = await prediction_repo.update(
+        prediction_id=test_prediction.id, prediction_data=data, user_id=test_prediction.user_id,
+    )
 
     assert updated_prediction.id == test_prediction.id
     assert updated_prediction.home_goals == data.home_goals
@@ -82,6 +223,20 @@ async def test_update_prediction(prediction_repo: BasePredictionRepository, test
     assert updated_prediction.user_id == test_prediction.user_id
 
 
+@pytest.mark.asyncio
+async def test_update_prediction_of_another_user(
+        prediction_repo: BasePredictionRepository,
+        test_prediction: Prediction,
+) -> None:
+    data = PredictionUpdate(home_goals=0, away_goals=3)
+
+    assert await prediction_repo.update(prediction_id=test_prediction.id, prediction_data=data, user_id=uuid4()) is None
+
+    prediction = await prediction_repo.get_by_id(prediction_id=test_prediction.id)
+
+    assert (prediction.home_goals, prediction.away_goals) == (test_prediction.home_goals, test_prediction.away_goals)
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     'home_goals, away_goals, points',
@@ -92,6 +247,8 @@ async def test_update_prediction(prediction_repo: BasePredictionRepository, test
         (1, 1, 1),
         (2, 0, 0),
         (0, 2, 0),
+        (1, 0, 0),
+        (0, 1, 0),
     ]
 )
 async def test_update_predictions_points(
@@ -120,3 +277,30 @@ async def test_update_predictions_points(
     updated_repo = await prediction_repo.get_by_id(prediction_id=test_prediction.id)
 
     assert updated_repo.points == points
+
+
+@pytest.mark.asyncio
+async def test_lock_states_and_locked_predictions(
+        prediction_repo: BasePredictionRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        another_match: Match,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    states = await prediction_repo.get_lock_states(event_id=test_event.id)
+
+    assert states == [(test_match.id, True, None, None), (another_match.id, True, None, None)]
+
+    await match_repo.finish(match_id=test_match.id, home_goals=2, away_goals=2)
+
+    assert await prediction_repo.get_lock_states(match_id=test_match.id) == [(test_match.id, False, 2, 2)]
+
+    predictions = await prediction_repo.get_locked_predictions(match_ids=[test_match.id])
+
+    assert predictions.user_ids == [test_user.id]
+    assert predictions.starts.tolist() == [0, 1]
+    assert predictions.match_ids.tolist() == [test_match.id]
+    assert (predictions.home_goals.tolist(), predictions.away_goals.tolist()) == ([2], [2])
+    assert predictions.points.tolist() == [3]
@@ -0,0 +1,125 @@
+import pytest
+
+from src.auth.models import User
+from src.events.models import Event
+from src.leaderboard.base import BaseLeaderboardRepository
+from src.matches.base import BaseMatchRepository
+from src.matches.models import Match, MatchStatus
+from src.matches.schemas import MatchUpdate
+from src.predictions.models import Prediction
+from src.scoring.base import BaseScoringRepository
+from src.scoring.rescore import rescore
+from src.scoring.rules import RuleSet
+
+
+async def lock(match_repo: BaseMatchRepository, match: Match) -> None:
+    """Locks the predictions of the match by starting it."""
+    await match_repo.update(match_id=match.id, match_data=MatchUpdate(
+        home_team=match.home_team, away_team=match.away_team, status=MatchStatus.ongoing, start_time=match.start_time,
+    ))
+
+
+@pytest.mark.asyncio
+async def test_rescore_with_same_rules_changes_nothing(
+        scoring_repo: BaseScoringRepository,
+        leaderboard_repo: BaseLeaderboardRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    await match_repo.finish(match_id=test_match.id, home_goals=test_prediction.home_goals + 1,
+                            away_goals=test_prediction.away_goals + 1)
+    before = await leaderboard_repo.get_event_standings(event_id=test_event.id)
+    before = [(s.user_id, s.points, s.exact_hits, s.outcome_hits, s.rank) for s in before]
+
+    stats = await rescore([test_event.id], repo=scoring_repo, rules=RuleSet())
+
+    standings = await leaderboard_repo.get_event_standings(event_id=test_event.id)
+
+    assert stats.changed == 0
+    assert [(s.user_id, s.points, s.exact_hits, s.outcome_hits, s.rank) for s in standings] == before
+
+
+@pytest.mark.asyncio
+async def test_rescore_with_new_rules(
+        scoring_repo: BaseScoringRepository,
+        leaderboard_repo: BaseLeaderboardRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    await match_repo.finish(match_id=test_match.id, home_goals=test_prediction.home_goals,
+                            away_goals=test_prediction.away_goals)
+
+    rules = RuleSet(exact_score=5, double_points_matches=[test_match.id])
+    stats = await rescore([test_event.id], repo=scoring_repo, rules=rules)
+
+    standings = await leaderboard_repo.get_event_standings(event_id=test_event.id)
+    totals = dict(await leaderboard_repo.get_user_totals())
+
+    assert stats.changed == 1
+    assert [(s.user_id, s.points, s.exact_hits, s.rank) for s in standings] == [(test_user.id, 10, 1, 1)]
+    assert totals[test_user.id] == 10
+
+
+@pytest.mark.asyncio
+async def test_event_projection(
+        scoring_repo: BaseScoringRepository,
+        match_repo: BaseMatchRepository,
+        test_prediction: Prediction,
+        test_match: Match,
+        another_match: Match,
+        test_event: Event,
+        test_user: User,
+) -> None:
+    projection = await scoring_repo.get_event_projection(event_id=test_event.id)
+
+    assert projection.match_ids.tolist() == []
+    assert projection.user_ids == []
+
+    await lock(match_repo, test_match)
+    projection = await scoring_repo.get_event_projection(event_id=test_event.id)
+
+    assert projection.match_ids.tolist() == [test_match.id]
+    assert projection.user_ids == [test_user.id]
+    assert projection.points.tolist() == [0]
+    assert list(zip(projection.users.tolist(), projection.matches.tolist())) == [(0, 0)]
+    assert (projection.home_goals.tolist(), projection.away_goals.tolist()) == ([2], [2])
+
+    await match_repo.finish(match_id=test_match.id, home_goals=2, away_goals=2)
+    projection = await scoring_repo.get_event_projection(event_id=test_event.id)
+
+    assert projection.match_ids.tolist() == []
+    assert projection.user_ids == [test_user.id]
+    assert projection.points.tolist() == [3]
+    assert len(projection.users) == 0
+
+
+@pytest.mark.asyncio
+async def test_event_version(
+        scoring_repo: BaseScoringRepository,
+        match_repo: BaseMatchRepository,
+        test_match: Match,
+        another_match: Match,
+        test_event: Event,
+) -> None:
+    version = await scoring_repo.get_event_version(event_id=test_event.id)
+
+    assert version == ((test_match.id, None, None, True), (another_match.id, None, None, True))
+    assert await scoring_repo.get_event_version(event_id=test_event.id) == version
+
+    await lock(match_repo, another_match)
+
+    assert await scoring_repo.get_event_version(event_id=test_event.id) == (
+        (test_match.id, None, None, True), (another_match.id, None, None, False),
+    )
+
+    await match_repo.finish(match_id=test_match.id, home_goals=2, away_goals=1)
+
+    assert await scoring_repo.get_event_version(event_id=test_event.id) == (
+        (test_match.id, 2, 1, False), (another_match.id, None, None, False),
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Sequence
 from uuid import UUID
 
 import httpx
@@ -18,11 +18,22 @@ from src.core.security import get_password_hash, verify_password
 from src.events.base import BaseEventService
 from src.events.models import EventStatus
 from src.events.schemas import EventCreate, EventRead
+from src.leaderboard.base import BaseLeaderboardService
+from src.leaderboard.schemas import StandingRead, RankedStanding, UserRank
+from src.leagues.base import BaseLeagueService
+from src.leagues.schemas import LeagueCreate, LeagueRead
 from src.matches.base import BaseMatchService
 from src.matches.models import MatchStatus
-from src.matches.schemas import MatchCreate, MatchRead
+from src.matches.schemas import (
+    MatchCreate, MatchRead, MatchScore, MatchFinishResult, MatchCorrection, MatchFilter, MatchBulkCreateResult,
+)
 from src.predictions.base import BasePredictionService
-from src.predictions.schemas import PredictionCreate, PredictionUpdate, PredictionRead
+from src.predictions.schemas import (
+    PredictionCreate, PredictionUpdate, PredictionRead, PredictionStats, ScoreCount,
+    PredictionBulkResult, PredictionItemResult, PredictionItemStatus, Consensus, UserPredictions, CrowdPrediction,
+)
+from src.scoring.base import BaseScoringService
+from src.scoring.schemas import WhatIf, ProjectedLeaderboard, ProjectedStanding, FinishingChances, ChanceStanding
 from tests.utils import gen_matches, MatchModel, EventModel, UserModel, PredictionModel
 
 
@@ -362,6 +373,29 @@ def fake_get_match_service(
                 new_match = MatchModel(**match.dict(), event_id=event_id)
                 return MatchRead.from_orm(new_match)
 
+            async def create_multiple(self, matches: list[MatchCreate], event_id: int) -> MatchBulkCreateResult:
+                event = await self._get_event_by_id(event_id=event_id)
+
+                if event is None:
+                    raise exceptions.EventNotFound
+
+                if event.status != EventStatus.created:
+                    raise exceptions.UnexpectedEventStatus
+
+                capacity = settings.MATCHES_COUNT - len(event.matches)
+
+                if matches and capacity <= 0:
+                    raise exceptions.MatchesLimitError
+
+                unique = {}
+                for match in matches:
+                    unique.setdefault((match.home_team, match.away_team, match.start_time), match)
+
+                created = [
+                    MatchRead.from_orm(MatchModel(**match.dict(), event_id=event_id)) for match in unique.values()
+                ][:capacity]
+                return MatchBulkCreateResult(matches=created, skipped=len(matches) - len(created))
+
             async def finish(self, match_id: int, home_goals: int, away_goals: int) -> MatchRead:
                 match = await self._get_match_by_id(match_id=match_id)
 
@@ -393,6 +427,55 @@ def fake_get_match_service(
                 else:
                     return None
 
+            async def get_multiple(
+                    self, filters: MatchFilter, after: tuple[datetime, int] | None = None, limit: int = 100,
+            ) -> list[MatchRead]:
+                matches = sorted(self.matches, key=lambda match: (match.start_time, match.id))
+
+                if filters.team is not None:
+                    matches = [match for match in matches if filters.team in (match.home_team, match.away_team)]
+                if filters.status is not None:
+                    matches = [match for match in matches if match.status == filters.status]
+                if after is not None:
+                    matches = [match for match in matches if (match.start_time, match.id) > after]
+
+                return [MatchRead.from_orm(match) for match in matches[:limit]]
+
+            async def correct(self, match_id: int, home_goals: int, away_goals: int) -> MatchCorrection:
+                match = await self._get_match_by_id(match_id=match_id)
+
+                if match is None:
+                    raise exceptions.MatchNotFound
+
+                if match.status != MatchStatus.completed:
+                    raise exceptions.UnexpectedMatchStatus
+
+                match_scheme = MatchRead.from_orm(match)
+                match_scheme.home_goals = home_goals
+                match_scheme.away_goals = away_goals
+                return MatchCorrection(match=match_scheme, deltas=[])
+
+            async def finish_multiple(self, event_id: int, scores: list[MatchScore]) -> list[MatchFinishResult]:
+                results = []
+
+                for score in scores:
+                    match = await self._get_match_by_id(match_id=score.match_id)
+
+                    if match is None or match.event_id != event_id:
+                        results.append(MatchFinishResult(match_id=score.match_id, status='not_found'))
+                    elif match.status == MatchStatus.completed:
+                        results.append(MatchFinishResult(match_id=score.match_id, status='already_completed'))
+                    else:
+                        match_scheme = MatchRead.from_orm(match)
+                        match_scheme.home_goals = score.home_goals
+                        match_scheme.away_goals = score.away_goals
+                        match_scheme.status = MatchStatus.completed
+                        results.append(
+                            MatchFinishResult(match_id=score.match_id, status='finished', match=match_scheme)
+                        )
+
+                return results
+
             async def _get_match_by_id(self, match_id: int) -> MatchModel | None:
                 for match in self.matches:
                     if match.id == match_id:
@@ -465,6 +548,32 @@ def fake_get_prediction_service(
 
                 return PredictionRead.from_orm(prediction)
 
+            async def upsert_multiple(
+                    self, event_id: int, predictions: Sequence[PredictionCreate], user_id: UUID,
+            ) -> PredictionBulkResult:
+                items = []
+
+                for prediction in predictions:
+                    match = await self._get_match_by_id(match_id=prediction.match_id)
+
+                    if match is None or match.event_id != event_id:
+                        item_status = PredictionItemStatus.match_not_found
+                    elif match.status != MatchStatus.upcoming:
+                        item_status = PredictionItemStatus.locked
+                    else:
+                        item_status = PredictionItemStatus.saved
+                    items.append(PredictionItemResult(match_id=prediction.match_id, status=item_status))
+
+                match_ids = [match.id for match in self.matches if match.event_id == event_id]
+
+                return PredictionBulkResult(
+                    items=items,
+                    predictions=[
+                        PredictionRead.from_orm(predict) for predict in self.predictions
+                        if predict.user_id == user_id and predict.match_id in match_ids
+                    ],
+                )
+
             async def update(self, prediction_id: int, prediction: PredictionUpdate, user_id: UUID) -> PredictionRead:
                 predict = await self._get_prediction_by_id(prediction_id=prediction_id)
 
@@ -487,6 +596,69 @@ def fake_get_prediction_service(
                 prediction_scheme.away_goals = prediction.away_goals
                 return prediction_scheme
 
+            async def get_match_stats(self, match_id: int) -> PredictionStats:
+                if await self._get_match_by_id(match_id=match_id) is None:
+                    raise exceptions.MatchNotFound
+
+                return self._stats(match_id=match_id)
+
+            def _stats(self, match_id: int) -> PredictionStats:
+                predictions = [predict for predict in self.predictions if predict.match_id == match_id]
+
+                return PredictionStats(
+                    match_id=match_id,
+                    total=len(predictions),
+                    home_win=len([predict for predict in predictions if predict.home_goals > predict.away_goals]),
+                    draw=len([predict for predict in predictions if predict.home_goals == predict.away_goals]),
+                    away_win=len([predict for predict in predictions if predict.home_goals < predict.away_goals]),
+                    scores=[
+                        ScoreCount(home_goals=predict.home_goals, away_goals=predict.away_goals, count=1)
+                        for predict in predictions
+                    ],
+                )
+
+            async def get_match_consensus(
+                    self, match_id: int, user_id: UUID, offset: int = 0, limit: int = 100,
+            ) -> Consensus:
+                match = await self._get_match_by_id(match_id=match_id)
+
+                if match is None:
+                    raise exceptions.MatchNotFound
+
+                if match.status == MatchStatus.upcoming:
+                    raise exceptions.PredictionsAreOpen
+
+                return await self._consensus([match], user_id=user_id, offset=offset, limit=limit)
+
+            async def get_event_consensus(
+                    self, event_id: int, user_id: UUID, offset: int = 0, limit: int = 100,
+            ) -> Consensus:
+                event = await self._get_event_by_id(event_id=event_id)
+
+                if event is None:
+                    raise exceptions.EventNotFound
+
+                if event.status in (EventStatus.created, EventStatus.upcoming):
+                    raise exceptions.PredictionsAreOpen
+
+                return await self._consensus(event.matches, user_id=user_id, offset=offset, limit=limit)
+
+            async def _consensus(
+                    self, matches: list[MatchModel], user_id: UUID, offset: int, limit: int,
+            ) -> Consensus:
+                # every user predicted a draw of every match
+                predictions = [
+                    UserPredictions(user_id=user.id, predictions=[
+                        CrowdPrediction(match_id=match.id, home_goals=1, away_goals=1, points=None) for match in matches
+                    ])
+                    for user in sorted(self.users, key=lambda user: user.id) if user.id != user_id
+                ]
+                return Consensus(
+                    matches=[self._stats(match_id=match.id) for match in matches],
+                    participants=len(self.users),
+                    predictions=predictions[offset:offset + limit],
+                )
+
             async def _get_match_by_id(self, match_id: int) -> MatchModel | None:
                 for match in self.matches:
                     if match.id == match_id:
@@ -520,6 +692,152 @@ def fake_get_prediction_service(
     return _fake_get_prediction_service
 
 
+@pytest.fixture(scope='session')
+def fake_get_leaderboard_service(active_user: UserModel, superuser: UserModel, ongoing_event: EventModel):
+    def _fake_get_leaderboard_service() -> BaseLeaderboardService:
+        class MockLeaderboardService(BaseLeaderboardService):
+            standings = sorted(
+                [
+                    StandingRead(user_id=active_user.id, points=7, exact_hits=2, outcome_hits=1),
+                    StandingRead(user_id=superuser.id, points=4, exact_hits=1, outcome_hits=1),
+                ],
+                key=lambda standing: (-standing.points, standing.user_id),
+            )
+
+            async def get_event_leaderboard(
+                    self, event_id: int, after: tuple[int, UUID] | None = None, limit: int = 100,
+            ) -> list[StandingRead]:
+                if event_id != ongoing_event.id:
+                    raise exceptions.EventNotFound
+
+                standings = self.standings
+                if after is not None:
+                    points, user_id = after
+                    standings = [
+                        standing for standing in standings
+                        if (-standing.points, standing.user_id) > (-points, user_id)
+                    ]
+
+                return standings[:limit]
+
+            async def get_global_leaderboard(self, offset: int = 0, limit: int = 100) -> list[RankedStanding]:
+                return [
+                    RankedStanding(rank=position + 1, user_id=standing.user_id, points=standing.points)
+                    for position, standing in enumerate(self.standings)
+                ][offset:offset + limit]
+
+            async def get_event_rank(self, event_id: int, user_id: UUID, window: int = 5) -> UserRank:
+                if event_id != ongoing_event.id:
+                    raise exceptions.EventNotFound
+                return await self.get_global_rank(user_id=user_id, window=window)
+
+            async def get_global_rank(self, user_id: UUID, window: int = 5) -> UserRank:
+                leaderboard = await self.get_global_leaderboard()
+                position = next((i for i, standing in enumerate(leaderboard) if standing.user_id == user_id), None)
+                if position is None:
+                    raise exceptions.StandingNotFound
+
+                return UserRank(
+                    rank=leaderboard[position].rank,
+                    points=leaderboard[position].points,
+                    standings=leaderboard[max(position - window, 0):position + window + 1],
+                )
+
+        yield MockLeaderboardService()
+
+    return _fake_get_leaderboard_service
+
+
+@pytest.fixture(scope='session')
+def fake_get_league_service(active_user: UserModel, superuser: UserModel, ongoing_event: EventModel):
+    def _fake_get_league_service() -> BaseLeagueService:
+        class MockLeagueService(BaseLeagueService):
+            league = LeagueRead(id=1, name='Office', owner_id=active_user.id, invite_code='office-code', member_count=1)
+
+            async def get_multiple(self, user_id: UUID) -> list[LeagueRead]:
+                return [self.league] if user_id == active_user.id else []
+
+            async def create(self, league: LeagueCreate, user_id: UUID) -> LeagueRead:
+                return LeagueRead(id=2, name=league.name, owner_id=user_id, invite_code='new-code', member_count=1)
+
+            async def join(self, invite_code: str, user_id: UUID) -> LeagueRead:
+                if invite_code != self.league.invite_code:
+                    raise exceptions.LeagueNotFound
+                return self.league.copy(update={'member_count': 2})
+
+            async def get_standings(
+                    self,
+                    league_id: int,
+                    user_id: UUID,
+                    event_id: int | None = None,
+                    after: tuple[int, UUID] | None = None,
+                    limit: int = 100,
+            ) -> list[StandingRead]:
+                if league_id != self.league.id:
+                    raise exceptions.LeagueNotFound
+                if user_id != active_user.id:
+                    raise exceptions.UserIsNotAllowed
+                if event_id is not None and event_id != ongoing_event.id:
+                    raise exceptions.EventNotFound
+
+                return [StandingRead(user_id=active_user.id, points=7, exact_hits=2, outcome_hits=1)][:limit]
+
+        yield MockLeagueService()
+
+    return _fake_get_league_service
+
+
+@pytest.fixture(scope='session')
+def fake_get_scoring_service(active_user: UserModel, superuser: UserModel, ongoing_event: EventModel):
+    def _fake_get_scoring_service() -> BaseScoringService:
+        class MockScoringService(BaseScoringService):
+            remaining_match_ids = {11, 12}
+
+            async def get_what_if_leaderboard(
+                    self, event_id: int, what_if: WhatIf, user_id: UUID, offset: int = 0, limit: int = 100,
+            ) -> ProjectedLeaderboard:
+                if event_id != ongoing_event.id:
+                    raise exceptions.EventNotFound
+                if any(score.match_id not in self.remaining_match_ids for score in what_if.scores):
+                    raise exceptions.UnexpectedMatchStatus
+
+                bonus = 3 * len(what_if.scores)
+                standings = [
+                    ProjectedStanding(rank=1, user_id=active_user.id, points=7 + bonus, current_points=7),
+                    ProjectedStanding(rank=2, user_id=superuser.id, points=4, current_points=4),
+                ]
+                return ProjectedLeaderboard(
+                    participants=len(standings),
+                    standings=standings[offset:offset + limit],
+                    user=next((standing for standing in standings if standing.user_id == user_id), None),
+                )
+
+            async def get_finishing_chances(
+                    self, event_id: int, user_id: UUID, offset: int = 0, limit: int = 100,
+            ) -> FinishingChances:
+                if event_id != ongoing_event.id:
+                    raise exceptions.EventNotFound
+
+                standings = [
+                    ChanceStanding(
+                        user_id=active_user.id, points=7, win_probability=0.75, podium_probability=1, average_rank=1.25,
+                    ),
+                    ChanceStanding(
+                        user_id=superuser.id, points=4, win_probability=0.25, podium_probability=1, average_rank=1.75,
+                    ),
+                ]
+                return FinishingChances(
+                    simulations=1000,
+                    participants=len(standings),
+                    standings=standings[offset:offset + limit],
+                    user=next((standing for standing in standings if standing.user_id == user_id), None),
+                )
+
+        yield MockScoringService()
+
+    return _fake_get_scoring_service
+
+
 reusable_oauth2 = OAuth2(
     flows={
         "password": {
@@ -94,6 +94,29 @@ class TestGetByID:
         assert data['name'] == upcoming_event.name
 
 
+@pytest.mark.asyncio
+class TestGetLockStats:
+    async def test_active_user_has_not_access(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get('/events/locks/stats', headers={'Authorization': active_user.email})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_superuser_has_access(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.get('/events/locks/stats', headers={'Authorization': superuser.email})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.json()) == {'acquired', 'contended', 'timeouts', 'wait_seconds', 'max_wait_seconds'}
+
+
+@pytest.mark.asyncio
+class TestStreamEvent:
+    async def test_event_not_found(self, async_client: AsyncClient) -> None:
+        response = await async_client.get('/events/987/stream')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+
 @pytest.mark.asyncio
 class TestCreateEvent:
     async def test_missing_token(
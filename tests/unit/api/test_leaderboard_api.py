@@ -0,0 +1,161 @@
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from src.auth.dependencies import get_current_user
+from src.leaderboard.dependencies import get_leaderboard_service
+from src.leaderboard.router import router as leaderboard_router
+from tests.utils import EventModel, UserModel
+
+
+@pytest.fixture
+def app_factory():
+    def _app_factory() -> FastAPI:
+        app = FastAPI()
+        app.include_router(leaderboard_router, prefix='', tags=['Leaderboard'])
+
+        return app
+
+    return _app_factory
+
+
+@pytest_asyncio.fixture
+async def async_client(
+        get_test_client, app_factory, fake_get_current_user, fake_get_leaderboard_service
+) -> AsyncGenerator[AsyncClient, None]:
+    app = app_factory()
+    app.dependency_overrides[get_leaderboard_service] = fake_get_leaderboard_service
+    app.dependency_overrides[get_current_user] = fake_get_current_user
+
+    async for client in get_test_client(app):
+        yield client
+
+
+@pytest.mark.asyncio
+class TestGetEventLeaderboard:
+    async def test_missing_token(self, async_client: AsyncClient, ongoing_event: EventModel) -> None:
+        response = await async_client.get(f'/events/{ongoing_event.id}/leaderboard')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_event_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get('/events/987/leaderboard', headers={'Authorization': active_user.email})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+    async def test_leaderboard(
+            self, async_client: AsyncClient, active_user: UserModel, superuser: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/events/{ongoing_event.id}/leaderboard', headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [standing['user_id'] for standing in response.json()] == [str(active_user.id), str(superuser.id)]
+        assert response.json()[0] == {
+            'user_id': str(active_user.id), 'points': 7, 'exact_hits': 2, 'outcome_hits': 1,
+        }
+
+    async def test_next_page(
+            self, async_client: AsyncClient, active_user: UserModel, superuser: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/events/{ongoing_event.id}/leaderboard',
+            params={'after_points': 7, 'after_user_id': str(active_user.id), 'limit': 1},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [standing['user_id'] for standing in response.json()] == [str(superuser.id)]
+
+    async def test_incomplete_page_key(
+            self, async_client: AsyncClient, active_user: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/events/{ongoing_event.id}/leaderboard',
+            params={'after_points': 7},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+class TestGetGlobalLeaderboard:
+    async def test_missing_token(self, async_client: AsyncClient) -> None:
+        response = await async_client.get('/leaderboard')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_leaderboard(self, async_client: AsyncClient, active_user: UserModel, superuser: UserModel) -> None:
+        response = await async_client.get(
+            '/leaderboard', params={'offset': 1}, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{'rank': 2, 'user_id': str(superuser.id), 'points': 4}]
+
+    async def test_invalid_limit(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/leaderboard', params={'limit': 0}, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+class TestGetGlobalRank:
+    async def test_missing_token(self, async_client: AsyncClient) -> None:
+        response = await async_client.get('/leaderboard/me')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_rank(self, async_client: AsyncClient, active_user: UserModel, superuser: UserModel) -> None:
+        response = await async_client.get('/leaderboard/me', headers={'Authorization': superuser.email})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'rank': 2,
+            'points': 4,
+            'standings': [
+                {'rank': 1, 'user_id': str(active_user.id), 'points': 7},
+                {'rank': 2, 'user_id': str(superuser.id), 'points': 4},
+            ],
+        }
+
+    async def test_invalid_window(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/leaderboard/me', params={'window': -1}, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+class TestGetEventRank:
+    async def test_missing_token(self, async_client: AsyncClient, ongoing_event: EventModel) -> None:
+        response = await async_client.get(f'/events/{ongoing_event.id}/leaderboard/me')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_event_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get('/events/987/leaderboard/me', headers={'Authorization': active_user.email})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+    async def test_window(self, async_client: AsyncClient, active_user: UserModel, ongoing_event: EventModel) -> None:
+        response = await async_client.get(
+            f'/events/{ongoing_event.id}/leaderboard/me',
+            params={'window': 0},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['rank'] == 1
+        assert [standing['user_id'] for standing in response.json()['standings']] == [str(active_user.id)]
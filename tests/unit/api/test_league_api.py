@@ -0,0 +1,121 @@
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from src.auth.dependencies import get_current_user
+from src.leagues.dependencies import get_league_service
+from src.leagues.router import router as league_router
+from tests.utils import EventModel, UserModel
+
+
+@pytest.fixture
+def app_factory():
+    def _app_factory() -> FastAPI:
+        app = FastAPI()
+        app.include_router(league_router, prefix='/leagues', tags=['Leagues'])
+
+        return app
+
+    return _app_factory
+
+
+@pytest_asyncio.fixture
+async def async_client(
+        get_test_client, app_factory, fake_get_current_user, fake_get_league_service
+) -> AsyncGenerator[AsyncClient, None]:
+    app = app_factory()
+    app.dependency_overrides[get_league_service] = fake_get_league_service
+    app.dependency_overrides[get_current_user] = fake_get_current_user
+
+    async for client in get_test_client(app):
+        yield client
+
+
+@pytest.mark.asyncio
+class TestLeagues:
+    async def test_missing_token(self, async_client: AsyncClient) -> None:
+        response = await async_client.get('/leagues')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_my_leagues(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get('/leagues', headers={'Authorization': active_user.email})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [league['name'] for league in response.json()] == ['Office']
+
+    async def test_create(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.post(
+            '/leagues', json={'name': 'Pub'}, headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()['owner_id'] == str(superuser.id)
+
+    async def test_create_with_long_name(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.post(
+            '/leagues', json={'name': 'x' * 129}, headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_join(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.post(
+            '/leagues/join', json={'invite_code': 'office-code'}, headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['member_count'] == 2
+
+    async def test_join_with_invalid_code(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.post(
+            '/leagues/join', json={'invite_code': 'nope'}, headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'League not found'
+
+
+@pytest.mark.asyncio
+class TestGetStandings:
+    async def test_standings(
+            self, async_client: AsyncClient, active_user: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.get(
+            '/leagues/1/standings',
+            params={'event_id': ongoing_event.id},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{'user_id': str(active_user.id), 'points': 7, 'exact_hits': 2, 'outcome_hits': 1}]
+
+    async def test_not_a_member(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.get('/leagues/1/standings', headers={'Authorization': superuser.email})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_league_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get('/leagues/987/standings', headers={'Authorization': active_user.email})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'League not found'
+
+    async def test_event_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/leagues/1/standings', params={'event_id': 987}, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+    async def test_incomplete_page_key(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/leagues/1/standings', params={'after_points': 7}, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
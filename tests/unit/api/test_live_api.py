@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from src.core.config import settings
+from src.live.dependencies import get_live_hub
+from src.live.hub import LiveHub
+from src.live.router import router as live_router
+from src.matches.schemas import MatchRead
+from tests.utils import MatchModel
+
+
+@pytest.fixture
+def hub() -> LiveHub:
+    return LiveHub()
+
+
+@pytest.fixture
+def client(hub: LiveHub) -> TestClient:
+    app = FastAPI()
+    app.include_router(live_router, prefix='/live', tags=['Live'])
+
+    async def _fake_get_live_hub():
+        yield hub
+
+    app.dependency_overrides[get_live_hub] = _fake_get_live_hub
+
+    with TestClient(app) as client:
+        yield client
+
+
+class TestLiveScores:
+    def test_subscribe_and_receive_update(self, client: TestClient, hub: LiveHub, upcoming_match: MatchModel) -> None:
+        with client.websocket_connect('/live/ws') as websocket:
+            websocket.send_text(json.dumps({'action': 'subscribe', 'event_id': upcoming_match.event_id}))
+
+            assert json.loads(websocket.receive_bytes()) == {
+                'action': 'subscribe', 'event_id': upcoming_match.event_id,
+            }
+            assert hub.subscribers_count(event_id=upcoming_match.event_id) == 1
+
+            async def publish() -> None:
+                hub.publish(
+                    event_id=upcoming_match.event_id,
+                    kind='match',
+                    key=f'match:{upcoming_match.id}',
+                    data=MatchRead.from_orm(upcoming_match),
+                )
+
+            websocket.portal.call(publish)
+            message = json.loads(websocket.receive_bytes())
+
+            assert message['type'] == 'match'
+            assert message['data']['id'] == upcoming_match.id
+
+    def test_unsubscribe(self, client: TestClient, hub: LiveHub) -> None:
+        with client.websocket_connect('/live/ws') as websocket:
+            websocket.send_text(json.dumps({'action': 'subscribe', 'event_id': 1}))
+            websocket.receive_bytes()
+            websocket.send_text(json.dumps({'action': 'unsubscribe', 'event_id': 1}))
+
+            assert json.loads(websocket.receive_bytes()) == {'action': 'unsubscribe', 'event_id': 1}
+            assert hub.subscribers_count(event_id=1) == 0
+
+    def test_invalid_command(self, client: TestClient) -> None:
+        with client.websocket_connect('/live/ws') as websocket:
+            websocket.send_text('{"action": "dance"}')
+
+            assert json.loads(websocket.receive_bytes()) == {'action': 'error', 'detail': 'Invalid command'}
+
+    def test_binary_command(self, client: TestClient) -> None:
+        with client.websocket_connect('/live/ws') as websocket:
+            websocket.send_bytes(json.dumps({'action': 'subscribe', 'event_id': 1}).encode())
+
+            assert json.loads(websocket.receive_bytes()) == {'action': 'error', 'detail': 'Invalid command'}
+
+            websocket.send_text(json.dumps({'action': 'subscribe', 'event_id': 1}))
+
+            assert json.loads(websocket.receive_bytes()) == {'action': 'subscribe', 'event_id': 1}
+
+    def test_too_many_subscriptions(self, client: TestClient, hub: LiveHub) -> None:
+        with client.websocket_connect('/live/ws') as websocket:
+            for event_id in range(settings.LIVE_MAX_SUBSCRIPTIONS):
+                websocket.send_text(json.dumps({'action': 'subscribe', 'event_id': event_id}))
+                websocket.receive_bytes()
+
+            websocket.send_text(json.dumps({'action': 'subscribe', 'event_id': 987}))
+
+            assert json.loads(websocket.receive_bytes()) == {'action': 'error', 'detail': 'Too many subscriptions'}
+            assert hub.subscribers_count(event_id=987) == 0
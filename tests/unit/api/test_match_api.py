@@ -9,6 +9,7 @@ from starlette import status
 from src.auth.dependencies import get_current_user
 from src.core.config import settings
 from src.matches.dependencies import get_match_service
+from src.matches.models import MatchStatus
 from src.matches.router import router as match_router
 from tests.utils import EventModel, UserModel, MatchModel
 
@@ -36,6 +37,33 @@ async def async_client(
         yield client
 
 
+@pytest.mark.asyncio
+class TestGetMatches:
+    async def test_filter_by_team_and_status(self, async_client: AsyncClient, completed_match: MatchModel) -> None:
+        response = await async_client.get('/matches', params={'team': 'Hull City', 'status': MatchStatus.completed})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [match['id'] for match in response.json()] == [completed_match.id]
+
+    async def test_keyset_pagination(self, async_client: AsyncClient) -> None:
+        first_page = (await async_client.get('/matches', params={'team': 'Swansea', 'limit': 2})).json()
+        last = first_page[-1]
+
+        response = await async_client.get(
+            '/matches', params={'team': 'Swansea', 'after_start_time': last['start_time'], 'after_id': last['id']},
+        )
+        second_page = response.json()
+
+        assert len(first_page) == 2
+        assert len(second_page) == 1
+        assert second_page[0]['id'] not in [match['id'] for match in first_page]
+
+    async def test_incomplete_keyset(self, async_client: AsyncClient) -> None:
+        response = await async_client.get('/matches', params={'after_id': 1})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.asyncio
 class TestCreateMatch:
     json = {
@@ -129,6 +157,73 @@ class TestCreateMatch:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+@pytest.mark.asyncio
+class TestCreateMatches:
+    json = [
+        {'home_team': 'Atalanta', 'away_team': 'Bari', 'start_time': '2023-09-20 10:27:21.240752'},
+        {'home_team': 'Cagliari', 'away_team': 'Empoli', 'start_time': '2023-09-20 12:27:21.240752'},
+    ]
+
+    async def test_active_user_has_not_access(
+            self, async_client: AsyncClient, active_user: UserModel, created_event: EventModel,
+    ) -> None:
+        response = await async_client.post(
+            f'/events/{created_event.id}/matches/bulk',
+            json=self.json,
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_superuser_has_access(
+            self, async_client: AsyncClient, superuser: UserModel, event_without_matches: EventModel,
+    ) -> None:
+        response = await async_client.post(
+            f'/events/{event_without_matches.id}/matches/bulk',
+            json=self.json,
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [match['home_team'] for match in response.json()['matches']] == ['Atalanta', 'Cagliari']
+        assert response.json()['skipped'] == 0
+
+    async def test_duplicated_row(
+            self, async_client: AsyncClient, superuser: UserModel, event_without_matches: EventModel,
+    ) -> None:
+        response = await async_client.post(
+            f'/events/{event_without_matches.id}/matches/bulk',
+            json=[*self.json, self.json[0]],
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [match['home_team'] for match in response.json()['matches']] == ['Atalanta', 'Cagliari']
+        assert response.json()['skipped'] == 1
+
+    async def test_event_already_has_limit_of_matches(
+            self, async_client: AsyncClient, superuser: UserModel, created_event: EventModel,
+    ) -> None:
+        response = await async_client.post(
+            f'/events/{created_event.id}/matches/bulk',
+            json=self.json,
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['detail'] == f'Event already has {settings.MATCHES_COUNT} matches'
+
+    async def test_event_not_found(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.post(
+            '/events/987/matches/bulk',
+            json=self.json,
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+
 @pytest.mark.asyncio
 class TestFinishMatch:
     async def test_missing_token(self, async_client: AsyncClient, ongoing_match: MatchModel) -> None:
@@ -186,6 +281,113 @@ class TestFinishMatch:
         assert response.json()['detail'] == 'Match is already completed'
 
 
+@pytest.mark.asyncio
+class TestFinishMatches:
+    async def test_active_user_has_not_access(
+            self, async_client: AsyncClient, active_user: UserModel, ongoing_match: MatchModel
+    ) -> None:
+        response = await async_client.patch(
+            f'/events/{ongoing_match.event_id}/matches/finish',
+            json=[{'match_id': ongoing_match.id, 'home_goals': 1, 'away_goals': 0}],
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_results_are_reported_per_match(
+            self,
+            async_client: AsyncClient,
+            superuser: UserModel,
+            ongoing_match: MatchModel,
+            completed_match: MatchModel,
+    ) -> None:
+        response = await async_client.patch(
+            f'/events/{ongoing_match.event_id}/matches/finish',
+            json=[
+                {'match_id': ongoing_match.id, 'home_goals': 1, 'away_goals': 0},
+                {'match_id': completed_match.id, 'home_goals': 1, 'away_goals': 0},
+                {'match_id': 987, 'home_goals': 1, 'away_goals': 0},
+            ],
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result['status'] for result in response.json()] == ['finished', 'already_completed', 'not_found']
+        assert response.json()[0]['match']['home_goals'] == 1
+
+    async def test_invalid_goals(
+            self, async_client: AsyncClient, superuser: UserModel, ongoing_match: MatchModel
+    ) -> None:
+        response = await async_client.patch(
+            f'/events/{ongoing_match.event_id}/matches/finish',
+            json=[{'match_id': ongoing_match.id, 'home_goals': -1, 'away_goals': 0}],
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_empty_scores(
+            self, async_client: AsyncClient, superuser: UserModel, ongoing_match: MatchModel
+    ) -> None:
+        response = await async_client.patch(
+            f'/events/{ongoing_match.event_id}/matches/finish',
+            json=[],
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+class TestCorrectMatch:
+    async def test_active_user_has_not_access(
+            self, async_client: AsyncClient, active_user: UserModel, completed_match: MatchModel
+    ) -> None:
+        response = await async_client.patch(
+            f'/matches/{completed_match.id}/correct',
+            params={'home_goals': 2, 'away_goals': 2},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_superuser_has_access(
+            self, async_client: AsyncClient, completed_match: MatchModel, superuser: UserModel
+    ) -> None:
+        response = await async_client.patch(
+            f'/matches/{completed_match.id}/correct',
+            params={'home_goals': 2, 'away_goals': 2},
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['match']['home_goals'] == 2
+        assert response.json()['match']['away_goals'] == 2
+        assert response.json()['deltas'] == []
+
+    async def test_match_not_found(self, async_client: AsyncClient, superuser: UserModel) -> None:
+        response = await async_client.patch(
+            '/matches/987/correct',
+            params={'home_goals': 2, 'away_goals': 2},
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Match not found'
+
+    async def test_match_is_not_completed(
+            self, async_client: AsyncClient, ongoing_match: MatchModel, superuser: UserModel
+    ) -> None:
+        response = await async_client.patch(
+            f'/matches/{ongoing_match.id}/correct',
+            params={'home_goals': 2, 'away_goals': 2},
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['detail'] == 'Match is not completed yet'
+
+
 @pytest.mark.asyncio
 class TestDeleteMatch:
     async def test_missing_token(self, async_client: AsyncClient, ongoing_match: MatchModel) -> None:
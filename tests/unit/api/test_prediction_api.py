@@ -7,6 +7,7 @@ from httpx import AsyncClient
 from starlette import status
 
 from src.auth.dependencies import get_current_user
+from src.core.config import settings
 from src.matches.models import MatchStatus
 from src.predictions.dependencies import get_prediction_service
 from src.predictions.router import router as prediction_router
@@ -157,6 +158,53 @@ class TestCreatePrediction:
         assert response.json()['detail'] == 'The match has already started'
 
 
+@pytest.mark.asyncio
+class TestUpsertPredictions:
+    async def test_missing_token(self, async_client: AsyncClient, upcoming_match: MatchModel) -> None:
+        json = [{'home_goals': 2, 'away_goals': 2, 'match_id': upcoming_match.id}]
+
+        response = await async_client.put(f'/predictions/events/{upcoming_match.event_id}', json=json)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_too_many_predictions(
+            self, async_client: AsyncClient, active_user: UserModel, upcoming_match: MatchModel,
+    ) -> None:
+        json = [{'home_goals': 2, 'away_goals': 2, 'match_id': upcoming_match.id}] * (settings.MATCHES_COUNT + 1)
+
+        response = await async_client.put(
+            f'/predictions/events/{upcoming_match.event_id}', json=json, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_item_statuses(
+            self,
+            async_client: AsyncClient,
+            active_user: UserModel,
+            prediction1: PredictionModel,
+            upcoming_match: MatchModel,
+            ongoing_match: MatchModel,
+    ) -> None:
+        json = [
+            {'home_goals': 2, 'away_goals': 2, 'match_id': upcoming_match.id},
+            {'home_goals': 0, 'away_goals': 0, 'match_id': ongoing_match.id},
+            {'home_goals': 1, 'away_goals': 0, 'match_id': 987},
+        ]
+
+        response = await async_client.put(
+            f'/predictions/events/{upcoming_match.event_id}', json=json, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['items'] == [
+            {'match_id': upcoming_match.id, 'status': 'saved'},
+            {'match_id': ongoing_match.id, 'status': 'locked'},
+            {'match_id': 987, 'status': 'match_not_found'},
+        ]
+        assert [prediction['id'] for prediction in response.json()['predictions']] == [prediction1.id]
+
+
 @pytest.mark.asyncio
 class TestUpdatePrediction:
     async def test_missing_token(self, async_client: AsyncClient, prediction1: PredictionModel) -> None:
@@ -286,3 +334,111 @@ class TestUpdatePrediction:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.json()['detail'] == 'The match has already started'
+
+
+@pytest.mark.asyncio
+class TestGetMatchStats:
+    async def test_missing_token(self, async_client: AsyncClient, upcoming_match: MatchModel) -> None:
+        response = await async_client.get(f'/predictions/matches/{upcoming_match.id}/stats')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_get_stats(
+            self,
+            async_client: AsyncClient,
+            active_user: UserModel,
+            upcoming_match: MatchModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/predictions/matches/{upcoming_match.id}/stats',
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['match_id'] == upcoming_match.id
+        assert response.json()['total'] == 2
+        assert response.json()['home_win'] == 2
+
+    async def test_match_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/predictions/matches/987/stats', headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Match not found'
+
+
+@pytest.mark.asyncio
+class TestGetMatchConsensus:
+    async def test_missing_token(self, async_client: AsyncClient, ongoing_match: MatchModel) -> None:
+        response = await async_client.get(f'/predictions/matches/{ongoing_match.id}/consensus')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_match_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/predictions/matches/987/consensus', headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Match not found'
+
+    async def test_open_match(
+            self, async_client: AsyncClient, active_user: UserModel, upcoming_match2: MatchModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/predictions/matches/{upcoming_match2.id}/consensus', headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()['detail'] == 'The match is not locked yet'
+
+    async def test_get_consensus(
+            self, async_client: AsyncClient, active_user: UserModel, superuser: UserModel, ongoing_match: MatchModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/predictions/matches/{ongoing_match.id}/consensus', headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['participants'] == 2
+        assert [stats['match_id'] for stats in response.json()['matches']] == [ongoing_match.id]
+        assert response.json()['predictions'] == [{
+            'user_id': str(superuser.id),
+            'predictions': [{'match_id': ongoing_match.id, 'home_goals': 1, 'away_goals': 1, 'points': None}],
+        }]
+
+    async def test_invalid_limit(
+            self, async_client: AsyncClient, active_user: UserModel, ongoing_match: MatchModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/predictions/matches/{ongoing_match.id}/consensus',
+            params={'limit': 0},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+class TestGetEventConsensus:
+    async def test_event_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/predictions/events/987/consensus', headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+    async def test_get_consensus(
+            self, async_client: AsyncClient, superuser: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.get(
+            f'/predictions/events/{ongoing_event.id}/consensus',
+            params={'offset': 1},
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()['matches']) == len(ongoing_event.matches)
+        assert response.json()['predictions'] == []
@@ -0,0 +1,122 @@
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import AsyncClient
+from starlette import status
+
+from src.auth.dependencies import get_current_user
+from src.scoring.dependencies import get_scoring_service
+from src.scoring.router import router as scoring_router
+from tests.utils import EventModel, UserModel
+
+
+@pytest.fixture
+def app_factory():
+    def _app_factory() -> FastAPI:
+        app = FastAPI()
+        app.include_router(scoring_router, prefix='', tags=['Leaderboard'])
+
+        return app
+
+    return _app_factory
+
+
+@pytest_asyncio.fixture
+async def async_client(
+        get_test_client, app_factory, fake_get_current_user, fake_get_scoring_service
+) -> AsyncGenerator[AsyncClient, None]:
+    app = app_factory()
+    app.dependency_overrides[get_scoring_service] = fake_get_scoring_service
+    app.dependency_overrides[get_current_user] = fake_get_current_user
+
+    async for client in get_test_client(app):
+        yield client
+
+
+@pytest.mark.asyncio
+class TestGetWhatIfLeaderboard:
+    async def test_missing_token(self, async_client: AsyncClient, ongoing_event: EventModel) -> None:
+        response = await async_client.post(f'/events/{ongoing_event.id}/leaderboard/what-if', json={'scores': []})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_event_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.post(
+            '/events/987/leaderboard/what-if', json={'scores': []}, headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+    async def test_completed_match(
+            self, async_client: AsyncClient, active_user: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.post(
+            f'/events/{ongoing_event.id}/leaderboard/what-if',
+            json={'scores': [{'match_id': 10, 'home_goals': 1, 'away_goals': 0}]},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_invalid_score(
+            self, async_client: AsyncClient, active_user: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.post(
+            f'/events/{ongoing_event.id}/leaderboard/what-if',
+            json={'scores': [{'match_id': 11, 'home_goals': -1, 'away_goals': 0}]},
+            headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_projected_leaderboard(
+            self, async_client: AsyncClient, active_user: UserModel, superuser: UserModel, ongoing_event: EventModel,
+    ) -> None:
+        response = await async_client.post(
+            f'/events/{ongoing_event.id}/leaderboard/what-if',
+            params={'limit': 1},
+            json={'scores': [{'match_id': 11, 'home_goals': 1, 'away_goals': 0}]},
+            headers={'Authorization': superuser.email},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'participants': 2,
+            'standings': [{'rank': 1, 'user_id': str(active_user.id), 'points': 10, 'current_points': 7}],
+            'user': {'rank': 2, 'user_id': str(superuser.id), 'points': 4, 'current_points': 4},
+        }
+
+
+@pytest.mark.asyncio
+class TestGetFinishingChances:
+    async def test_missing_token(self, async_client: AsyncClient, ongoing_event: EventModel) -> None:
+        response = await async_client.get(f'/events/{ongoing_event.id}/leaderboard/chances')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    async def test_event_not_found(self, async_client: AsyncClient, active_user: UserModel) -> None:
+        response = await async_client.get(
+            '/events/987/leaderboard/chances', headers={'Authorization': active_user.email},
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()['detail'] == 'Event not found'
+
+    async def test_chances(self, async_client: AsyncClient, superuser: UserModel, ongoing_event: EventModel) -> None:
+        response = await async_client.get(
+            f'/events/{ongoing_event.id}/leaderboard/chances',
+            params={'offset': 1},
+            headers={'Authorization': superuser.email},
+        )
+
+        superuser_chances = {
+            'user_id': str(superuser.id), 'points': 4,
+            'win_probability': 0.25, 'podium_probability': 1.0, 'average_rank': 1.75,
+        }
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'simulations': 1000, 'participants': 2, 'standings': [superuser_chances], 'user': superuser_chances,
+        }
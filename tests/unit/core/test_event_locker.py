@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from src import exceptions
+from src.core.locks import AsyncioEventLocker
+
+
+@pytest.mark.asyncio
+class TestAsyncioEventLocker:
+    async def test_same_event_is_serialized(self) -> None:
+        locker = AsyncioEventLocker(timeout=1)
+        order = []
+
+        async def mutate(name: str) -> None:
+            async with locker.hold(1):
+                order.append(f'{name} start')
+                await asyncio.sleep(0.01)
+                order.append(f'{name} end')
+
+        await asyncio.gather(mutate('first'), mutate('second'))
+
+        assert order == ['first start', 'first end', 'second start', 'second end']
+        assert locker.stats.acquired == 2
+        assert locker.stats.contended == 1
+
+    async def test_other_events_are_not_blocked(self) -> None:
+        locker = AsyncioEventLocker(timeout=0.01)
+
+        async with locker.hold(1):
+            async with locker.hold(2):
+                pass
+
+        assert locker.stats.contended == 0
+
+    async def test_wait_timeout(self) -> None:
+        locker = AsyncioEventLocker(timeout=0.01)
+
+        async with locker.hold(1):
+            with pytest.raises(exceptions.EventLocked):
+                async with locker.hold(1):
+                    pass
+
+        assert locker.stats.timeouts == 1
+
+        async with locker.hold(1):
+            pass
+
+    async def test_locks_are_dropped_when_released(self) -> None:
+        locker = AsyncioEventLocker(timeout=1)
+
+        async with locker.hold(1):
+            pass
+
+        assert locker._locks == {}
+
+    async def test_hold_match_locks_its_event(self) -> None:
+        locker = AsyncioEventLocker(timeout=0.01)
+
+        async def event_id_of(match_id: int) -> int | None:
+            return {10: 1}.get(match_id)
+
+        async with locker.hold_match(10, event_id_of=event_id_of) as event_id:
+            assert event_id == 1
+
+            with pytest.raises(exceptions.EventLocked):
+                async with locker.hold(1):
+                    pass
+
+        async with locker.hold_match(11, event_id_of=event_id_of) as event_id:
+            assert event_id is None
+
+        assert locker.stats.acquired == 1
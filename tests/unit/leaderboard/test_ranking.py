@@ -0,0 +1,111 @@
+import asyncio
+import random
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.leaderboard.ranking import RankingIndex, GlobalRanking, STANDINGS_KEY
+from src.live.bus import Notification
+
+
+def expected_order(points: dict[UUID, int]) -> list[UUID]:
+    return sorted(points, key=lambda user_id: (-points[user_id], user_id))
+
+
+def test_empty_index() -> None:
+    index = RankingIndex()
+
+    assert len(index) == 0
+    assert index.rank(uuid4()) is None
+    assert index.top(limit=10) == []
+
+
+def test_tied_users_share_rank() -> None:
+    first, second, third = sorted([uuid4(), uuid4(), uuid4()])
+    index = RankingIndex()
+    index.build([(third, 5), (first, 3), (second, 5)])
+
+    assert [index.rank(user_id) for user_id in (first, second, third)] == [3, 1, 1]
+    assert index.top(limit=3) == [(1, second, 5), (1, third, 5), (3, first, 3)]
+    assert index.top(limit=2, offset=1) == [(1, third, 5), (3, first, 3)]
+
+
+def test_updates_move_users() -> None:
+    first, second = uuid4(), uuid4()
+    index = RankingIndex()
+    index.build([(first, 3), (second, 1)])
+
+    index.add(second, 4)
+    index.set(first, 0)
+    new_user = uuid4()
+    index.add(new_user, 2)
+
+    assert [user_id for _, user_id, _ in index.top(limit=3)] == [second, new_user, first]
+
+    index.remove(second)
+
+    assert len(index) == 2
+    assert index.rank(second) is None
+    assert index.rank(new_user) == 1
+
+
+@pytest.mark.parametrize('load', [2, 3, 16])
+def test_matches_sorted_order_after_random_updates(load: int) -> None:
+    rng = random.Random(load)
+    users = [uuid4() for _ in range(200)]
+    points = {user_id: rng.randint(0, 20) for user_id in users[:100]}
+    index = RankingIndex(load=load)
+    index.build(points.items())
+
+    for _ in range(2000):
+        user_id = rng.choice(users)
+        if rng.random() < 0.1:
+            index.remove(user_id)
+            points.pop(user_id, None)
+        else:
+            index.set(user_id, rng.randint(0, 30))
+            points[user_id] = index.points(user_id)
+
+    order = expected_order(points)
+
+    assert len(index) == len(points)
+    assert [index.position(user_id) for user_id in order] == list(range(len(order)))
+    assert [user_id for _, user_id, _ in index.slice(37, 77)] == order[37:77]
+    for user_id in order:
+        assert index.rank(user_id) == 1 + sum(1 for other in points.values() if other > points[user_id])
+
+
+class FakeRanking(GlobalRanking):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    async def load(self) -> None:
+        self.calls.append('load')
+
+    async def refresh_event(self, event_id: int) -> None:
+        self.calls.append(event_id)
+
+
+@pytest.mark.asyncio
+async def test_standings_notifications_refresh_events() -> None:
+    ranking = FakeRanking()
+
+    ranking.handle([
+        Notification(event_id=1, key=STANDINGS_KEY),
+        Notification(event_id=2, key='match:3'),
+        Notification(event_id=1, key=STANDINGS_KEY),
+    ])
+    await asyncio.sleep(0)
+
+    assert ranking.calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_lost_notifications_reload_everything() -> None:
+    ranking = FakeRanking()
+
+    ranking.handle([Notification(event_id=1, key=STANDINGS_KEY), Notification(event_id=None, key='*')])
+    await asyncio.sleep(0)
+
+    assert ranking.calls == ['load']
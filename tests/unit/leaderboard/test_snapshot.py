@@ -0,0 +1,135 @@
+import asyncio
+import random
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.leaderboard.ranking import RankingIndex
+from src.leaderboard.snapshot import LeaderboardSnapshot, LeaderboardSnapshotWriter, write_snapshot
+
+
+async def ranked_rows(totals: dict[UUID, int]) -> AsyncIterator[tuple[UUID, int, int, int, int]]:
+    """Rows as the repository streams them, ranked by a ``RankingIndex``."""
+    index = RankingIndex()
+    index.build(totals.items())
+
+    for user_id in sorted(totals):
+        yield user_id, totals[user_id], index.rank(user_id), index.position(user_id), len(totals)
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / 'leaderboard.snapshot'
+
+
+def test_missing_snapshot_is_empty(path: Path) -> None:
+    snapshot = LeaderboardSnapshot(path)
+
+    assert len(snapshot) == 0
+    assert snapshot.rank(uuid4()) is None
+    assert snapshot.top(limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_empty_snapshot(path: Path) -> None:
+    assert await write_snapshot(path, ranked_rows({})) == 1
+
+    snapshot = LeaderboardSnapshot(path)
+
+    assert len(snapshot) == 0
+    assert snapshot.generation == 1
+    assert snapshot.position(uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_snapshot_answers_as_ranking_index(path: Path) -> None:
+    rng = random.Random(3)
+    totals = {UUID(int=rng.getrandbits(128)): rng.randint(0, 20) for _ in range(500)}
+    index = RankingIndex()
+    index.build(totals.items())
+
+    await write_snapshot(path, ranked_rows(totals))
+    snapshot = LeaderboardSnapshot(path)
+
+    assert len(snapshot) == len(index)
+    assert snapshot.top(limit=50) == index.top(limit=50)
+    assert snapshot.slice(230, 290) == index.slice(230, 290)
+    assert snapshot.top(limit=50, offset=480) == index.top(limit=50, offset=480)
+    for user_id in totals:
+        assert (snapshot.position(user_id), snapshot.rank(user_id), snapshot.points(user_id)) == (
+            index.position(user_id), index.rank(user_id), index.points(user_id),
+        )
+    assert uuid4() not in snapshot
+
+
+@pytest.mark.asyncio
+async def test_readers_map_new_generation(path: Path) -> None:
+    first, second = sorted([uuid4(), uuid4()])
+
+    await write_snapshot(path, ranked_rows({first: 3, second: 1}))
+    snapshot = LeaderboardSnapshot(path)
+    page = snapshot.top(limit=2)
+
+    await write_snapshot(path, ranked_rows({first: 3, second: 5}))
+
+    assert snapshot.top(limit=2) == [(1, second, 5), (2, first, 3)]
+    assert snapshot.generation == 2
+    assert page == [(1, first, 3), (2, second, 1)]
+    assert not list(path.parent.glob('*.tmp'))
+
+
+@pytest.mark.asyncio
+async def test_invalid_file_keeps_mapped_snapshot(path: Path) -> None:
+    user_id = uuid4()
+    await write_snapshot(path, ranked_rows({user_id: 3}))
+    snapshot = LeaderboardSnapshot(path)
+    assert len(snapshot) == 1
+
+    replacement = path.with_name('other')
+    replacement.write_bytes(b'not a snapshot')
+    replacement.replace(path)
+
+    assert snapshot.top(limit=1) == [(1, user_id, 3)]
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_previous_snapshot(path: Path) -> None:
+    user_id = uuid4()
+    await write_snapshot(path, ranked_rows({user_id: 3}))
+
+    async def failing_rows() -> AsyncIterator[tuple[UUID, int, int, int, int]]:
+        yield uuid4(), 1, 1, 0, 2
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        await write_snapshot(path, failing_rows())
+
+    assert LeaderboardSnapshot(path).top(limit=2) == [(1, user_id, 3)]
+    assert not list(path.parent.glob('*.tmp'))
+
+
+class FakeWriter(LeaderboardSnapshotWriter):
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.writes = 0
+
+    async def write(self, if_missing: bool = False) -> int:
+        self.writes += 1
+        await asyncio.sleep(0)
+        return self.writes
+
+
+@pytest.mark.asyncio
+async def test_scheduled_writes_are_coalesced(path: Path) -> None:
+    writer = FakeWriter(path)
+
+    writer.schedule()
+    writer.schedule()
+    await asyncio.sleep(0)
+    writer.schedule()
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert writer.writes == 2
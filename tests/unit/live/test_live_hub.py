@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel
+
+from src.live.hub import LiveHub, Subscription, HEARTBEAT, sse_stream
+
+
+class Score(BaseModel):
+    home_goals: int
+    away_goals: int
+
+
+async def never_disconnected() -> bool:
+    return False
+
+
+@pytest.mark.asyncio
+class TestLiveHub:
+    async def test_publish_without_subscribers(self) -> None:
+        hub = LiveHub()
+
+        hub.publish(event_id=1, kind='match', key='match:1', data=Score(home_goals=1, away_goals=0))
+
+        assert hub.subscribers_count(event_id=1) == 0
+
+    async def test_only_event_subscribers_get_update(self) -> None:
+        hub = LiveHub()
+        subscription = Subscription()
+        another_subscription = Subscription()
+        hub.subscribe(subscription, event_id=1)
+        hub.subscribe(another_subscription, event_id=2)
+
+        hub.publish(event_id=1, kind='match', key='match:1', data=Score(home_goals=1, away_goals=0))
+
+        messages = await subscription.get(timeout=0)
+
+        assert json.loads(messages[0]) == {
+            'type': 'match', 'event_id': 1, 'data': {'home_goals': 1, 'away_goals': 0},
+        }
+        assert await another_subscription.get(timeout=0) == []
+
+    async def test_slow_subscriber_gets_coalesced_updates(self) -> None:
+        hub = LiveHub()
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=1)
+
+        hub.publish(event_id=1, kind='match', key='match:1', data=Score(home_goals=1, away_goals=0))
+        hub.publish(event_id=1, kind='match', key='match:2', data=Score(home_goals=0, away_goals=0))
+        hub.publish(event_id=1, kind='match', key='match:1', data=Score(home_goals=2, away_goals=0))
+
+        messages = [json.loads(message) for message in await subscription.get(timeout=0)]
+
+        assert [message['data'] for message in messages] == [
+            {'home_goals': 0, 'away_goals': 0},
+            {'home_goals': 2, 'away_goals': 0},
+        ]
+
+    async def test_stale_updates_are_dropped_over_the_limit(self) -> None:
+        hub = LiveHub()
+        subscription = Subscription(max_pending=2)
+        hub.subscribe(subscription, event_id=1)
+
+        for match_id in range(3):
+            hub.publish(event_id=1, kind='match', key=f'match:{match_id}', data=Score(home_goals=match_id, away_goals=0))
+
+        messages = [json.loads(message) for message in await subscription.get(timeout=0)]
+
+        assert [message['data']['home_goals'] for message in messages] == [1, 2]
+        assert subscription.dropped == 1
+
+    async def test_update_is_serialized_once(self) -> None:
+        hub = LiveHub()
+        subscription = Subscription()
+        another_subscription = Subscription()
+        hub.subscribe(subscription, event_id=1)
+        hub.subscribe(another_subscription, event_id=1)
+
+        hub.publish(event_id=1, kind='match', key='match:1', data=Score(home_goals=1, away_goals=0))
+
+        [message] = await subscription.get(timeout=0)
+        [another_message] = await another_subscription.get(timeout=0)
+
+        assert message is another_message
+
+    async def test_unsubscribe_all(self) -> None:
+        hub = LiveHub()
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=1)
+        hub.subscribe(subscription, event_id=2)
+
+        hub.unsubscribe_all(subscription)
+
+        assert hub.subscribers_count(event_id=1) == 0
+        assert hub.subscribers_count(event_id=2) == 0
+        assert subscription.event_ids == set()
+
+
+@pytest.mark.asyncio
+class TestSSEStream:
+    async def test_snapshot_heartbeat_and_update(self) -> None:
+        hub = LiveHub()
+        stream = sse_stream(
+            hub=hub, event_id=1, snapshot=b'{}', is_disconnected=never_disconnected, heartbeat=0.01,
+        )
+
+        assert await anext(stream) == b'data: {}\n\n'
+        assert await anext(stream) == HEARTBEAT
+
+        hub.publish(event_id=1, kind='match', key='match:1', data=Score(home_goals=1, away_goals=0))
+        update = await anext(stream)
+
+        assert update.startswith(b'data: ')
+        assert update.endswith(b'\n\n')
+        assert json.loads(update[6:])['data'] == {'home_goals': 1, 'away_goals': 0}
+
+        await stream.aclose()
+
+        assert hub.subscribers_count(event_id=1) == 0
+
+    async def test_stream_stops_on_disconnect(self) -> None:
+        hub = LiveHub()
+        disconnected = asyncio.Event()
+
+        async def is_disconnected() -> bool:
+            return disconnected.is_set()
+
+        stream = sse_stream(hub=hub, event_id=1, snapshot=b'{}', is_disconnected=is_disconnected, heartbeat=0.01)
+
+        await anext(stream)
+        disconnected.set()
+
+        with pytest.raises(StopAsyncIteration):
+            await anext(stream)
+
+        assert hub.subscribers_count(event_id=1) == 0
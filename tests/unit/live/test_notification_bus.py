@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+
+from src.core.cache import LocalCache
+from src.live.bus import InMemoryBus, Notification, PostgresBus
+from src.live.hub import LiveHub, Subscription
+
+
+@pytest.mark.asyncio
+class TestInMemoryBus:
+    async def test_notifications_are_coalesced(self) -> None:
+        bus = InMemoryBus(coalesce=0.01)
+        received = []
+        bus.add_handler(received.append)
+
+        await bus.publish(event_id=1, kind='match', key='match:1', data={'home_goals': 1})
+        await bus.publish(event_id=1, kind='match', key='match:1', data={'home_goals': 2})
+        await bus.publish(event_id=1, kind='event', key='event', data={'status': 2})
+        await asyncio.sleep(0.05)
+
+        assert len(received) == 1
+        assert [notification.key for notification in received[0]] == ['match:1', 'event']
+        assert b'"home_goals":2' in received[0][0].message
+
+    async def test_failing_handler_does_not_stop_others(self) -> None:
+        bus = InMemoryBus()
+        hub = LiveHub()
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=1)
+
+        def broken_handler(notifications) -> None:
+            raise RuntimeError
+
+        bus.add_handler(broken_handler)
+        bus.add_handler(hub.handle)
+
+        await bus.publish(event_id=1, kind='match', key='match:1', data={'home_goals': 1})
+        bus.flush()
+
+        assert len(await subscription.get(timeout=0)) == 1
+
+
+class TestLocalCache:
+    def test_notification_invalidates_event(self) -> None:
+        cache = LocalCache(ttl=60)
+        cache.set(1, 'event 1')
+        cache.set(2, 'event 2')
+
+        cache.handle([Notification(event_id=1, key='event')])
+
+        assert cache.get(1) is None
+        assert cache.get(2) == 'event 2'
+
+    def test_reset_notification_clears_cache(self) -> None:
+        cache = LocalCache(ttl=60)
+        cache.set(1, 'event 1')
+
+        cache.handle([Notification(event_id=None, key='*')])
+
+        assert cache.get(1) is None
+
+    def test_entries_expire(self) -> None:
+        cache = LocalCache(ttl=0)
+        cache.set(1, 'event 1')
+
+        assert cache.get(1) is None
+
+    def test_oldest_entry_evicted(self) -> None:
+        cache = LocalCache(ttl=60, max_size=2)
+        cache.set(1, 'event 1')
+        cache.set(2, 'event 2')
+        cache.set(3, 'event 3')
+
+        assert cache.get(1) is None
+        assert cache.get(3) == 'event 3'
+
+
+@pytest.mark.asyncio
+async def test_postgres_payload_is_parsed() -> None:
+    bus = PostgresBus(engine=None)
+    received = []
+    bus.add_handler(received.append)
+
+    bus._on_notify(None, 1, 'predictions', '5 match:3\n{"type":"match"}')
+    bus._on_notify(None, 1, 'predictions', '5 event\n')
+    bus.flush()
+
+    assert received[0] == [
+        Notification(event_id=5, key='match:3', message=b'{"type":"match"}'),
+        Notification(event_id=5, key='event', message=None),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('payload', ['', 'hello', '5 match:3', 'five match:3\n', '5\n{}'])
+async def test_malformed_postgres_payload_is_skipped(payload: str) -> None:
+    bus = PostgresBus(engine=None)
+    received = []
+    bus.add_handler(received.append)
+
+    bus._on_notify(None, 1, 'predictions', payload)
+    bus._on_notify(None, 1, 'predictions', '5 event\n')
+    bus.flush()
+
+    assert received == [[Notification(event_id=5, key='event', message=None)]]
+
+
+class FakeListener:
+    def __init__(self, calls: list[str]):
+        self.calls = calls
+        self.on_terminate = None
+
+    async def add_listener(self, channel, callback) -> None:
+        self.calls.append(f'listen {channel}')
+
+    async def remove_listener(self, channel, callback) -> None:
+        self.calls.append(f'unlisten {channel}')
+
+    def add_termination_listener(self, callback) -> None:
+        self.on_terminate = callback
+
+    def remove_termination_listener(self, callback) -> None:
+        self.on_terminate = None
+
+
+class FakeConnection:
+    def __init__(self, calls: list[str]):
+        self.calls = calls
+        self.listener = FakeListener(calls)
+
+    async def get_raw_connection(self):
+        return self
+
+    @property
+    def driver_connection(self) -> FakeListener:
+        return self.listener
+
+    async def invalidate(self) -> None:
+        self.calls.append('invalidate')
+
+    async def close(self) -> None:
+        self.calls.append('close')
+        if self.listener.on_terminate is not None:
+            self.listener.on_terminate(self.listener)
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = []
+        self.connections = []
+
+    async def connect(self) -> FakeConnection:
+        self.connections.append(FakeConnection(self.calls))
+        return self.connections[-1]
+
+
+@pytest.mark.asyncio
+async def test_postgres_listener_is_removed_before_close() -> None:
+    engine = FakeEngine()
+    bus = PostgresBus(engine=engine)
+
+    await bus.start()
+    await bus.stop()
+
+    assert engine.calls == ['listen predictions', 'unlisten predictions', 'close']
+    assert bus._reconnect is None
+
+
+@pytest.mark.asyncio
+async def test_lost_postgres_connection_is_discarded() -> None:
+    engine = FakeEngine()
+    bus = PostgresBus(engine=engine)
+    await bus.start()
+    lost = engine.connections[0]
+
+    lost.listener.on_terminate(lost.listener)
+    await bus._reconnect
+
+    assert engine.calls == ['listen predictions', 'invalidate', 'close', 'listen predictions']
+    assert len(engine.connections) == 2
+
+    await bus.stop()
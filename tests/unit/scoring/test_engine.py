@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+
+from src.scoring.engine import (
+    MISSING, DEFAULT_MEAN_GOALS, EventProjection, score, ranks, group, event_standings, leaderboard, finishing_chances,
+)
+from src.scoring.rules import RuleSet
+
+
+def scored(predictions: list[tuple[int, int]], result: tuple[int, int], rules: RuleSet, match_id: int = 1) -> list[int]:
+    home_goals, away_goals = (np.array(goals, dtype=np.int32) for goals in zip(*predictions))
+    match_ids = np.full(len(predictions), match_id, dtype=np.int32)
+
+    points, _, _ = score(
+        home_goals, away_goals,
+        np.full(len(predictions), result[0], dtype=np.int32), np.full(len(predictions), result[1], dtype=np.int32),
+        multipliers=rules.multipliers(match_ids), rules=rules,
+    )
+    return points.tolist()
+
+
+def test_default_rules() -> None:
+    predictions = [(2, 1), (1, 0), (3, 1), (1, 1), (0, 2), (MISSING, MISSING)]
+
+    assert scored(predictions, result=(2, 1), rules=RuleSet()) == [3, 1, 1, 0, 0, 0]
+    assert scored([(0, 0), (2, 2), (1, 0)], result=(1, 1), rules=RuleSet()) == [1, 1, 0]
+
+
+def test_goal_difference_bonus() -> None:
+    rules = RuleSet(exact_score=5, outcome=2, goal_difference=1)
+
+    assert scored([(2, 1), (1, 0), (3, 1), (1, 1)], result=(2, 1), rules=rules) == [5, 3, 2, 0]
+    assert scored([(0, 0), (1, 1)], result=(1, 1), rules=rules) == [3, 5]
+
+
+def test_double_points_matches() -> None:
+    rules = RuleSet(double_points_matches=[7])
+
+    assert scored([(2, 1), (1, 0), (0, 1)], result=(2, 1), rules=rules, match_id=7) == [6, 2, 0]
+    assert scored([(2, 1), (1, 0)], result=(2, 1), rules=rules, match_id=8) == [3, 1]
+    assert rules.multiplier(7) == 2 and rules.multiplier(8) == 1
+
+
+@pytest.mark.parametrize('rules', [
+    {'exact_score': 2, 'outcome': 1, 'goal_difference': 1},
+    {'outcome': 0},
+    {'goal_difference': -1},
+])
+def test_invalid_rules(rules: dict) -> None:
+    with pytest.raises(ValueError):
+        RuleSet(**rules)
+
+
+def test_ranks_are_shared_by_ties_within_groups() -> None:
+    groups = np.array([1, 1, 2, 1, 2, 1])
+    points = np.array([5, 7, 1, 5, 1, 0])
+
+    assert ranks(groups, points).tolist() == [2, 1, 1, 2, 1, 4]
+    assert ranks(np.array([], dtype=np.int32), np.array([], dtype=np.int32)).tolist() == []
+
+
+def test_event_standings() -> None:
+    event_ids = np.array([2, 1, 1, 1, 2], dtype=np.int32)
+    users = np.array([0, 1, 0, 1, 1], dtype=np.int32)
+    points = np.array([3, 1, 0, 3, 3], dtype=np.int32)
+    exact = points == 3
+    outcome = points == 1
+
+    standings = event_standings(event_ids, users, points, exact, outcome)
+
+    assert list(zip(
+        standings.event_ids.tolist(), standings.users.tolist(), standings.points.tolist(),
+        standings.exact_hits.tolist(), standings.outcome_hits.tolist(), standings.ranks.tolist(),
+    )) == [
+        (1, 0, 0, 0, 0, 2),
+        (1, 1, 4, 1, 1, 1),
+        (2, 0, 3, 1, 0, 1),
+        (2, 1, 3, 1, 0, 1),
+    ]
+
+
+@pytest.mark.parametrize('size', [10, 10 ** 6])
+def test_dense_and_sparse_groups(size: int) -> None:
+    keys, groups = group(np.array([7, 2, 7, 9, 2]), size=size)
+
+    assert keys.tolist() == [2, 7, 9]
+    assert groups.tolist() == [1, 0, 1, 2, 0]
+
+
+def test_projection_scores_given_results() -> None:
+    # users 0 and 1 predicted both remaining matches, user 2 only has points
+    projection = EventProjection(
+        match_ids=np.array([4, 9], dtype=np.int32),
+        user_ids=['a', 'b', 'c'],
+        points=np.array([2, 0, 4]),
+        users=np.array([0, 0, 1, 1], dtype=np.int32),
+        matches=np.array([0, 1, 0, 1], dtype=np.int32),
+        home_goals=np.array([1, 0, 2, MISSING], dtype=np.int32),
+        away_goals=np.array([0, 0, 0, MISSING], dtype=np.int32),
+    )
+    rules = RuleSet(double_points_matches=[9])
+
+    def project(*results: tuple[int, int]) -> list[int]:
+        home_goals, away_goals = (np.array(goals, dtype=np.int32) for goals in zip(*results))
+        return projection.project(home_goals, away_goals, rules=rules).tolist()
+
+    assert project((1, 0), (MISSING, MISSING)) == [5, 1, 4]
+    assert project((2, 0), (0, 0)) == [9, 3, 4]
+    assert project((0, 1), (1, 1)) == [4, 0, 4]
+
+
+def test_leaderboard_orders_ties_by_index() -> None:
+    order, leaderboard_ranks = leaderboard(np.array([3, 7, 3, 0, 7]))
+
+    assert order.tolist() == [1, 4, 0, 2, 3]
+    assert leaderboard_ranks.tolist() == [1, 1, 3, 3, 5]
+
+
+def projection_of(points: list[int], predictions: list[tuple[int, int, int, int]], matches: int) -> EventProjection:
+    users, match_indexes, home_goals, away_goals = (
+        np.array([prediction[column] for prediction in predictions], dtype=np.int32) for column in range(4)
+    )
+    return EventProjection(
+        match_ids=np.arange(1, matches + 1, dtype=np.int32),
+        user_ids=list(range(len(points))),
+        points=np.array(points),
+        users=users,
+        matches=match_indexes,
+        home_goals=home_goals,
+        away_goals=away_goals,
+    )
+
+
+def test_mean_goals_of_predictions() -> None:
+    projection = projection_of([0, 0, 0], [(0, 0, 2, 1), (1, 0, 1, 1), (2, 0, MISSING, MISSING)], matches=2)
+
+    home_means, away_means = projection.mean_goals()
+
+    assert home_means.tolist() == [1.5, DEFAULT_MEAN_GOALS]
+    assert away_means.tolist() == [1.0, DEFAULT_MEAN_GOALS]
+
+
+def test_chances_without_remaining_matches() -> None:
+    chances = finishing_chances(projection_of([5, 7, 7, 1], [], matches=0), simulations=10, rules=RuleSet(), seed=1)
+
+    assert chances.wins.tolist() == [0, 10, 10, 0]
+    assert chances.podiums.tolist() == [10, 10, 10, 0]
+    assert chances.rank_sums.tolist() == [30, 10, 10, 40]
+    assert chances.order.tolist() == [1, 2, 0, 3]
+
+
+def test_chances_of_remaining_matches() -> None:
+    # user 0 predicted a home win, user 1 a draw, user 2 nothing and is one point ahead
+    projection = projection_of([0, 0, 1], [(0, 0, 1, 0), (1, 0, 2, 2)], matches=1)
+
+    chances = finishing_chances(projection, simulations=200, rules=RuleSet(), seed=1)
+
+    assert chances.simulations == 200
+    assert 0 < chances.wins[2] < 200
+    assert chances.wins[0] + chances.wins[1] + chances.wins[2] >= 200
+    assert (chances.podiums == 200).all()
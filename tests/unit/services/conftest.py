@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Sequence
-from uuid import UUID
+from typing import Iterable, Sequence
+from uuid import UUID, uuid4
 
+import numpy as np
 import pytest
 
 from src.auth.base import BaseAuthRepository
@@ -11,12 +12,20 @@ from src.core.security import get_password_hash
 from src.events.base import BaseEventRepository
 from src.events.models import EventStatus
 from src.events.schemas import EventCreate, EventUpdate
+from src.leaderboard.base import BaseLeaderboardRepository
+from src.leagues.base import BaseLeagueRepository
+from src.leagues.schemas import LeagueCreate
 from src.matches.base import BaseMatchRepository
 from src.matches.models import MatchStatus
-from src.matches.schemas import MatchCreate, MatchUpdate, MatchRead
+from src.matches.schemas import MatchCreate, MatchUpdate, MatchRead, MatchScore, MatchFeedRow, MatchFilter
 from src.predictions.base import BasePredictionRepository
+from src.predictions.consensus import LockedPredictions
 from src.predictions.schemas import PredictionCreate, PredictionUpdate
-from tests.utils import EventModel, gen_matches, UserModel, MatchModel, PredictionModel
+from src.scoring.base import BaseScoringRepository
+from src.scoring.engine import PredictionArrays, Standings, EventProjection, MISSING
+from tests.utils import (
+    EventModel, gen_matches, UserModel, MatchModel, PredictionModel, ScoreCountModel, StandingModel, LeagueModel,
+)
 
 
 @pytest.fixture(scope='session')
@@ -238,12 +247,15 @@ def mock_event_repo(
 
 @pytest.fixture
 def mock_match_repo(
+        mock_event_repo: BaseEventRepository,
         upcoming_match: MatchModel,
         ongoing_match: MatchModel,
         completed_match: MatchModel,
 ) -> BaseMatchRepository:
     class MockMatchRepository(BaseMatchRepository):
         matches = [upcoming_match, ongoing_match, completed_match]
+        deltas: list[tuple[UUID, int]] = []
+        batches: list[list[MatchFeedRow]] = []
 
         async def create(self, match: MatchCreate, event_id: int) -> MatchModel:
             return MatchModel(**match.dict(), event_id=event_id)
@@ -251,6 +263,41 @@ def mock_match_repo(
         async def get_by_id(self, match_id: int) -> MatchModel | None:
             return await self._get_by_id(match_id=match_id)
 
+        async def create_multiple(
+                self, event_id: int, matches: Sequence[MatchCreate], max_count: int,
+        ) -> tuple[EventStatus | None, int, list[MatchModel]]:
+            event = await mock_event_repo.get_by_id(event_id=event_id)
+
+            if event is None:
+                return None, 0, []
+
+            capacity = max_count - len(event.matches)
+
+            if event.status != EventStatus.created:
+                return event.status, capacity, []
+
+            keys = {(match.home_team, match.away_team, match.start_time) for match in event.matches}
+            created = []
+            for match in matches:
+                key = (match.home_team, match.away_team, match.start_time)
+                if key not in keys and len(created) < capacity:
+                    keys.add(key)
+                    created.append(MatchModel(**match.dict(), event_id=event_id))
+
+            return event.status, capacity, created
+
+        async def get_multiple(
+                self, filters: MatchFilter, after: tuple[datetime, int] | None = None, limit: int = 100,
+        ) -> list[MatchModel]:
+            matches = sorted(self.matches, key=lambda match: (match.start_time, match.id))
+
+            if filters.status is not None:
+                matches = [match for match in matches if match.status == filters.status]
+            if after is not None:
+                matches = [match for match in matches if (match.start_time, match.id) > after]
+
+            return matches[:limit]
+
         async def update(self, match_id: int, match_data: MatchUpdate) -> MatchModel | None:
             match = await self._get_by_id(match_id=match_id)
 
@@ -269,6 +316,69 @@ def mock_match_repo(
         async def delete(self, match_id: int) -> None:
             return None
 
+        async def finish(self, match_id: int, home_goals: int, away_goals: int) -> tuple[bool, MatchModel | None]:
+            match = await self._get_by_id(match_id=match_id)
+
+            if match is None:
+                return False, None
+
+            if match.status == MatchStatus.completed:
+                return True, None
+
+            match.home_goals = home_goals
+            match.away_goals = away_goals
+            match.status = MatchStatus.completed
+
+            return True, match
+
+        async def finish_multiple(self, event_id: int, scores: Sequence[MatchScore]) -> list[MatchModel]:
+            finished = []
+
+            for score in scores:
+                match = await self._get_by_id(match_id=score.match_id)
+
+                if match is None or match.event_id != event_id or match.status == MatchStatus.completed:
+                    continue
+
+                match.home_goals = score.home_goals
+                match.away_goals = score.away_goals
+                match.status = MatchStatus.completed
+                finished.append(match)
+
+            return finished
+
+        async def correct(
+                self, match_id: int, home_goals: int, away_goals: int,
+        ) -> tuple[bool, MatchModel | None, list[tuple[UUID, int]]]:
+            match = await self._get_by_id(match_id=match_id)
+
+            if match is None:
+                return False, None, []
+
+            if match.status != MatchStatus.completed:
+                return True, None, []
+
+            match.home_goals = home_goals
+            match.away_goals = away_goals
+
+            return True, match, self.deltas
+
+        async def upsert_multiple(
+                self, matches: Sequence[MatchFeedRow], max_count: int,
+        ) -> tuple[list[MatchModel], int]:
+            self.batches.append(list(matches))
+            accepted = []
+            for row in matches:
+                if sum(match.event_id == row.event_id for match in accepted) < max_count:
+                    accepted.append(row)
+            return [MatchModel(**row.dict()) for row in accepted], len(matches) - len(accepted)
+
+        async def get_statuses(self, event_id: int, match_ids: Sequence[int]) -> dict[int, MatchStatus]:
+            return {
+                match.id: match.status for match in self.matches
+                if match.id in match_ids and match.event_id == event_id
+            }
+
         async def _get_by_id(self, match_id: int) -> MatchModel | None:
             for match in self.matches:
                 if match.id == match_id:
@@ -280,35 +390,39 @@ def mock_match_repo(
 
 
 @pytest.fixture
-def mock_prediction_repo(prediction1: PredictionModel, upcoming_match: MatchModel) -> BasePredictionRepository:
+def mock_prediction_repo(
+        prediction1: PredictionModel,
+        upcoming_match: MatchModel,
+        ongoing_match: MatchModel,
+        completed_match: MatchModel,
+) -> BasePredictionRepository:
     class MockPredictionRepository(BasePredictionRepository):
         predictions = [prediction1]
+        matches = [upcoming_match, ongoing_match, completed_match]
 
         async def get_multiple_by_event_id(self, event_id: int, user_id: UUID) -> list[PredictionModel]:
-            predictions = []
+            match_ids = [match.id for match in self.matches if match.event_id == event_id]
 
-            for prediction in self.predictions:
-                if all(
-                        (
-                                prediction.match_id == upcoming_match.id,
-                                prediction.user_id == user_id,
-                                upcoming_match.event_id == event_id,
-                        ),
-                ):
-                    predictions.append(prediction)
-
-            return predictions
+            return [
+                prediction for prediction in self.predictions
+                if prediction.match_id in match_ids and prediction.user_id == user_id
+            ]
 
         async def get_by_id(self, prediction_id: int) -> PredictionModel | None:
             return await self._get_by_id(prediction_id=prediction_id)
 
-        async def create(self, prediction: PredictionCreate, user_id: UUID) -> PredictionModel:
+        async def create(self, prediction: PredictionCreate, user_id: UUID) -> PredictionModel | None:
+            if not self._is_open(match_id=prediction.match_id) or self._is_predicted(prediction.match_id, user_id):
+                return None
+
             return PredictionModel(**prediction.dict(), user_id=user_id)
 
-        async def update(self, prediction_id: int, prediction_data: PredictionUpdate) -> PredictionModel | None:
+        async def update(
+                self, prediction_id: int, prediction_data: PredictionUpdate, user_id: UUID,
+        ) -> PredictionModel | None:
             prediction = await self._get_by_id(prediction_id=prediction_id)
 
-            if prediction is None:
+            if prediction is None or prediction.user_id != user_id or not self._is_open(match_id=prediction.match_id):
                 return None
 
             prediction.home_goals = prediction_data.home_goals
@@ -316,16 +430,80 @@ def mock_prediction_repo(prediction1: PredictionModel, upcoming_match: MatchMode
 
             return prediction
 
-        async def exists_in_db(self, user_id: UUID, match_id: int) -> bool:
-            for prediction in self.predictions:
-                if prediction.user_id == user_id and prediction.match_id == match_id:
-                    return True
-            else:
-                return False
+        async def upsert_multiple(
+                self, event_id: int, user_id: UUID, predictions: Sequence[PredictionCreate],
+        ) -> list[int]:
+            saved = []
+
+            for prediction in predictions:
+                if not any(match.id == prediction.match_id and match.event_id == event_id for match in self.matches):
+                    continue
+                if not self._is_open(match_id=prediction.match_id):
+                    continue
+
+                for existing in self.predictions:
+                    if existing.match_id == prediction.match_id and existing.user_id == user_id:
+                        existing.home_goals = prediction.home_goals
+                        existing.away_goals = prediction.away_goals
+                        break
+                else:
+                    self.predictions.append(PredictionModel(**prediction.dict(), user_id=user_id))
+
+                if prediction.match_id not in saved:
+                    saved.append(prediction.match_id)
+
+            return saved
+
+        async def get_prediction_state(self, match_id: int, user_id: UUID) -> tuple[bool, bool] | None:
+            if not any(match.id == match_id for match in self.matches):
+                return None
+
+            return self._is_open(match_id=match_id), self._is_predicted(match_id=match_id, user_id=user_id)
 
         async def update_points_for_match(self, match: MatchRead) -> None:
             pass
 
+        async def get_lock_states(
+                self, event_id: int | None = None, match_id: int | None = None,
+        ) -> list[tuple[int, bool, int | None, int | None]]:
+            return [
+                (match.id, self._is_open(match_id=match.id), match.home_goals, match.away_goals)
+                for match in sorted(self.matches, key=lambda match: match.id)
+                if (match.event_id == event_id if event_id is not None else match.id == match_id)
+            ]
+
+        async def get_locked_predictions(self, match_ids: Sequence[int]) -> LockedPredictions:
+            predictions = sorted(
+                (prediction for prediction in self.predictions if prediction.match_id in match_ids),
+                key=lambda prediction: (prediction.user_id, prediction.match_id),
+            )
+            user_ids = sorted({prediction.user_id for prediction in predictions})
+            starts = [0]
+            for user_id in user_ids:
+                starts.append(starts[-1] + sum(prediction.user_id == user_id for prediction in predictions))
+
+            def array(values: Iterable[int | None]) -> np.ndarray:
+                return np.array([MISSING if value is None else value for value in values], dtype=np.int32)
+
+            return LockedPredictions(
+                user_ids=user_ids,
+                starts=np.array(starts),
+                match_ids=array(prediction.match_id for prediction in predictions),
+                home_goals=array(prediction.home_goals for prediction in predictions),
+                away_goals=array(prediction.away_goals for prediction in predictions),
+                points=array(prediction.points for prediction in predictions),
+            )
+
+        async def get_score_counts(self, match_id: int) -> list[ScoreCountModel]:
+            counts = {}
+
+            for prediction in self.predictions:
+                if prediction.match_id == match_id:
+                    score = (prediction.home_goals, prediction.away_goals)
+                    counts.setdefault(score, ScoreCountModel(match_id, *score)).count += 1
+
+            return sorted(counts.values(), key=lambda score_count: score_count.count, reverse=True)
+
         async def _get_by_id(self, prediction_id: int) -> PredictionModel | None:
             for prediction in self.predictions:
                 if prediction.id == prediction_id:
@@ -333,4 +511,177 @@ def mock_prediction_repo(prediction1: PredictionModel, upcoming_match: MatchMode
             else:
                 return None
 
+        def _is_open(self, match_id: int) -> bool:
+            return any(match.id == match_id and match.status == MatchStatus.upcoming for match in self.matches)
+
+        def _is_predicted(self, match_id: int, user_id: UUID) -> bool:
+            return any(
+                prediction.match_id == match_id and prediction.user_id == user_id for prediction in self.predictions
+            )
+
     yield MockPredictionRepository()
+
+
+@pytest.fixture
+def standings(active_user: UserModel, superuser: UserModel, upcoming_event: EventModel) -> list[StandingModel]:
+    return [
+        StandingModel(event_id=upcoming_event.id, user_id=active_user.id, points=4, exact_hits=1, outcome_hits=1,
+                      rank=2),
+        StandingModel(event_id=upcoming_event.id, user_id=superuser.id, points=4, exact_hits=0, outcome_hits=4,
+                      rank=2),
+        StandingModel(event_id=upcoming_event.id, user_id=uuid4(), points=7, exact_hits=2, outcome_hits=1, rank=1),
+    ]
+
+
+@pytest.fixture
+def mock_leaderboard_repo(standings: list[StandingModel]) -> BaseLeaderboardRepository:
+    class MockLeaderboardRepository(BaseLeaderboardRepository):
+        async def get_event_standings(
+                self, event_id: int, after: tuple[int, UUID] | None = None, limit: int = 100,
+        ) -> list[StandingModel]:
+            ordered = sorted(
+                (standing for standing in standings if standing.event_id == event_id),
+                key=lambda standing: (-standing.points, standing.user_id),
+            )
+            if after is not None:
+                points, user_id = after
+                ordered = [
+                    standing for standing in ordered if (-standing.points, standing.user_id) > (-points, user_id)
+                ]
+
+            return ordered[:limit]
+
+        async def get_event_neighbours(self, event_id: int, user_id: UUID, window: int) -> list[StandingModel]:
+            ordered = await self.get_event_standings(event_id=event_id, limit=len(standings))
+            position = next((i for i, standing in enumerate(ordered) if standing.user_id == user_id), None)
+            if position is None:
+                return []
+
+            return ordered[max(position - window, 0):position + window + 1]
+
+    yield MockLeaderboardRepository()
+
+
+@pytest.fixture
+def league(active_user: UserModel) -> LeagueModel:
+    return LeagueModel(name='Office', owner_id=active_user.id, invite_code='office-code')
+
+
+@pytest.fixture
+def mock_league_repo(
+        league: LeagueModel, active_user: UserModel, standings: list[StandingModel],
+) -> BaseLeagueRepository:
+    class MockLeagueRepository(BaseLeagueRepository):
+        leagues = [league]
+        members = {(league.id, active_user.id), (league.id, standings[2].user_id)}
+
+        async def get_by_id(self, league_id: int) -> LeagueModel | None:
+            return next((league for league in self.leagues if league.id == league_id), None)
+
+        async def get_multiple_by_user_id(self, user_id: UUID) -> list[LeagueModel]:
+            return [league for league in self.leagues if (league.id, user_id) in self.members]
+
+        async def create(self, league: LeagueCreate, owner_id: UUID, invite_code: str) -> LeagueModel:
+            new_league = LeagueModel(**league.dict(), owner_id=owner_id, invite_code=invite_code)
+            self.leagues.append(new_league)
+            self.members.add((new_league.id, owner_id))
+            return new_league
+
+        async def join(self, invite_code: str, user_id: UUID) -> LeagueModel | None:
+            league = next((league for league in self.leagues if league.invite_code == invite_code), None)
+            if league is not None and (league.id, user_id) not in self.members:
+                self.members.add((league.id, user_id))
+                league.member_count += 1
+            return league
+
+        async def is_member(self, league_id: int, user_id: UUID) -> bool:
+            return (league_id, user_id) in self.members
+
+        async def get_standings(
+                self,
+                league: LeagueModel,
+                event_id: int | None = None,
+                after: tuple[int, UUID] | None = None,
+                limit: int = 100,
+        ) -> list[StandingModel]:
+            ordered = sorted(
+                (
+                    standing for standing in standings
+                    if (league.id, standing.user_id) in self.members
+                    and (event_id is None or standing.event_id == event_id)
+                ),
+                key=lambda standing: (-standing.points, standing.user_id),
+            )
+            if after is not None:
+                points, user_id = after
+                ordered = [
+                    standing for standing in ordered if (-standing.points, standing.user_id) > (-points, user_id)
+                ]
+
+            return ordered[:limit]
+
+    yield MockLeagueRepository()
+
+
+@pytest.fixture
+def mock_scoring_repo(
+        active_user: UserModel, superuser: UserModel, upcoming_event: EventModel,
+) -> BaseScoringRepository:
+    class MockScoringRepository(BaseScoringRepository):
+        locked: list[int] = []
+        saved: list[tuple[Sequence[int], np.ndarray, Standings]] = []
+        version: tuple[tuple[int, int | None, int | None, bool], ...] = ((4, None, None, False), (5, None, None, False))
+
+        async def get_scored_event_ids(self) -> list[int]:
+            return [1, 2]
+
+        async def lock_events(self, event_ids: Sequence[int]) -> None:
+            self.locked.extend(event_ids)
+
+        async def load_predictions(self, event_ids: Sequence[int]) -> PredictionArrays:
+            # both users predicted two matches of event 1 and one match of event 2, scored with 3 and 1 points
+            def array(*values: int) -> np.ndarray:
+                return np.array(values, dtype=np.int32)
+
+            return PredictionArrays(
+                ids=np.arange(1, 7, dtype=np.int64),
+                users=array(0, 0, 0, 1, 1, 1),
+                user_ids=[active_user.id, superuser.id],
+                event_ids=array(1, 1, 2, 1, 1, 2),
+                match_ids=array(1, 2, 3, 1, 2, 3),
+                home_goals=array(2, 1, 0, 1, 0, MISSING),
+                away_goals=array(1, 1, 0, 0, 0, MISSING),
+                match_home_goals=array(2, 0, 1, 2, 0, 1),
+                match_away_goals=array(1, 0, 1, 1, 0, 1),
+                points=array(3, 1, MISSING, 1, 3, 0),
+            )
+
+        async def get_event_version(self, event_id: int) -> tuple[tuple[int, int | None, int | None, bool], ...]:
+            return self.version if event_id == upcoming_event.id else ()
+
+        async def get_event_projection(self, event_id: int) -> EventProjection:
+            if event_id != upcoming_event.id:
+                empty = np.array([], dtype=np.int32)
+                return EventProjection(
+                    match_ids=empty, user_ids=[], points=empty, users=empty, matches=empty,
+                    home_goals=empty, away_goals=empty,
+                )
+
+            # the leader has 4 points and predicted match 4, the other user 3 points and both matches 4 and 5
+            first, second = sorted([active_user.id, superuser.id])
+            return EventProjection(
+                match_ids=np.array([4, 5], dtype=np.int32),
+                user_ids=[first, second],
+                points=np.array([4, 3]),
+                users=np.array([0, 1, 1], dtype=np.int32),
+                matches=np.array([0, 0, 1], dtype=np.int32),
+                home_goals=np.array([1, 0, 2], dtype=np.int32),
+                away_goals=np.array([0, 0, 2], dtype=np.int32),
+            )
+
+        async def save_scores(
+                self, event_ids: Sequence[int], predictions: PredictionArrays, points: np.ndarray, standings: Standings,
+        ) -> None:
+            self.saved.append((event_ids, points, standings))
+
+    yield MockScoringRepository()
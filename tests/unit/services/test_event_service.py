@@ -7,6 +7,10 @@ from src.events.base import BaseEventService, BaseEventRepository
 from src.events.models import EventStatus
 from src.events.schemas import EventRead, EventCreate
 from src.events.service import EventService
+from src.core.cache import LocalCache
+from src.core.locks import AsyncioEventLocker
+from src.live.bus import InMemoryBus
+from src.live.hub import LiveHub, Subscription
 from tests.utils import EventModel, gen_matches
 
 
@@ -58,6 +62,26 @@ class TestGetByID:
 
         assert event == EventRead.from_orm(created_event)
 
+    async def test_event_is_cached_until_invalidated(
+            self,
+            mock_event_repo: BaseEventRepository,
+            upcoming_event: EventModel,
+    ) -> None:
+        bus = InMemoryBus()
+        cache = LocalCache(ttl=60)
+        bus.add_handler(cache.handle)
+        event_service = EventService(mock_event_repo, bus=bus, cache=cache)
+
+        event = await event_service.get_by_id(event_id=upcoming_event.id)
+        upcoming_event.name = 'renamed'
+
+        assert await event_service.get_by_id(event_id=upcoming_event.id) is event
+
+        await event_service.upgrade_status(event_id=upcoming_event.id)
+        bus.flush()
+
+        assert (await event_service.get_by_id(event_id=upcoming_event.id)).name == 'renamed'
+
 
 @pytest.mark.asyncio
 class TestCreateEvent:
@@ -132,6 +156,37 @@ class TestUpgradeEventStatus:
         assert type(event) == EventRead
         assert event.status == EventStatus.completed
 
+    async def test_upgrade_publishes_new_status(
+            self, mock_event_repo: BaseEventRepository, upcoming_event: EventModel
+    ) -> None:
+        bus = InMemoryBus()
+        hub = LiveHub()
+        bus.add_handler(hub.handle)
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=upcoming_event.id)
+
+        event = await EventService(mock_event_repo, bus=bus).upgrade_status(event_id=upcoming_event.id)
+        bus.flush()
+
+        messages = await subscription.get(timeout=0)
+
+        assert len(messages) == 1
+        assert f'"status":{event.status}'.encode() in messages[0]
+
+
+    async def test_upgrade_waits_for_event_lock(
+            self, mock_event_repo: BaseEventRepository, upcoming_event: EventModel
+    ) -> None:
+        locker = AsyncioEventLocker(timeout=0.01)
+        event_service = EventService(mock_event_repo, locker=locker)
+
+        async with locker.hold(upcoming_event.id):
+            with pytest.raises(exceptions.EventLocked):
+                await event_service.upgrade_status(event_id=upcoming_event.id)
+
+        event = await event_service.upgrade_status(event_id=upcoming_event.id)
+
+        assert event.status == EventStatus.ongoing
 
 @pytest.mark.asyncio
 class TestDeleteEvent:
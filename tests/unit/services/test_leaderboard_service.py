@@ -0,0 +1,154 @@
+from uuid import uuid4
+
+import pytest
+
+from src import exceptions
+from src.events.base import BaseEventRepository
+from src.leaderboard.base import BaseLeaderboardRepository, BaseLeaderboardService
+from src.leaderboard.ranking import RankingIndex
+from src.leaderboard.service import LeaderboardService
+from tests.utils import EventModel, StandingModel, UserModel
+
+
+@pytest.fixture
+def ranking(standings: list[StandingModel]) -> RankingIndex:
+    ranking = RankingIndex()
+    ranking.build((standing.user_id, standing.points) for standing in standings)
+    return ranking
+
+
+@pytest.fixture
+def leaderboard_service(
+        ranking: RankingIndex,
+        mock_leaderboard_repo: BaseLeaderboardRepository,
+        mock_event_repo: BaseEventRepository,
+) -> BaseLeaderboardService:
+    yield LeaderboardService(repo=mock_leaderboard_repo, event_repo=mock_event_repo, ranking=ranking)
+
+
+@pytest.mark.asyncio
+class TestGetEventLeaderboard:
+    async def test_not_existing_event(self, leaderboard_service: BaseLeaderboardService) -> None:
+        with pytest.raises(exceptions.EventNotFound):
+            await leaderboard_service.get_event_leaderboard(event_id=987)
+
+    async def test_event_without_standings(
+            self, leaderboard_service: BaseLeaderboardService, created_event: EventModel,
+    ) -> None:
+        assert await leaderboard_service.get_event_leaderboard(event_id=created_event.id) == []
+
+    async def test_ordered_by_points_and_user_id(
+            self,
+            leaderboard_service: BaseLeaderboardService,
+            upcoming_event: EventModel,
+            standings: list[StandingModel],
+    ) -> None:
+        leaderboard = await leaderboard_service.get_event_leaderboard(event_id=upcoming_event.id)
+
+        tied = sorted(standings[:2], key=lambda standing: standing.user_id)
+
+        assert [standing.user_id for standing in leaderboard] == [
+            standings[2].user_id, tied[0].user_id, tied[1].user_id,
+        ]
+        assert [standing.points for standing in leaderboard] == [7, 4, 4]
+
+    async def test_pages(
+            self,
+            leaderboard_service: BaseLeaderboardService,
+            upcoming_event: EventModel,
+    ) -> None:
+        first_page = await leaderboard_service.get_event_leaderboard(event_id=upcoming_event.id, limit=2)
+        last = first_page[-1]
+        second_page = await leaderboard_service.get_event_leaderboard(
+            event_id=upcoming_event.id, after=(last.points, last.user_id), limit=2,
+        )
+
+        full = await leaderboard_service.get_event_leaderboard(event_id=upcoming_event.id)
+
+        assert len(first_page) == 2
+        assert first_page + second_page == full
+
+
+@pytest.mark.asyncio
+class TestGetGlobalLeaderboard:
+    async def test_ranks(self, leaderboard_service: BaseLeaderboardService, standings: list[StandingModel]) -> None:
+        leaderboard = await leaderboard_service.get_global_leaderboard()
+
+        assert [(standing.rank, standing.points) for standing in leaderboard] == [(1, 7), (2, 4), (2, 4)]
+        assert leaderboard[0].user_id == standings[2].user_id
+
+    async def test_offset(self, leaderboard_service: BaseLeaderboardService) -> None:
+        leaderboard = await leaderboard_service.get_global_leaderboard(offset=2, limit=5)
+
+        assert [(standing.rank, standing.points) for standing in leaderboard] == [(2, 4)]
+
+
+@pytest.mark.asyncio
+class TestGetEventRank:
+    async def test_not_existing_event(
+            self, leaderboard_service: BaseLeaderboardService, active_user: UserModel,
+    ) -> None:
+        with pytest.raises(exceptions.EventNotFound):
+            await leaderboard_service.get_event_rank(event_id=987, user_id=active_user.id)
+
+    async def test_user_without_standing(
+            self, leaderboard_service: BaseLeaderboardService, created_event: EventModel, active_user: UserModel,
+    ) -> None:
+        with pytest.raises(exceptions.StandingNotFound):
+            await leaderboard_service.get_event_rank(event_id=created_event.id, user_id=active_user.id)
+
+    async def test_neighbours(
+            self,
+            leaderboard_service: BaseLeaderboardService,
+            upcoming_event: EventModel,
+            standings: list[StandingModel],
+    ) -> None:
+        tied = sorted(standings[:2], key=lambda standing: standing.user_id)
+
+        user_rank = await leaderboard_service.get_event_rank(
+            event_id=upcoming_event.id, user_id=tied[0].user_id, window=1,
+        )
+
+        assert (user_rank.rank, user_rank.points) == (2, 4)
+        assert [(standing.rank, standing.user_id) for standing in user_rank.standings] == [
+            (1, standings[2].user_id), (2, tied[0].user_id), (2, tied[1].user_id),
+        ]
+
+    async def test_window_is_cut_at_the_top(
+            self,
+            leaderboard_service: BaseLeaderboardService,
+            upcoming_event: EventModel,
+            standings: list[StandingModel],
+    ) -> None:
+        user_rank = await leaderboard_service.get_event_rank(
+            event_id=upcoming_event.id, user_id=standings[2].user_id, window=1,
+        )
+
+        assert user_rank.rank == 1
+        assert [standing.points for standing in user_rank.standings] == [7, 4]
+
+
+@pytest.mark.asyncio
+class TestGetGlobalRank:
+    async def test_user_without_points(self, leaderboard_service: BaseLeaderboardService) -> None:
+        with pytest.raises(exceptions.StandingNotFound):
+            await leaderboard_service.get_global_rank(user_id=uuid4())
+
+    async def test_neighbours(
+            self, leaderboard_service: BaseLeaderboardService, standings: list[StandingModel],
+    ) -> None:
+        tied = sorted(standings[:2], key=lambda standing: standing.user_id)
+
+        user_rank = await leaderboard_service.get_global_rank(user_id=tied[1].user_id, window=1)
+
+        assert (user_rank.rank, user_rank.points) == (2, 4)
+        assert [(standing.rank, standing.user_id) for standing in user_rank.standings] == [
+            (2, tied[0].user_id), (2, tied[1].user_id),
+        ]
+
+    async def test_zero_window(
+            self, leaderboard_service: BaseLeaderboardService, standings: list[StandingModel],
+    ) -> None:
+        user_rank = await leaderboard_service.get_global_rank(user_id=standings[2].user_id, window=0)
+
+        assert [standing.user_id for standing in user_rank.standings] == [standings[2].user_id]
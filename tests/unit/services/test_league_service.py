@@ -0,0 +1,101 @@
+import pytest
+
+from src import exceptions
+from src.events.base import BaseEventRepository
+from src.leagues.base import BaseLeagueRepository, BaseLeagueService
+from src.leagues.schemas import LeagueCreate
+from src.leagues.service import LeagueService
+from tests.utils import EventModel, LeagueModel, StandingModel, UserModel
+
+
+@pytest.fixture
+def league_service(
+        mock_league_repo: BaseLeagueRepository,
+        mock_event_repo: BaseEventRepository,
+) -> BaseLeagueService:
+    yield LeagueService(repo=mock_league_repo, event_repo=mock_event_repo)
+
+
+@pytest.mark.asyncio
+class TestCreate:
+    async def test_creator_is_member(self, league_service: BaseLeagueService, superuser: UserModel) -> None:
+        league = await league_service.create(league=LeagueCreate(name='Pub'), user_id=superuser.id)
+
+        leagues = await league_service.get_multiple(user_id=superuser.id)
+
+        assert league.owner_id == superuser.id
+        assert league.member_count == 1
+        assert league.invite_code
+        assert league.id in [member_league.id for member_league in leagues]
+
+    async def test_invite_codes_differ(self, league_service: BaseLeagueService, superuser: UserModel) -> None:
+        first = await league_service.create(league=LeagueCreate(name='Pub'), user_id=superuser.id)
+        second = await league_service.create(league=LeagueCreate(name='Pub'), user_id=superuser.id)
+
+        assert first.invite_code != second.invite_code
+
+
+@pytest.mark.asyncio
+class TestJoin:
+    async def test_join(self, league_service: BaseLeagueService, league: LeagueModel, superuser: UserModel) -> None:
+        joined = await league_service.join(invite_code=league.invite_code, user_id=superuser.id)
+
+        assert joined.id == league.id
+        assert joined.member_count == 2
+
+    async def test_join_twice(
+            self, league_service: BaseLeagueService, league: LeagueModel, active_user: UserModel,
+    ) -> None:
+        joined = await league_service.join(invite_code=league.invite_code, user_id=active_user.id)
+
+        assert joined.member_count == 1
+
+    async def test_invalid_invite_code(self, league_service: BaseLeagueService, superuser: UserModel) -> None:
+        with pytest.raises(exceptions.LeagueNotFound):
+            await league_service.join(invite_code='nope', user_id=superuser.id)
+
+
+@pytest.mark.asyncio
+class TestGetStandings:
+    async def test_not_existing_league(self, league_service: BaseLeagueService, active_user: UserModel) -> None:
+        with pytest.raises(exceptions.LeagueNotFound):
+            await league_service.get_standings(league_id=987, user_id=active_user.id)
+
+    async def test_not_a_member(
+            self, league_service: BaseLeagueService, league: LeagueModel, superuser: UserModel,
+    ) -> None:
+        with pytest.raises(exceptions.UserIsNotAllowed):
+            await league_service.get_standings(league_id=league.id, user_id=superuser.id)
+
+    async def test_not_existing_event(
+            self, league_service: BaseLeagueService, league: LeagueModel, active_user: UserModel,
+    ) -> None:
+        with pytest.raises(exceptions.EventNotFound):
+            await league_service.get_standings(league_id=league.id, user_id=active_user.id, event_id=987)
+
+    async def test_only_members_are_ranked(
+            self,
+            league_service: BaseLeagueService,
+            league: LeagueModel,
+            active_user: UserModel,
+            upcoming_event: EventModel,
+            standings: list[StandingModel],
+    ) -> None:
+        league_standings = await league_service.get_standings(
+            league_id=league.id, user_id=active_user.id, event_id=upcoming_event.id,
+        )
+
+        assert [(standing.user_id, standing.points) for standing in league_standings] == [
+            (standings[2].user_id, 7), (active_user.id, 4),
+        ]
+
+    async def test_pages(
+            self, league_service: BaseLeagueService, league: LeagueModel, active_user: UserModel,
+    ) -> None:
+        first_page = await league_service.get_standings(league_id=league.id, user_id=active_user.id, limit=1)
+        last = first_page[-1]
+        second_page = await league_service.get_standings(
+            league_id=league.id, user_id=active_user.id, after=(last.points, last.user_id), limit=1,
+        )
+
+        assert [standing.points for standing in first_page + second_page] == [7, 4]
@@ -0,0 +1,120 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.core.config import settings
+from src.live.bus import InMemoryBus
+from src.live.hub import LiveHub, Subscription
+from src.matches.base import BaseMatchRepository
+from src.matches.ingest import ingest, read_rows, batched
+from src.matches.models import MatchStatus
+
+
+def feed_row(number: int, **kwargs) -> dict:
+    return {
+        'event_id': 1,
+        'home_team': f'Home {number}',
+        'away_team': f'Away {number}',
+        'start_time': '2026-05-01T18:00:00',
+        **kwargs,
+    }
+
+
+def test_batched() -> None:
+    assert list(batched(range(5), size=2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], size=2)) == []
+
+
+def test_read_csv(tmp_path: Path) -> None:
+    path = tmp_path / 'feed.csv'
+    path.write_text(
+        'event_id,home_team,away_team,start_time,status,home_goals,away_goals\n'
+        '1,Arsenal,Chelsea,2026-05-01T18:00:00,completed,2,1\n'
+        '1,Everton,Fulham,2026-05-01T20:00:00,,,\n'
+    )
+
+    rows = list(read_rows(path))
+
+    assert len(rows) == 2
+    assert rows[0]['home_team'] == 'Arsenal'
+    assert rows[1]['home_goals'] == ''
+
+
+def test_read_jsonl_skips_empty_lines(tmp_path: Path) -> None:
+    path = tmp_path / 'feed.jsonl'
+    path.write_text(json.dumps(feed_row(1)) + '\n\n' + json.dumps(feed_row(2)) + '\n')
+
+    assert len(list(read_rows(path))) == 2
+
+
+def test_read_unsupported_format(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        list(read_rows(tmp_path / 'feed.xml'))
+
+
+@pytest.mark.asyncio
+class TestIngest:
+    async def test_rows_are_upserted_in_batches(self, mock_match_repo: BaseMatchRepository) -> None:
+        rows = [feed_row(number) for number in range(5)]
+
+        stats = await ingest(rows, repo=mock_match_repo, batch_size=2)
+
+        assert [len(batch) for batch in mock_match_repo.batches] == [2, 2, 1]
+        assert (stats.rows, stats.invalid, stats.changed, stats.completed, stats.skipped) == (5, 0, 5, 0, 0)
+
+    async def test_rows_over_the_limit_are_skipped(self, mock_match_repo: BaseMatchRepository) -> None:
+        rows = [feed_row(number) for number in range(settings.MATCHES_COUNT + 2)]
+
+        stats = await ingest(rows, repo=mock_match_repo)
+
+        assert (stats.changed, stats.skipped) == (settings.MATCHES_COUNT, 2)
+
+    async def test_invalid_rows_are_skipped(self, mock_match_repo: BaseMatchRepository) -> None:
+        rows = [
+            feed_row(1),
+            feed_row(2, status='completed'),
+            feed_row(3, status='postponed'),
+            '{"event_id": 1,',
+            json.dumps(feed_row(4, status='completed', home_goals=1, away_goals=1)),
+        ]
+
+        stats = await ingest(rows, repo=mock_match_repo)
+
+        assert (stats.rows, stats.invalid, stats.changed, stats.completed) == (5, 3, 2, 1)
+        assert [row.home_team for row in mock_match_repo.batches[0]] == ['Home 1', 'Home 4']
+        assert mock_match_repo.batches[0][1].status == MatchStatus.completed
+
+    async def test_changed_matches_are_published(self, mock_match_repo: BaseMatchRepository) -> None:
+        bus = InMemoryBus()
+        hub = LiveHub()
+        bus.add_handler(hub.handle)
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=1)
+
+        rows = [feed_row(1), feed_row(2, status='completed', home_goals=3, away_goals=0)]
+
+        await ingest(rows, repo=mock_match_repo, bus=bus)
+        bus.flush()
+
+        messages = await subscription.get(timeout=0)
+
+        assert len(messages) == 3
+        assert b'"home_team":"Home 1"' in messages[0]
+        assert b'"home_goals":3' in messages[1]
+        assert b'"type":"standings"' in messages[2]
+
+    async def test_standings_are_not_published_without_results(self, mock_match_repo: BaseMatchRepository) -> None:
+        bus = InMemoryBus()
+        hub = LiveHub()
+        bus.add_handler(hub.handle)
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=1)
+
+        await ingest([feed_row(1)], repo=mock_match_repo, bus=bus)
+        bus.flush()
+
+        messages = await subscription.get(timeout=0)
+
+        assert len(messages) == 1
+        assert b'"type":"standings"' not in messages[0]
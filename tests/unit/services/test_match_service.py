@@ -3,13 +3,17 @@ from datetime import datetime
 import pytest
 
 from src import exceptions
+from src.core.config import settings
+from src.core.locks import AsyncioEventLocker
 from src.events.base import BaseEventRepository
+from src.live.bus import InMemoryBus
+from src.live.hub import LiveHub, Subscription
 from src.matches.base import BaseMatchService, BaseMatchRepository
 from src.matches.models import MatchStatus
-from src.matches.schemas import MatchCreate, MatchRead
+from src.matches.schemas import MatchCreate, MatchRead, MatchScore, MatchFilter
 from src.matches.service import MatchService
 from src.predictions.base import BasePredictionRepository
-from tests.utils import EventModel, MatchModel, gen_matches
+from tests.utils import EventModel, MatchModel, UserModel, gen_matches
 
 
 @pytest.fixture
@@ -21,6 +25,25 @@ def match_service(
     yield MatchService(repo=mock_match_repo, event_repo=mock_event_repo, prediction_repo=mock_prediction_repo)
 
 
+@pytest.mark.asyncio
+class TestGetMultiple:
+    async def test_pages_follow_each_other(self, match_service: BaseMatchService) -> None:
+        first_page = await match_service.get_multiple(filters=MatchFilter(), limit=2)
+        second_page = await match_service.get_multiple(
+            filters=MatchFilter(), after=(first_page[-1].start_time, first_page[-1].id), limit=2,
+        )
+
+        assert len(first_page) == 2
+        assert len(second_page) == 1
+        assert type(second_page[0]) == MatchRead
+        assert second_page[0].id not in [match.id for match in first_page]
+
+    async def test_filter_by_status(self, match_service: BaseMatchService, ongoing_match: MatchModel) -> None:
+        matches = await match_service.get_multiple(filters=MatchFilter(status=MatchStatus.ongoing))
+
+        assert [match.id for match in matches] == [ongoing_match.id]
+
+
 @pytest.mark.asyncio
 class TestCreate:
     async def test_event_does_not_exist(
@@ -70,6 +93,22 @@ class TestCreate:
         with pytest.raises(exceptions.MatchesLimitError):
             await match_service.create(match=match_data, event_id=created_event.id)
 
+    async def test_match_already_exists(
+            self,
+            match_service: BaseMatchService,
+            created_event: EventModel,
+    ) -> None:
+        created_event.matches = gen_matches(event_id=created_event.id, qty=settings.MATCHES_COUNT - 1)
+        existing = created_event.matches[0]
+        match_data = MatchCreate(
+            home_team=existing.home_team,
+            away_team=existing.away_team,
+            start_time=existing.start_time,
+        )
+
+        with pytest.raises(exceptions.MatchAlreadyExists):
+            await match_service.create(match=match_data, event_id=created_event.id)
+
     async def test_match_successfully_created(
             self,
             match_service: BaseMatchService,
@@ -93,6 +132,61 @@ class TestCreate:
         assert match.away_goals is None
 
 
+@pytest.mark.asyncio
+class TestCreateMultiple:
+    async def test_matches_are_created_up_to_limit(
+            self,
+            match_service: BaseMatchService,
+            created_event: EventModel,
+    ) -> None:
+        created_event.matches = gen_matches(event_id=created_event.id, qty=settings.MATCHES_COUNT - 2)
+        matches = [
+            MatchCreate(home_team=f'Home team {number}', away_team='Away team', start_time=datetime.utcnow())
+            for number in range(3)
+        ]
+
+        result = await match_service.create_multiple(matches=matches, event_id=created_event.id)
+
+        assert [match.home_team for match in result.matches] == ['Home team 0', 'Home team 1']
+        assert result.skipped == 1
+
+    async def test_duplicated_rows_are_skipped(
+            self,
+            match_service: BaseMatchService,
+            created_event: EventModel,
+    ) -> None:
+        created_event.matches = gen_matches(event_id=created_event.id, qty=settings.MATCHES_COUNT - 2)
+        start_time = datetime.utcnow()
+        matches = [
+            MatchCreate(home_team=f'Home team {number}', away_team='Away team', start_time=start_time)
+            for number in (0, 0, 1)
+        ]
+
+        result = await match_service.create_multiple(matches=matches, event_id=created_event.id)
+
+        assert [match.home_team for match in result.matches] == ['Home team 0', 'Home team 1']
+        assert result.skipped == 1
+
+    async def test_event_already_has_limit_of_matches(
+            self,
+            match_service: BaseMatchService,
+            created_event: EventModel,
+    ) -> None:
+        created_event.matches = gen_matches(event_id=created_event.id)
+        matches = [MatchCreate(home_team='Home team', away_team='Away team', start_time=datetime.utcnow())]
+
+        with pytest.raises(exceptions.MatchesLimitError):
+            await match_service.create_multiple(matches=matches, event_id=created_event.id)
+
+    async def test_event_already_is_running(
+            self,
+            match_service: BaseMatchService,
+            ongoing_event: EventModel,
+    ) -> None:
+        with pytest.raises(exceptions.UnexpectedEventStatus):
+            await match_service.create_multiple(matches=[], event_id=ongoing_event.id)
+
+
 @pytest.mark.asyncio
 class TestFinishMatch:
     async def test_match_not_existing(
@@ -114,6 +208,74 @@ class TestFinishMatch:
         assert match.home_goals == 1
         assert match.away_goals == 1
 
+    async def test_finish_publishes_match(
+            self,
+            mock_match_repo: BaseMatchRepository,
+            mock_event_repo: BaseEventRepository,
+            mock_prediction_repo: BasePredictionRepository,
+            upcoming_match: MatchModel,
+    ) -> None:
+        bus = InMemoryBus()
+        hub = LiveHub()
+        bus.add_handler(hub.handle)
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=upcoming_match.event_id)
+        match_service = MatchService(
+            repo=mock_match_repo, event_repo=mock_event_repo, prediction_repo=mock_prediction_repo, bus=bus,
+        )
+
+        await match_service.finish(match_id=upcoming_match.id, home_goals=2, away_goals=1)
+        bus.flush()
+
+        messages = await subscription.get(timeout=0)
+
+        assert len(messages) == 2
+        assert b'"home_goals":2' in messages[0]
+        assert b'"away_goals":1' in messages[0]
+        assert b'"type":"standings"' in messages[1]
+
+    async def test_finish_schedules_snapshot(
+            self,
+            mock_match_repo: BaseMatchRepository,
+            mock_event_repo: BaseEventRepository,
+            mock_prediction_repo: BasePredictionRepository,
+            upcoming_match: MatchModel,
+    ) -> None:
+        class SnapshotWriter:
+            scheduled = 0
+
+            def schedule(self) -> None:
+                self.scheduled += 1
+
+        writer = SnapshotWriter()
+        match_service = MatchService(
+            repo=mock_match_repo, event_repo=mock_event_repo, prediction_repo=mock_prediction_repo,
+            snapshot_writer=writer,
+        )
+
+        await match_service.finish(match_id=upcoming_match.id, home_goals=2, away_goals=1)
+
+        assert writer.scheduled == 1
+
+    async def test_finish_waits_for_event_lock(
+            self,
+            mock_match_repo: BaseMatchRepository,
+            mock_event_repo: BaseEventRepository,
+            mock_prediction_repo: BasePredictionRepository,
+            ongoing_match: MatchModel,
+    ) -> None:
+        locker = AsyncioEventLocker(timeout=0.01)
+        match_service = MatchService(
+            repo=mock_match_repo, event_repo=mock_event_repo, prediction_repo=mock_prediction_repo, locker=locker,
+        )
+
+        async with locker.hold(ongoing_match.event_id):
+            with pytest.raises(exceptions.EventLocked):
+                await match_service.finish(match_id=ongoing_match.id, home_goals=1, away_goals=0)
+
+        assert ongoing_match.status == MatchStatus.ongoing
+        assert locker.stats.timeouts == 1
+
     async def test_finish_completed_match(
             self,
             match_service: BaseMatchService,
@@ -135,6 +297,94 @@ class TestFinishMatch:
         assert match.away_goals == 2
 
 
+@pytest.mark.asyncio
+class TestFinishMultiple:
+    async def test_results_are_reported_per_match(
+            self,
+            match_service: BaseMatchService,
+            ongoing_match: MatchModel,
+            completed_match: MatchModel,
+    ) -> None:
+        scores = [
+            MatchScore(match_id=ongoing_match.id, home_goals=0, away_goals=0),
+            MatchScore(match_id=completed_match.id, home_goals=1, away_goals=0),
+            MatchScore(match_id=987, home_goals=1, away_goals=0),
+        ]
+
+        results = await match_service.finish_multiple(event_id=ongoing_match.event_id, scores=scores)
+
+        assert [(result.match_id, result.status) for result in results] == [
+            (ongoing_match.id, 'finished'),
+            (completed_match.id, 'already_completed'),
+            (987, 'not_found'),
+        ]
+        assert results[0].match.status == MatchStatus.completed
+        assert (results[0].match.home_goals, results[0].match.away_goals) == (0, 0)
+
+    async def test_match_of_another_event_is_not_found(
+            self,
+            match_service: BaseMatchService,
+            upcoming_match: MatchModel,
+    ) -> None:
+        scores = [MatchScore(match_id=upcoming_match.id, home_goals=1, away_goals=0)]
+
+        results = await match_service.finish_multiple(event_id=987, scores=scores)
+
+        assert results[0].status == 'not_found'
+        assert upcoming_match.status == MatchStatus.upcoming
+
+    async def test_duplicated_match_uses_last_score(
+            self,
+            match_service: BaseMatchService,
+            upcoming_match: MatchModel,
+    ) -> None:
+        scores = [
+            MatchScore(match_id=upcoming_match.id, home_goals=1, away_goals=0),
+            MatchScore(match_id=upcoming_match.id, home_goals=2, away_goals=0),
+        ]
+
+        results = await match_service.finish_multiple(event_id=upcoming_match.event_id, scores=scores)
+
+        assert len(results) == 1
+        assert results[0].match.home_goals == 2
+
+    async def test_no_scores(self, match_service: BaseMatchService, ongoing_match: MatchModel) -> None:
+        assert await match_service.finish_multiple(event_id=ongoing_match.event_id, scores=[]) == []
+
+
+@pytest.mark.asyncio
+class TestCorrectMatch:
+    async def test_match_not_existing(self, match_service: BaseMatchService) -> None:
+        with pytest.raises(exceptions.MatchNotFound):
+            await match_service.correct(match_id=9999, home_goals=1, away_goals=1)
+
+    async def test_not_completed_match(
+            self,
+            match_service: BaseMatchService,
+            ongoing_match: MatchModel,
+    ) -> None:
+        with pytest.raises(exceptions.UnexpectedMatchStatus):
+            await match_service.correct(match_id=ongoing_match.id, home_goals=1, away_goals=1)
+
+    async def test_points_deltas_are_returned(
+            self,
+            match_service: BaseMatchService,
+            mock_match_repo: BaseMatchRepository,
+            completed_match: MatchModel,
+            active_user: UserModel,
+    ) -> None:
+        mock_match_repo.deltas = [(active_user.id, -2)]
+
+        correction = await match_service.correct(match_id=completed_match.id, home_goals=3, away_goals=0)
+
+        assert correction.match.id == completed_match.id
+        assert correction.match.home_goals == 3
+        assert correction.match.away_goals == 0
+        assert len(correction.deltas) == 1
+        assert correction.deltas[0].user_id == active_user.id
+        assert correction.deltas[0].delta == -2
+
+
 @pytest.mark.asyncio
 class TestDeleteMatch:
     async def test_delete_not_existing_match(
@@ -1,10 +1,14 @@
+from uuid import uuid4
+
 import pytest
 
 from src import exceptions
+from src.core.cache import LocalCache
+from src.events.base import BaseEventRepository
 from src.matches.base import BaseMatchRepository
 from src.matches.models import MatchStatus
 from src.predictions.base import BasePredictionRepository, BasePredictionService
-from src.predictions.schemas import PredictionRead, PredictionCreate, PredictionUpdate
+from src.predictions.schemas import PredictionRead, PredictionCreate, PredictionUpdate, PredictionItemStatus
 from src.predictions.service import PredictionService
 from tests.utils import PredictionModel, UserModel, MatchModel, EventModel
 
@@ -13,8 +17,14 @@ from tests.utils import PredictionModel, UserModel, MatchModel, EventModel
 def prediction_service(
         mock_prediction_repo: BasePredictionRepository,
         mock_match_repo: BaseMatchRepository,
+        mock_event_repo: BaseEventRepository,
 ) -> BasePredictionService:
-    yield PredictionService(repo=mock_prediction_repo, match_repo=mock_match_repo)
+    yield PredictionService(
+        repo=mock_prediction_repo,
+        match_repo=mock_match_repo,
+        event_repo=mock_event_repo,
+        consensus_cache=LocalCache(ttl=float('inf')),
+    )
 
 
 @pytest.mark.asyncio
@@ -137,6 +147,56 @@ class TestCreatePrediction:
             await prediction_service.create(prediction=prediction_data, user_id=superuser.id)
 
 
+@pytest.mark.asyncio
+class TestUpsertPredictions:
+    async def test_predictions_are_saved(
+            self,
+            prediction_service: BasePredictionService,
+            prediction1: PredictionModel,
+            upcoming_match: MatchModel,
+            active_user: UserModel,
+    ) -> None:
+        predictions = [PredictionCreate(home_goals=2, away_goals=2, match_id=upcoming_match.id)]
+
+        result = await prediction_service.upsert_multiple(
+            event_id=upcoming_match.event_id, predictions=predictions, user_id=active_user.id,
+        )
+
+        assert [(item.match_id, item.status) for item in result.items] == [
+            (upcoming_match.id, PredictionItemStatus.saved),
+        ]
+        assert [(prediction.id, prediction.home_goals, prediction.away_goals) for prediction in result.predictions] == [
+            (prediction1.id, 2, 2),
+        ]
+
+    async def test_locked_and_unknown_matches_are_skipped(
+            self,
+            prediction_service: BasePredictionService,
+            upcoming_match: MatchModel,
+            ongoing_match: MatchModel,
+            completed_match: MatchModel,
+            superuser: UserModel,
+    ) -> None:
+        predictions = [
+            PredictionCreate(home_goals=1, away_goals=1, match_id=ongoing_match.id),
+            PredictionCreate(home_goals=1, away_goals=1, match_id=upcoming_match.id),
+            PredictionCreate(home_goals=1, away_goals=1, match_id=987),
+            PredictionCreate(home_goals=0, away_goals=1, match_id=completed_match.id),
+        ]
+
+        result = await prediction_service.upsert_multiple(
+            event_id=ongoing_match.event_id, predictions=predictions, user_id=superuser.id,
+        )
+
+        assert [(item.match_id, item.status) for item in result.items] == [
+            (ongoing_match.id, PredictionItemStatus.locked),
+            (upcoming_match.id, PredictionItemStatus.match_not_found),
+            (987, PredictionItemStatus.match_not_found),
+            (completed_match.id, PredictionItemStatus.locked),
+        ]
+        assert result.predictions == []
+
+
 @pytest.mark.asyncio
 class TestUpdatePrediction:
     async def test_update_not_existing_prediction(
@@ -229,3 +289,157 @@ class TestUpdatePrediction:
         assert prediction.home_goals == prediction_data.home_goals
         assert prediction.away_goals == prediction_data.away_goals
         assert prediction.match_id == prediction1.match_id
+
+
+@pytest.mark.asyncio
+class TestGetMatchStats:
+    async def test_match_not_found(self, prediction_service: BasePredictionService) -> None:
+        with pytest.raises(exceptions.MatchNotFound):
+            await prediction_service.get_match_stats(match_id=987)
+
+    async def test_match_without_predictions(
+            self,
+            prediction_service: BasePredictionService,
+            mock_prediction_repo: BasePredictionRepository,
+            upcoming_match: MatchModel,
+    ) -> None:
+        mock_prediction_repo.predictions = []
+
+        stats = await prediction_service.get_match_stats(match_id=upcoming_match.id)
+
+        assert stats.total == 0
+        assert stats.scores == []
+
+    async def test_outcomes_and_scores(
+            self,
+            prediction_service: BasePredictionService,
+            mock_prediction_repo: BasePredictionRepository,
+            prediction1: PredictionModel,
+            superuser: UserModel,
+    ) -> None:
+        mock_prediction_repo.predictions = [
+            prediction1,
+            PredictionModel(home_goals=1, away_goals=0, match_id=prediction1.match_id, user_id=superuser.id),
+            PredictionModel(home_goals=2, away_goals=2, match_id=prediction1.match_id, user_id=superuser.id),
+        ]
+
+        stats = await prediction_service.get_match_stats(match_id=prediction1.match_id)
+
+        assert stats.total == 3
+        assert (stats.home_win, stats.draw, stats.away_win) == (2, 1, 0)
+        assert (stats.scores[0].home_goals, stats.scores[0].away_goals, stats.scores[0].count) == (1, 0, 2)
+
+
+@pytest.mark.asyncio
+class TestGetConsensus:
+    @pytest.fixture
+    def locked_predictions(
+            self,
+            mock_prediction_repo: BasePredictionRepository,
+            ongoing_match: MatchModel,
+            completed_match: MatchModel,
+            active_user: UserModel,
+            superuser: UserModel,
+    ) -> list[PredictionModel]:
+        mock_prediction_repo.predictions = [
+            PredictionModel(home_goals=2, away_goals=1, match_id=ongoing_match.id, user_id=active_user.id),
+            PredictionModel(home_goals=0, away_goals=0, match_id=ongoing_match.id, user_id=superuser.id),
+            PredictionModel(home_goals=1, away_goals=1, match_id=completed_match.id, user_id=superuser.id, points=3),
+        ]
+        return mock_prediction_repo.predictions
+
+    async def test_not_existing_match(self, prediction_service: BasePredictionService, active_user: UserModel) -> None:
+        with pytest.raises(exceptions.MatchNotFound):
+            await prediction_service.get_match_consensus(match_id=987, user_id=active_user.id)
+
+    async def test_open_match(
+            self, prediction_service: BasePredictionService, upcoming_match: MatchModel, active_user: UserModel,
+    ) -> None:
+        with pytest.raises(exceptions.PredictionsAreOpen):
+            await prediction_service.get_match_consensus(match_id=upcoming_match.id, user_id=active_user.id)
+
+    async def test_locked_match_leaves_out_own_predictions(
+            self,
+            prediction_service: BasePredictionService,
+            locked_predictions: list[PredictionModel],
+            ongoing_match: MatchModel,
+            active_user: UserModel,
+            superuser: UserModel,
+    ) -> None:
+        consensus = await prediction_service.get_match_consensus(match_id=ongoing_match.id, user_id=active_user.id)
+
+        assert [(stats.match_id, stats.total, stats.home_win, stats.draw) for stats in consensus.matches] == [
+            (ongoing_match.id, 2, 1, 1),
+        ]
+        assert consensus.participants == 2
+        assert [user.user_id for user in consensus.predictions] == [superuser.id]
+        assert [(p.home_goals, p.away_goals, p.points) for p in consensus.predictions[0].predictions] == [(0, 0, None)]
+
+    async def test_pages(
+            self,
+            prediction_service: BasePredictionService,
+            locked_predictions: list[PredictionModel],
+            ongoing_match: MatchModel,
+            active_user: UserModel,
+    ) -> None:
+        user_ids = sorted(uuid4() for _ in range(4))
+        locked_predictions.extend(
+            PredictionModel(home_goals=1, away_goals=0, match_id=ongoing_match.id, user_id=user_id)
+            for user_id in user_ids
+        )
+        others = await prediction_service.get_match_consensus(match_id=ongoing_match.id, user_id=active_user.id)
+        others = [user.user_id for user in others.predictions]
+
+        for offset, limit in [(0, 2), (1, 3), (2, 10), (5, 1)]:
+            consensus = await prediction_service.get_match_consensus(
+                match_id=ongoing_match.id, user_id=active_user.id, offset=offset, limit=limit,
+            )
+            assert [user.user_id for user in consensus.predictions] == others[offset:offset + limit]
+
+        assert len(others) == 5 and active_user.id not in others
+
+    async def test_event(
+            self,
+            prediction_service: BasePredictionService,
+            locked_predictions: list[PredictionModel],
+            ongoing_match: MatchModel,
+            completed_match: MatchModel,
+            active_user: UserModel,
+            superuser: UserModel,
+    ) -> None:
+        consensus = await prediction_service.get_event_consensus(
+            event_id=ongoing_match.event_id, user_id=active_user.id,
+        )
+
+        assert [stats.match_id for stats in consensus.matches] == sorted([ongoing_match.id, completed_match.id])
+        assert [user.user_id for user in consensus.predictions] == [superuser.id]
+        assert [(p.match_id, p.points) for p in consensus.predictions[0].predictions] == sorted([
+            (ongoing_match.id, None), (completed_match.id, 3),
+        ])
+
+    async def test_open_event(
+            self, prediction_service: BasePredictionService, upcoming_match: MatchModel, active_user: UserModel,
+    ) -> None:
+        with pytest.raises(exceptions.PredictionsAreOpen):
+            await prediction_service.get_event_consensus(event_id=upcoming_match.event_id, user_id=active_user.id)
+
+    async def test_not_existing_event(self, prediction_service: BasePredictionService, active_user: UserModel) -> None:
+        with pytest.raises(exceptions.EventNotFound):
+            await prediction_service.get_event_consensus(event_id=987, user_id=active_user.id)
+
+    async def test_kept_until_result_changes(
+            self,
+            prediction_service: BasePredictionService,
+            locked_predictions: list[PredictionModel],
+            ongoing_match: MatchModel,
+            superuser: UserModel,
+    ) -> None:
+        await prediction_service.get_match_consensus(match_id=ongoing_match.id, user_id=superuser.id)
+        locked_predictions[0].points = 3
+
+        consensus = await prediction_service.get_match_consensus(match_id=ongoing_match.id, user_id=superuser.id)
+        assert consensus.predictions[0].predictions[0].points is None
+
+        ongoing_match.status, ongoing_match.home_goals, ongoing_match.away_goals = MatchStatus.completed, 2, 1
+        consensus = await prediction_service.get_match_consensus(match_id=ongoing_match.id, user_id=superuser.id)
+        assert consensus.predictions[0].predictions[0].points == 3
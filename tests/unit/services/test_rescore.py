@@ -0,0 +1,59 @@
+import pytest
+
+from src.live.bus import InMemoryBus
+from src.live.hub import LiveHub, Subscription
+from src.scoring.base import BaseScoringRepository
+from src.scoring.rescore import rescore
+from src.scoring.rules import RuleSet
+
+
+def standing_rows(standings) -> list[tuple[int, int, int, int, int, int]]:
+    return list(zip(
+        standings.event_ids.tolist(), standings.users.tolist(), standings.points.tolist(),
+        standings.exact_hits.tolist(), standings.outcome_hits.tolist(), standings.ranks.tolist(),
+    ))
+
+
+@pytest.mark.asyncio
+class TestRescore:
+    async def test_unchanged_rules_change_only_unscored(self, mock_scoring_repo: BaseScoringRepository) -> None:
+        stats = await rescore([1, 2], repo=mock_scoring_repo, rules=RuleSet())
+
+        event_ids, points, standings = mock_scoring_repo.saved[0]
+
+        assert mock_scoring_repo.locked == [1, 2]
+        assert event_ids == [1, 2]
+        assert points.tolist() == [3, 1, 1, 1, 3, 0]
+        assert (stats.events, stats.predictions, stats.changed, stats.standings) == (2, 6, 1, 4)
+        assert standing_rows(standings) == [
+            (1, 0, 4, 1, 1, 1),
+            (1, 1, 4, 1, 1, 1),
+            (2, 0, 1, 0, 1, 1),
+            (2, 1, 0, 0, 0, 2),
+        ]
+
+    async def test_new_rules(self, mock_scoring_repo: BaseScoringRepository) -> None:
+        rules = RuleSet(exact_score=4, outcome=1, goal_difference=1, double_points_matches=[2])
+
+        stats = await rescore([1, 2], repo=mock_scoring_repo, rules=rules)
+
+        _, points, standings = mock_scoring_repo.saved[0]
+
+        assert points.tolist() == [4, 4, 2, 2, 8, 0]
+        assert stats.changed == 5
+        assert standing_rows(standings)[:2] == [(1, 0, 8, 1, 1, 2), (1, 1, 10, 1, 1, 1)]
+
+    async def test_standings_are_published(self, mock_scoring_repo: BaseScoringRepository) -> None:
+        bus = InMemoryBus()
+        hub = LiveHub()
+        bus.add_handler(hub.handle)
+        subscription = Subscription()
+        hub.subscribe(subscription, event_id=2)
+
+        await rescore([1, 2], repo=mock_scoring_repo, bus=bus)
+        bus.flush()
+
+        messages = await subscription.get(timeout=0)
+
+        assert len(messages) == 1
+        assert b'"type":"standings"' in messages[0]
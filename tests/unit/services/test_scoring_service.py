@@ -0,0 +1,206 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+from src import exceptions
+from src.core.cache import LocalCache
+from src.events.base import BaseEventRepository
+from src.matches.schemas import MatchScore
+from src.scoring.base import BaseScoringRepository, BaseScoringService
+from src.scoring.rules import RuleSet
+from src.scoring.schemas import WhatIf
+from src.scoring.service import ScoringService
+from tests.utils import EventModel, UserModel
+
+
+@pytest.fixture
+def cache() -> LocalCache:
+    return LocalCache(ttl=60)
+
+
+@pytest.fixture
+def scoring_service(
+        mock_scoring_repo: BaseScoringRepository, mock_event_repo: BaseEventRepository, cache: LocalCache,
+) -> BaseScoringService:
+    yield ScoringService(
+        repo=mock_scoring_repo,
+        event_repo=mock_event_repo,
+        cache=cache,
+        rules=RuleSet(),
+        chances_cache=LocalCache(ttl=float('inf')),
+        simulations=100,
+    )
+
+
+def what_if(*scores: tuple[int, int, int]) -> WhatIf:
+    return WhatIf(scores=[
+        MatchScore(match_id=match_id, home_goals=home_goals, away_goals=away_goals)
+        for match_id, home_goals, away_goals in scores
+    ])
+
+
+@pytest.mark.asyncio
+class TestGetWhatIfLeaderboard:
+    async def test_not_existing_event(self, scoring_service: BaseScoringService, active_user: UserModel) -> None:
+        with pytest.raises(exceptions.EventNotFound):
+            await scoring_service.get_what_if_leaderboard(event_id=987, what_if=what_if(), user_id=active_user.id)
+
+    async def test_event_without_predictions(
+            self, scoring_service: BaseScoringService, created_event: EventModel, active_user: UserModel,
+    ) -> None:
+        result = await scoring_service.get_what_if_leaderboard(
+            event_id=created_event.id, what_if=what_if(), user_id=active_user.id,
+        )
+
+        assert (result.participants, result.standings, result.user) == (0, [], None)
+
+    async def test_completed_or_unknown_match(
+            self, scoring_service: BaseScoringService, upcoming_event: EventModel, active_user: UserModel,
+    ) -> None:
+        with pytest.raises(exceptions.UnexpectedMatchStatus):
+            await scoring_service.get_what_if_leaderboard(
+                event_id=upcoming_event.id, what_if=what_if((6, 1, 0)), user_id=active_user.id,
+            )
+
+    async def test_open_match(
+            self, scoring_service: BaseScoringService, upcoming_event: EventModel, active_user: UserModel,
+    ) -> None:
+        # the repository leaves open matches out of the projection, so a score of open match 6 is refused
+        with pytest.raises(exceptions.UnexpectedMatchStatus):
+            await scoring_service.get_what_if_leaderboard(
+                event_id=upcoming_event.id, what_if=what_if((4, 1, 0), (6, 2, 1)), user_id=active_user.id,
+            )
+
+    async def test_without_scores_keeps_current_points(
+            self, scoring_service: BaseScoringService, upcoming_event: EventModel, active_user: UserModel,
+    ) -> None:
+        result = await scoring_service.get_what_if_leaderboard(
+            event_id=upcoming_event.id, what_if=what_if(), user_id=active_user.id,
+        )
+
+        assert [(s.rank, s.points, s.current_points) for s in result.standings] == [(1, 4, 4), (2, 3, 3)]
+
+    async def test_projected_ranking(
+            self,
+            scoring_service: BaseScoringService,
+            upcoming_event: EventModel,
+            active_user: UserModel,
+            superuser: UserModel,
+    ) -> None:
+        first, second = sorted([active_user.id, superuser.id])
+
+        result = await scoring_service.get_what_if_leaderboard(
+            event_id=upcoming_event.id, what_if=what_if((4, 0, 0), (5, 2, 2)), user_id=first,
+        )
+
+        assert result.participants == 2
+        assert [(s.rank, s.user_id, s.points, s.current_points) for s in result.standings] == [
+            (1, second, 9, 3), (2, first, 4, 4),
+        ]
+        assert (result.user.rank, result.user.points) == (2, 4)
+
+    async def test_ties_share_rank(
+            self, scoring_service: BaseScoringService, upcoming_event: EventModel, active_user: UserModel,
+    ) -> None:
+        result = await scoring_service.get_what_if_leaderboard(
+            event_id=upcoming_event.id, what_if=what_if((5, 1, 1)), user_id=uuid4(),
+        )
+
+        assert [(s.rank, s.points) for s in result.standings] == [(1, 4), (1, 4)]
+        assert result.user is None
+
+    async def test_pages(
+            self, scoring_service: BaseScoringService, upcoming_event: EventModel, active_user: UserModel,
+    ) -> None:
+        result = await scoring_service.get_what_if_leaderboard(
+            event_id=upcoming_event.id, what_if=what_if((4, 1, 0)), user_id=active_user.id, offset=1, limit=1,
+        )
+
+        assert [(s.rank, s.points) for s in result.standings] == [(2, 3)]
+
+    async def test_projection_is_cached(
+            self,
+            scoring_service: BaseScoringService,
+            cache: LocalCache,
+            upcoming_event: EventModel,
+            active_user: UserModel,
+    ) -> None:
+        await scoring_service.get_what_if_leaderboard(
+            event_id=upcoming_event.id, what_if=what_if(), user_id=active_user.id,
+        )
+
+        assert cache.get(upcoming_event.id) is not None
+
+
+@pytest.mark.asyncio
+class TestGetFinishingChances:
+    async def test_not_existing_event(self, scoring_service: BaseScoringService, active_user: UserModel) -> None:
+        with pytest.raises(exceptions.EventNotFound):
+            await scoring_service.get_finishing_chances(event_id=987, user_id=active_user.id)
+
+    async def test_event_without_predictions(
+            self, scoring_service: BaseScoringService, created_event: EventModel, active_user: UserModel,
+    ) -> None:
+        result = await scoring_service.get_finishing_chances(event_id=created_event.id, user_id=active_user.id)
+
+        assert (result.participants, result.standings, result.user) == (0, [], None)
+
+    async def test_chances(
+            self,
+            scoring_service: BaseScoringService,
+            upcoming_event: EventModel,
+            active_user: UserModel,
+            superuser: UserModel,
+    ) -> None:
+        first, second = sorted([active_user.id, superuser.id])
+
+        result = await scoring_service.get_finishing_chances(event_id=upcoming_event.id, user_id=second)
+
+        assert (result.simulations, result.participants) == (100, 2)
+        assert {s.user_id for s in result.standings} == {first, second}
+        assert result.standings[0].win_probability >= result.standings[1].win_probability
+        assert all(s.podium_probability == 1 and 1 <= s.average_rank <= 2 for s in result.standings)
+        assert (result.user.user_id, result.user.points) == (second, 3)
+
+    async def test_pages(
+            self, scoring_service: BaseScoringService, upcoming_event: EventModel, active_user: UserModel,
+    ) -> None:
+        result = await scoring_service.get_finishing_chances(
+            event_id=upcoming_event.id, user_id=active_user.id, offset=1, limit=1,
+        )
+
+        assert len(result.standings) == 1
+
+    async def test_chances_are_kept_until_version_changes(
+            self,
+            scoring_service: ScoringService,
+            mock_scoring_repo: BaseScoringRepository,
+            upcoming_event: EventModel,
+            active_user: UserModel,
+    ) -> None:
+        await scoring_service.get_finishing_chances(event_id=upcoming_event.id, user_id=active_user.id)
+        entry = scoring_service.chances_cache.get(upcoming_event.id)
+
+        await scoring_service.get_finishing_chances(event_id=upcoming_event.id, user_id=active_user.id)
+        assert scoring_service.chances_cache.get(upcoming_event.id) is entry
+
+        mock_scoring_repo.version = ((4, 1, 0, False), (5, None, None, False))
+        await scoring_service.get_finishing_chances(event_id=upcoming_event.id, user_id=active_user.id)
+        assert scoring_service.chances_cache.get(upcoming_event.id) is not entry
+
+    async def test_simulates_in_process_pool(
+            self,
+            mock_scoring_repo: BaseScoringRepository,
+            mock_event_repo: BaseEventRepository,
+            upcoming_event: EventModel,
+            active_user: UserModel,
+    ) -> None:
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            scoring_service = ScoringService(
+                repo=mock_scoring_repo, event_repo=mock_event_repo, executor=executor, simulations=100,
+            )
+            result = await scoring_service.get_finishing_chances(event_id=upcoming_event.id, user_id=active_user.id)
+
+        assert (result.simulations, result.participants) == (100, 2)
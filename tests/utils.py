@@ -49,6 +49,33 @@ class PredictionModel:
     points: int | None = None
 
 
+@dataclasses.dataclass
+class ScoreCountModel:
+    match_id: int
+    home_goals: int
+    away_goals: int
+    count: int = 0
+
+
+@dataclasses.dataclass
+class StandingModel:
+    event_id: int
+    user_id: UUID
+    points: int = 0
+    exact_hits: int = 0
+    outcome_hits: int = 0
+    rank: int | None = None
+
+
+@dataclasses.dataclass
+class LeagueModel:
+    name: str
+    owner_id: UUID
+    invite_code: str
+    member_count: int = 1
+    id: int = dataclasses.field(default_factory=lambda counter=count(): next(counter))
+
+
 teams = ['Real Madrid', 'Barcelona', 'Liverpool', 'Arsenal', 'Juventus']
 
 